@@ -12,16 +12,43 @@ import bpy
 
 from .props import NSOT_Props
 from .cameras import NSOT_OT_create_cameras
-from .render_images import NSOT_OT_export_dataset
-from .pipeline import NSOT_OT_write_pipeline_bat, NSOT_OT_write_export_bat
+from .render_images import NSOT_OT_export_dataset, NSOT_OT_render_control
+from .manifest import NSOT_OT_verify_dataset
+from .render_shards import NSOT_OT_render_sharded
+from .pipeline import NSOT_OT_write_pipeline_bat, NSOT_OT_write_export_bat, NSOT_OT_pipeline_plan
+from .colmap import NSOT_OT_write_colmap_model
+from .transforms import NSOT_OT_write_transforms
+from .seed_points import NSOT_OT_write_seed_points
+from .pairs import NSOT_OT_write_pairs
+from .telemetry import NSOT_OT_render_stats
+from .framing import NSOT_OT_fit_to_selection
+from .pipeline_monitor import NSOT_OT_pipeline_cancel, stop_monitor
+from .splat_ops import NSOT_OT_compress_splat, NSOT_OT_prune_splat
+from .floaters import NSOT_OT_remove_floaters
+from .splat_preview import NSOT_OT_import_splat_preview
 from .ui import NSOT_PT_panel
 
 _classes = (
     NSOT_Props,
     NSOT_OT_create_cameras,
+    NSOT_OT_fit_to_selection,
     NSOT_OT_export_dataset,
+    NSOT_OT_render_control,
+    NSOT_OT_verify_dataset,
+    NSOT_OT_render_stats,
+    NSOT_OT_render_sharded,
     NSOT_OT_write_pipeline_bat,
     NSOT_OT_write_export_bat,
+    NSOT_OT_pipeline_plan,
+    NSOT_OT_pipeline_cancel,
+    NSOT_OT_compress_splat,
+    NSOT_OT_prune_splat,
+    NSOT_OT_remove_floaters,
+    NSOT_OT_import_splat_preview,
+    NSOT_OT_write_colmap_model,
+    NSOT_OT_write_transforms,
+    NSOT_OT_write_seed_points,
+    NSOT_OT_write_pairs,
     NSOT_PT_panel,
 )
 
@@ -30,18 +57,49 @@ def register():
     bpy.types.Scene.nsot_props = bpy.props.PointerProperty(type=NSOT_Props)
 
     bpy.utils.register_class(NSOT_OT_create_cameras)
+    bpy.utils.register_class(NSOT_OT_fit_to_selection)
     bpy.utils.register_class(NSOT_OT_export_dataset)
+    bpy.utils.register_class(NSOT_OT_render_control)
+    bpy.utils.register_class(NSOT_OT_verify_dataset)
+    bpy.utils.register_class(NSOT_OT_render_stats)
+    bpy.utils.register_class(NSOT_OT_render_sharded)
     bpy.utils.register_class(NSOT_OT_write_pipeline_bat)
     bpy.utils.register_class(NSOT_OT_write_export_bat)
+    bpy.utils.register_class(NSOT_OT_pipeline_plan)
+    bpy.utils.register_class(NSOT_OT_pipeline_cancel)
+    bpy.utils.register_class(NSOT_OT_compress_splat)
+    bpy.utils.register_class(NSOT_OT_prune_splat)
+    bpy.utils.register_class(NSOT_OT_remove_floaters)
+    bpy.utils.register_class(NSOT_OT_import_splat_preview)
+    bpy.utils.register_class(NSOT_OT_write_colmap_model)
+    bpy.utils.register_class(NSOT_OT_write_transforms)
+    bpy.utils.register_class(NSOT_OT_write_seed_points)
+    bpy.utils.register_class(NSOT_OT_write_pairs)
     bpy.utils.register_class(NSOT_PT_panel)
 
 def unregister():
     bpy.utils.unregister_class(NSOT_PT_panel)
+    bpy.utils.unregister_class(NSOT_OT_write_pairs)
+    bpy.utils.unregister_class(NSOT_OT_write_seed_points)
+    bpy.utils.unregister_class(NSOT_OT_write_transforms)
+    bpy.utils.unregister_class(NSOT_OT_write_colmap_model)
+    bpy.utils.unregister_class(NSOT_OT_import_splat_preview)
+    bpy.utils.unregister_class(NSOT_OT_remove_floaters)
+    bpy.utils.unregister_class(NSOT_OT_prune_splat)
+    bpy.utils.unregister_class(NSOT_OT_compress_splat)
+    bpy.utils.unregister_class(NSOT_OT_pipeline_cancel)
+    bpy.utils.unregister_class(NSOT_OT_pipeline_plan)
     bpy.utils.unregister_class(NSOT_OT_write_export_bat)
     bpy.utils.unregister_class(NSOT_OT_write_pipeline_bat)
+    bpy.utils.unregister_class(NSOT_OT_render_sharded)
+    bpy.utils.unregister_class(NSOT_OT_render_stats)
+    bpy.utils.unregister_class(NSOT_OT_verify_dataset)
+    bpy.utils.unregister_class(NSOT_OT_render_control)
     bpy.utils.unregister_class(NSOT_OT_export_dataset)
+    bpy.utils.unregister_class(NSOT_OT_fit_to_selection)
     bpy.utils.unregister_class(NSOT_OT_create_cameras)
 
+    stop_monitor()
     del bpy.types.Scene.nsot_props
     bpy.utils.unregister_class(NSOT_Props)
 
@@ -1,11 +1,10 @@
 import bpy
-from mathutils import Vector, Matrix
+import time
+from mathutils import Matrix
 
-from .utils import (
-    get_or_create_collection,
-    spherical_points_by_spacing,
-    look_at_matrix,
-)
+from .utils import get_or_create_collection
+from .rig import build_rig, get_layer_scales, rig_from_objects, coverage_uniformity
+from .coverage import planned_rig, selected_rig
 
 def make_camera(name: str, mw: Matrix, lens_mm: float, sensor_w: float, clip_start: float, clip_end: float):
     cam_data = bpy.data.cameras.new(name=name + "_DATA")
@@ -17,23 +16,74 @@ def make_camera(name: str, mw: Matrix, lens_mm: float, sensor_w: float, clip_sta
     cam_obj.data.clip_end = clip_end
     return cam_obj
 
+def get_shared_camera_data(prefix: str, lens_mm: float, sensor_w: float, clip_start: float, clip_end: float):
+    # Keyed on every value it holds, so changing clip range never edits a block other rigs still use.
+    name = f"{prefix}{lens_mm:g}mm_{sensor_w:g}mm_clip{clip_start:g}-{clip_end:g}_DATA"
+    cam_data = bpy.data.cameras.get(name)
+    if cam_data is None:
+        cam_data = bpy.data.cameras.new(name=name)
+        cam_data.lens = lens_mm
+        cam_data.sensor_width = sensor_w
+        cam_data.clip_start = clip_start
+        cam_data.clip_end = clip_end
+    return cam_data
+
+def make_shared_cameras(collection, names, matrices, cam_data):
+    # One camera object per view, all using cam_data. bpy has no batch object constructor, so each
+    # object is still created and linked on its own; only the per-camera cameras.new goes away.
+    objects = bpy.data.objects
+    link = collection.objects.link
+    for name, mw in zip(names, matrices):
+        cam_obj = objects.new(name, cam_data)
+        cam_obj.matrix_world = Matrix(mw.tolist())
+        link(cam_obj)
+    return len(names)
+
+def benchmark_creation(counts=(1000, 5000, 20000), prefix: str = "NSOT_BENCH_"):
+    # Times rig creation and clearing with per-camera and shared data blocks in a scratch collection. Run inside Blender:
+    #   blender -b --python-expr "import SplatMake.cameras as c; c.benchmark_creation()"
+    coll = bpy.data.collections.new(prefix + "COLL")
+    bpy.context.scene.collection.children.link(coll)
+    try:
+        for count in counts:
+            rig = build_rig(prefix, [10.0], 1.0, (0.0, 0.0, 0.0), (0.0, 0.0, 1.0), sampler="FIBONACCI", count=int(count))
+            for label in ("per-camera data", "shared data"):
+                t0 = time.perf_counter()
+                if label == "shared data":
+                    make_shared_cameras(coll, rig.names, rig.matrices, get_shared_camera_data(prefix, 50.0, 36.0, 0.1, 1000.0))
+                else:
+                    for name, mw in zip(rig.names, rig.matrices):
+                        coll.objects.link(make_camera(name, Matrix(mw.tolist()), 50.0, 36.0, 0.1, 1000.0))
+                t1 = time.perf_counter()
+                clear_prefixed_cameras(coll, prefix)
+                t2 = time.perf_counter()
+                print(f"{count:>6} cameras, {label:<15}: create {t1 - t0:7.2f}s, clear {t2 - t1:7.2f}s")
+    finally:
+        clear_prefixed_cameras(coll, prefix)
+        bpy.data.collections.remove(coll)
+
 def clear_prefixed_cameras(collection, prefix: str):
     import bpy
     remove = [obj for obj in list(collection.objects) if obj.type == "CAMERA" and obj.name.startswith(prefix)]
-    for obj in remove:
-        bpy.data.objects.remove(obj, do_unlink=True)
-
-def get_layer_scales(p):
-    if not p.use_radius_layers:
-        return [1.0]
-
-    scales = []
-    for i in range(1, int(p.layer_count) + 1):
-        v = float(getattr(p, f"layer_scale_{i:02d}", 0.0))
-        if v > 0.0:
-            scales.append(v)
-
-    return scales if scales else [1.0]
+    if remove:
+        bpy.data.batch_remove(remove)
+
+    orphans = [cam for cam in bpy.data.cameras if cam.users == 0 and cam.name.startswith(prefix) and cam.name.endswith("_DATA")]
+    if orphans:
+        bpy.data.batch_remove(orphans)
+
+def prefixed_cameras(collection, prefix: str):
+    return sorted(
+        [obj for obj in collection.objects if obj.type == "CAMERA" and obj.name.startswith(prefix)],
+        key=lambda o: o.name,
+    )
+
+def dataset_rig(p):
+    # The poses that Render Images produces: the camera objects, or the virtual rig.
+    if p.render_mode == "VIRTUAL":
+        return selected_rig(p)
+    coll = bpy.data.collections.get(p.collection_name)
+    return rig_from_objects(prefixed_cameras(coll, p.name_prefix) if coll is not None else [])
 
 class NSOT_OT_create_cameras(bpy.types.Operator):
     bl_idname = "nsot.create_cameras"
@@ -43,39 +93,33 @@ class NSOT_OT_create_cameras(bpy.types.Operator):
     def execute(self, context):
         p = context.scene.nsot_props
         coll = get_or_create_collection(p.collection_name)
-        clear_prefixed_cameras(coll, p.name_prefix)
-
-        target = Vector((p.target_x, p.target_y, p.target_z))
-        up = Vector((p.up_x, p.up_y, p.up_z))
-        if up.length < 1e-8:
-            up = Vector((0.0, 0.0, 1.0))
-        up.normalize()
-
-        scales = get_layer_scales(p)
 
-        total = 0
-        for layer_idx, scale in enumerate(scales):
-            layer_radius = p.radius * scale
-            pts = spherical_points_by_spacing(p.max_dist, layer_radius)
-
-            idx = 0
-            for local_pos, tag in pts:
-                world_pos = target + local_pos
-
-                base = f"{p.name_prefix}L{layer_idx:02d}_{idx:03d}"
-                if tag == "BOTTOM":
-                    name = base + "_BOTTOM"
-                elif tag == "TOP":
-                    name = base + "_TOP"
-                else:
-                    name = base
-
-                mw = look_at_matrix(world_pos, target, up)
-                cam = make_camera(name, mw, p.focal_mm, p.sensor_width_mm, p.clip_start, p.clip_end)
+        t0 = time.perf_counter()
+        clear_prefixed_cameras(coll, p.name_prefix)
+        t1 = time.perf_counter()
+
+        rig, report = planned_rig(p)
+        if p.share_camera_data:
+            cam_data = get_shared_camera_data(p.name_prefix, p.focal_mm, p.sensor_width_mm, p.clip_start, p.clip_end)
+            make_shared_cameras(coll, rig.names, rig.matrices, cam_data)
+        else:
+            for name, mw in zip(rig.names, rig.matrices):
+                cam = make_camera(name, Matrix(mw.tolist()), p.focal_mm, p.sensor_width_mm, p.clip_start, p.clip_end)
                 coll.objects.link(cam)
-                idx += 1
-
-            total += idx
-
-        self.report({"INFO"}, f"Created {total} cameras across {len(scales)} layer(s) in '{p.collection_name}'")
+        t2 = time.perf_counter()
+
+        nn_min, nn_mean = coverage_uniformity(rig, (p.target_x, p.target_y, p.target_z))
+        if p.use_coverage_optimizer and report is None:
+            self.report({"WARNING"}, "Coverage optimizer needs a mesh Source Object; placed the full rig instead.")
+        if report is not None:
+            self.report(
+                {"INFO"},
+                f"Coverage optimizer: {report['selected']} of {report['candidates']} candidates, "
+                f"{report['coverage'] * 100.0:.1f}% of {report['patches']} patches seen by >= {report['min_views']} views",
+            )
+        self.report(
+            {"INFO"},
+            f"Created {len(rig.names)} cameras across {len(get_layer_scales(p))} layer(s) in '{p.collection_name}' "
+            f"(NN angle min {nn_min:.2f} / mean {nn_mean:.2f} deg; clear {t1 - t0:.2f}s, create {t2 - t1:.2f}s)",
+        )
         return {"FINISHED"}
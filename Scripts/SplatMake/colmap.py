@@ -0,0 +1,120 @@
+import bpy
+import os
+import struct
+
+import numpy as np
+
+from .utils import ensure_dir, image_filename
+from .rig import pixel_intrinsics, rotmat_to_qvec, view_resolutions
+from .cameras import dataset_rig
+from .seed_points import mesh_seed_points
+
+PINHOLE_MODEL_ID = 1
+
+# Blender cameras look down -Z with +Y up; COLMAP cameras look down +Z with +Y down.
+BLENDER_TO_COLMAP_CAM = np.diag((1.0, -1.0, -1.0, 1.0))
+
+POINT3D_DTYPE = np.dtype(
+    [
+        ("point3D_id", "<u8"),
+        ("xyz", "<f8", (3,)),
+        ("rgb", "u1", (3,)),
+        ("error", "<f8"),
+        ("track_length", "<u8"),
+    ]
+)
+
+def blender_to_colmap_poses(matrices):
+    c2w = np.asarray(matrices, dtype=np.float64).reshape(-1, 4, 4) @ BLENDER_TO_COLMAP_CAM
+    R = np.transpose(c2w[:, :3, :3], (0, 2, 1))
+    t = -np.einsum("nij,nj->ni", R, c2w[:, :3, 3])
+    return rotmat_to_qvec(R), t
+
+def write_cameras_bin(path: str, cameras):
+    # cameras: [(camera_id, width, height, fx, fy, cx, cy)]
+    with open(path, "wb") as f:
+        f.write(struct.pack("<Q", len(cameras)))
+        for camera_id, width, height, fx, fy, cx, cy in cameras:
+            f.write(struct.pack("<iiQQ", camera_id, PINHOLE_MODEL_ID, width, height))
+            f.write(struct.pack("<4d", fx, fy, cx, cy))
+
+def write_images_bin(path: str, names, qvecs, tvecs, camera_ids):
+    record = struct.Struct("<i4d3di")
+    with open(path, "wb") as f:
+        f.write(struct.pack("<Q", len(names)))
+        for image_id, (name, q, t, camera_id) in enumerate(zip(names, qvecs.tolist(), tvecs.tolist(), camera_ids), start=1):
+            f.write(record.pack(image_id, *q, *t, int(camera_id)))
+            f.write(name.encode("utf-8") + b"\x00")
+            f.write(struct.pack("<Q", 0))
+
+def write_points3d_bin(path: str, xyz, rgb):
+    xyz = np.asarray(xyz, dtype=np.float64).reshape(-1, 3)
+    pts = np.zeros(len(xyz), dtype=POINT3D_DTYPE)
+    pts["point3D_id"] = np.arange(1, len(xyz) + 1)
+    pts["xyz"] = xyz
+    pts["rgb"] = np.asarray(rgb, dtype=np.uint8).reshape(-1, 3)
+    with open(path, "wb") as f:
+        f.write(struct.pack("<Q", len(pts)))
+        pts.tofile(f)
+
+def random_seed_points(center, radius: float, count: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    d = rng.normal(size=(count, 3))
+    d /= np.linalg.norm(d, axis=1, keepdims=True)
+    r = radius * np.cbrt(rng.random(count))
+    xyz = np.asarray(center, dtype=np.float64) + d * r[:, None]
+    rgb = np.full((count, 3), 128, dtype=np.uint8)
+    return xyz, rgb
+
+def write_colmap_model(model_dir: str, rig, resolutions, focal_mm: float, sensor_width_mm: float, xyz, rgb, image_format: str = "PNG"):
+    # One PINHOLE camera per distinct render resolution; every image references its own.
+    ensure_dir(model_dir)
+    sizes, camera_index = np.unique(np.asarray(resolutions, dtype=np.int64).reshape(-1, 2), axis=0, return_inverse=True)
+    cameras = [
+        (k + 1, int(w), int(h), *pixel_intrinsics(focal_mm, sensor_width_mm, int(w), int(h)))
+        for k, (w, h) in enumerate(sizes)
+    ]
+    qvecs, tvecs = blender_to_colmap_poses(rig.matrices)
+
+    write_cameras_bin(os.path.join(model_dir, "cameras.bin"), cameras)
+    write_images_bin(os.path.join(model_dir, "images.bin"), [image_filename(n, image_format) for n in rig.names], qvecs, tvecs, camera_index.ravel() + 1)
+    write_points3d_bin(os.path.join(model_dir, "points3D.bin"), xyz, rgb)
+
+def write_known_poses_model(p, out_root: str, context):
+    rig = dataset_rig(p)
+    if not rig.names:
+        return None
+
+    seed = mesh_seed_points(p, context)
+    if seed is None:
+        # Without a seed cloud, nerfstudio would pick up an empty sparse_pc.ply; seed a ball inside the innermost layer instead.
+        target = (p.target_x, p.target_y, p.target_z)
+        inner = float(np.min(np.linalg.norm(rig.positions - np.array(target), axis=1)))
+        seed = random_seed_points(target, 0.5 * inner, 50000)
+    xyz, rgb = seed
+
+    model_dir = os.path.join(out_root, "sparse", "0")
+    write_colmap_model(model_dir, rig, view_resolutions(p, rig.layers), p.focal_mm, p.sensor_width_mm, xyz, rgb, p.image_format)
+    return model_dir, len(rig.names)
+
+class NSOT_OT_write_colmap_model(bpy.types.Operator):
+    bl_idname = "nsot.write_colmap_model"
+    bl_label = "Write COLMAP Model (Known Poses)"
+    bl_description = "Writes sparse/0/cameras.bin, images.bin and points3D.bin into output_dir directly from the rig poses and render settings"
+    bl_options = {"REGISTER"}
+
+    def execute(self, context):
+        p = context.scene.nsot_props
+        if not p.output_dir:
+            self.report({"ERROR"}, "Output Directory is empty.")
+            return {"CANCELLED"}
+
+        out_root = bpy.path.abspath(p.output_dir)
+        result = write_known_poses_model(p, out_root, context)
+        if result is None:
+            self.report({"ERROR"}, f"No rig cameras found for prefix '{p.name_prefix}'.")
+            return {"CANCELLED"}
+
+        model_dir, count = result
+        self.report({"INFO"}, f"Wrote COLMAP model with {count} images: {model_dir}")
+        return {"FINISHED"}
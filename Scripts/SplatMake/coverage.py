@@ -0,0 +1,211 @@
+import bpy
+import os
+import json
+import math
+import hashlib
+
+import numpy as np
+from mathutils import Vector
+from mathutils.bvhtree import BVHTree
+
+from .utils import ensure_dir
+from .rig import Rig, build_rig, get_layer_scales, pixel_intrinsics, rig_from_objects, rig_from_props
+from .seed_points import sample_surface_patches, source_mesh
+
+def visibility_matrix(rig, points, normals, bvh, world_to_local, tan_x: float, tan_y: float, chunk: int = 64):
+    # (cameras, patches) bool: patch faces the camera, lies inside its frustum and is not occluded.
+    n_cam = len(rig.names)
+    vis = np.zeros((n_cam, len(points)), dtype=bool)
+    if n_cam == 0 or len(points) == 0:
+        return vis
+
+    w2c = np.linalg.inv(rig.matrices)
+    R_l = world_to_local[:3, :3]
+    t_l = world_to_local[:3, 3]
+    pts_local = points @ R_l.T + t_l
+    cams_local = rig.positions @ R_l.T + t_l
+    eps = 1e-4 * float(np.ptp(pts_local, axis=0).max() or 1.0)
+    origins = pts_local + normals @ R_l.T * eps
+
+    for s in range(0, n_cam, chunk):
+        e = min(n_cam, s + chunk)
+        to_cam = rig.positions[s:e, None, :] - points[None, :, :]
+        facing = np.einsum("cpk,pk->cp", to_cam, normals) > 0.0
+
+        pc = np.einsum("cij,pj->cpi", w2c[s:e, :3, :3], points) + w2c[s:e, None, :3, 3]
+        depth = -pc[..., 2]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            in_frustum = (depth > 0.0) & (np.abs(pc[..., 0]) <= tan_x * depth) & (np.abs(pc[..., 1]) <= tan_y * depth)
+
+        ci, pi = np.nonzero(facing & in_frustum)
+        rays = cams_local[s + ci] - origins[pi]
+        dists = np.linalg.norm(rays, axis=1)
+        rays /= dists[:, None]
+        ray_cast = bvh.ray_cast
+        hits = [
+            ray_cast(Vector(o), Vector(d), dist)[0] is not None
+            for o, d, dist in zip(origins[pi].tolist(), rays.tolist(), dists.tolist())
+        ]
+        clear = ~np.array(hits, dtype=bool)
+        vis[s + ci[clear], pi[clear]] = True
+    return vis
+
+def greedy_select(vis, min_views: int, target: float):
+    n_cam, n_patch = vis.shape
+    need = np.full(n_patch, int(min_views), dtype=np.int32)
+    # Patches seen by fewer than min_views candidates can never be satisfied; only ask for what's reachable.
+    reachable = vis.sum(axis=0) >= min_views
+    goal = min(target, float(reachable.mean()) if n_patch else 0.0)
+
+    vis_f = vis.astype(np.float32)
+    chosen = []
+    available = np.ones(n_cam, dtype=bool)
+    while available.any():
+        if n_patch and (need <= 0).mean() >= goal:
+            break
+        gain = vis_f @ (need > 0).astype(np.float32)
+        gain[~available] = -1.0
+        best = int(np.argmax(gain))
+        if gain[best] <= 0.0:
+            break
+        chosen.append(best)
+        available[best] = False
+        need -= vis[best]
+    return np.array(chosen, dtype=np.int64), need
+
+def optimize_rig(candidates, points, normals, bvh, world_to_local, tan_x, tan_y, min_views: int, target: float):
+    vis = visibility_matrix(candidates, points, normals, bvh, world_to_local, tan_x, tan_y)
+    chosen, need = greedy_select(vis, min_views, target)
+    chosen.sort()
+
+    rig = Rig(
+        [candidates.names[i] for i in chosen],
+        candidates.layers[chosen],
+        candidates.positions[chosen],
+        candidates.matrices[chosen],
+    )
+    views = vis[chosen].sum(axis=0)
+    report = {
+        "candidates": len(candidates.names),
+        "selected": len(chosen),
+        "patches": len(points),
+        "min_views": int(min_views),
+        "target_coverage": float(target),
+        "coverage": float((need <= 0).mean()) if len(points) else 0.0,
+        "seen_once": float((views > 0).mean()) if len(points) else 0.0,
+        "unreachable_patches": int((vis.sum(axis=0) < min_views).sum()),
+        "views_per_patch_mean": float(views.mean()) if len(points) else 0.0,
+        "selected_per_layer": {str(int(layer)): int((rig.layers == layer).sum()) for layer in np.unique(rig.layers)},
+    }
+    return rig, report
+
+def candidate_count(p) -> int:
+    # Dividing the spacing by the factor multiplies the density by its square; an exact count scales the same way.
+    if not p.use_camera_count or p.rig_sampler == "RINGS":
+        return 0
+    return int(math.ceil(int(p.cameras_per_layer) * max(1.0, p.coverage_candidate_factor) ** 2))
+
+def candidate_rig(p):
+    radii = [p.radius * scale for scale in get_layer_scales(p)]
+    return build_rig(
+        p.name_prefix,
+        radii,
+        p.max_dist / max(1.0, p.coverage_candidate_factor),
+        (p.target_x, p.target_y, p.target_z),
+        (p.up_x, p.up_y, p.up_z),
+        sampler=p.rig_sampler,
+        count=candidate_count(p),
+        seed=int(p.sampler_seed),
+    )
+
+def optimized_rig_from_props(p, depsgraph):
+    obj = source_mesh(p)
+    if obj is None:
+        return None, None
+
+    candidates = candidate_rig(p)
+    points, normals = sample_surface_patches(obj, depsgraph, int(p.coverage_patches), seed=int(p.sampler_seed))
+
+    eval_obj = obj.evaluated_get(depsgraph)
+    bvh = BVHTree.FromObject(eval_obj, depsgraph)
+    world_to_local = np.array(eval_obj.matrix_world.inverted(), dtype=np.float64)
+
+    fx, fy, cx, cy = pixel_intrinsics(p.focal_mm, p.sensor_width_mm, p.res_x, p.res_y)
+    return optimize_rig(candidates, points, normals, bvh, world_to_local, cx / fx, cy / fy, int(p.coverage_min_views), p.coverage_target)
+
+def write_coverage_report(out_root: str, report: dict):
+    ensure_dir(out_root)
+    path = os.path.join(out_root, "coverage_report.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return path
+
+def _geometry_fingerprint(obj):
+    # Hash of the evaluated vertex coordinates and placement, so any edit or modifier change that moves a
+    # vertex invalidates the stored selection (as manifest.scene_fingerprint does for renders).
+    if obj is None:
+        return None
+    eval_obj = obj.evaluated_get(bpy.context.evaluated_depsgraph_get())
+    h = hashlib.sha1(obj.name.encode())
+    h.update(np.array(eval_obj.matrix_world, dtype=np.float32).tobytes())
+    mesh = eval_obj.to_mesh() if obj.type in {"MESH", "CURVE", "SURFACE", "META", "FONT"} else None
+    if mesh is not None:
+        try:
+            co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+            mesh.vertices.foreach_get("co", co)
+            h.update(co.tobytes())
+        finally:
+            eval_obj.to_mesh_clear()
+    return h.hexdigest()
+
+def _selection_key(p) -> str:
+    # Everything the candidate rig and the optimizer's choice depend on.
+    return json.dumps([
+        p.name_prefix, [p.radius * scale for scale in get_layer_scales(p)], p.max_dist, p.coverage_candidate_factor,
+        candidate_count(p), [p.target_x, p.target_y, p.target_z], [p.up_x, p.up_y, p.up_z], p.rig_sampler, int(p.sampler_seed),
+        _geometry_fingerprint(p.source_object), int(p.coverage_patches), int(p.coverage_min_views), p.coverage_target,
+        p.focal_mm, p.sensor_width_mm, p.res_x, p.res_y,
+    ])
+
+def _store_selection(p, rig, report):
+    names = set(rig.names)
+    indices = [i for i, name in enumerate(candidate_rig(p).names) if name in names]
+    p.coverage_selection = json.dumps({"key": _selection_key(p), "indices": indices, "report": report})
+
+def stored_selection(p):
+    # (rig, report) that Create Cameras picked, or None if it never ran or the settings changed since.
+    if not p.coverage_selection:
+        return None
+    data = json.loads(p.coverage_selection)
+    if data.get("key") != _selection_key(p):
+        return None
+    candidates = candidate_rig(p)
+    chosen = np.array(data["indices"], dtype=np.int64)
+    rig = Rig([candidates.names[i] for i in chosen], candidates.layers[chosen], candidates.positions[chosen], candidates.matrices[chosen])
+    return rig, data["report"]
+
+def planned_rig(p):
+    # Runs the placement for Create Cameras: the plain sphere, or its coverage-optimized subset. The
+    # optimizer's choice and report are saved here once; later steps read them through selected_rig.
+    p.coverage_selection = ""
+    if p.use_coverage_optimizer:
+        rig, report = optimized_rig_from_props(p, bpy.context.evaluated_depsgraph_get())
+        if rig is not None:
+            _store_selection(p, rig, report)
+            if p.output_dir:
+                write_coverage_report(bpy.path.abspath(p.output_dir), report)
+            return rig, report
+    return rig_from_props(p), None
+
+def needs_selection(p) -> bool:
+    return p.use_coverage_optimizer and source_mesh(p) is not None and stored_selection(p) is None
+
+def selected_rig(p):
+    # The rig planned_rig last placed, without re-running the optimizer. Empty when the optimizer is on
+    # and its stored choice is missing or stale.
+    if not p.use_coverage_optimizer or source_mesh(p) is None:
+        return rig_from_props(p)
+    selection = stored_selection(p)
+    if selection is None:
+        return rig_from_objects([])
+    return selection[0]
@@ -0,0 +1,123 @@
+import bpy
+
+import numpy as np
+
+from .rig import pixel_intrinsics
+from .utils import foreach_array
+from .seed_points import source_mesh
+
+BORDER_PATHS = ("render.border_min_x", "render.border_max_x", "render.border_min_y", "render.border_max_y")
+CROP_ACTION_NAME = "NSOT_CropBorders"
+
+def crop_points(obj, depsgraph, mode: str):
+    # World-space points whose projection bounds the object's silhouette.
+    eval_obj = obj.evaluated_get(depsgraph)
+    mw = np.array(eval_obj.matrix_world, dtype=np.float64)
+    if mode == "BBOX":
+        local = np.array([tuple(c) for c in eval_obj.bound_box], dtype=np.float64)
+    else:
+        # The projected extent of a point set equals that of its convex hull, so the vertices are exact.
+        mesh = eval_obj.to_mesh()
+        try:
+            local = foreach_array(mesh.vertices, "co", 3, np.float32).astype(np.float64)
+        finally:
+            eval_obj.to_mesh_clear()
+    return local @ mw[:3, :3].T + mw[:3, 3]
+
+def view_borders(matrices, points, intrinsics, res_x: int, res_y: int, padding_px: float, near: float, budget: int = 4_000_000):
+    # Normalized (min_x, max_x, min_y, max_y) render borders per camera, origin bottom-left like Blender.
+    # Views where part of the object reaches behind the near plane keep the full frame.
+    fx, fy, cx, cy = intrinsics
+    n = len(matrices)
+    borders = np.tile(np.array((0.0, 1.0, 0.0, 1.0)), (n, 1))
+    if n == 0 or len(points) == 0:
+        return borders
+
+    chunk = max(1, budget // len(points))
+    for s in range(0, n, chunk):
+        R = matrices[s:s + chunk, :3, :3]
+        t = matrices[s:s + chunk, :3, 3]
+        local = np.einsum("cji,cpj->cpi", R, points[None, :, :] - t[:, None, :])
+        depth = -local[..., 2]
+        ok = (depth > near).all(axis=1)
+        depth = np.maximum(depth, near)
+        u = cx + fx * local[..., 0] / depth
+        v = cy + fy * local[..., 1] / depth
+
+        box = np.stack(
+            (
+                np.floor(u.min(axis=1) - padding_px) / res_x,
+                np.ceil(u.max(axis=1) + padding_px) / res_x,
+                np.floor(v.min(axis=1) - padding_px) / res_y,
+                np.ceil(v.max(axis=1) + padding_px) / res_y,
+            ),
+            axis=1,
+        )
+        box = np.clip(box, 0.0, 1.0)
+        ok &= (box[:, 1] > box[:, 0]) & (box[:, 3] > box[:, 2])
+        borders[s:s + chunk][ok] = box[ok]
+    return borders
+
+def border_area_fraction(borders) -> float:
+    if len(borders) == 0:
+        return 1.0
+    return float(np.mean((borders[:, 1] - borders[:, 0]) * (borders[:, 3] - borders[:, 2])))
+
+def skipped_samples_per_second(borders, resolutions, samples: int, seconds: float) -> float:
+    # Pixel samples the crop left untraced (full frame minus border region, times samples per pixel),
+    # per second of render time: the path-tracing throughput cropping saved.
+    if len(borders) == 0 or seconds <= 0.0:
+        return 0.0
+    area = (borders[:, 1] - borders[:, 0]) * (borders[:, 3] - borders[:, 2])
+    pixels = np.asarray(resolutions, dtype=np.float64).prod(axis=1)
+    return float(((1.0 - area) * pixels).sum() * samples / seconds)
+
+def rig_borders(p, context, rig):
+    # None when cropping is off or cannot keep the output identical to a full-frame render.
+    if p.crop_mode == "OFF" or not p.film_transparent:
+        return None
+    obj = source_mesh(p)
+    if obj is None:
+        return None
+    points = crop_points(obj, context.evaluated_depsgraph_get(), p.crop_mode)
+    intrinsics = pixel_intrinsics(p.focal_mm, p.sensor_width_mm, p.res_x, p.res_y)
+    return view_borders(rig.matrices, points, intrinsics, p.res_x, p.res_y, p.crop_padding_px, p.clip_start)
+
+def apply_border(scene, border):
+    # With crop-to-border off Blender writes the full frame and leaves everything outside the border transparent.
+    render = scene.render
+    if border is None:
+        render.use_border = False
+        return
+    render.use_border = True
+    render.use_crop_to_border = False
+    render.border_min_x, render.border_max_x, render.border_min_y, render.border_max_y = (float(x) for x in border)
+
+def keyframe_borders(scene, borders, frame_start: int) -> bool:
+    # Per-frame borders for the virtual rig animation. The static border is the union of all views,
+    # so frames stay complete even if the keys are not evaluated.
+    apply_border(scene, (borders[:, 0].min(), borders[:, 1].max(), borders[:, 2].min(), borders[:, 3].max()))
+
+    anim = scene.animation_data_create()
+    if anim.action is not None and anim.action.name != CROP_ACTION_NAME:
+        return False  # Leave the user's scene animation alone.
+    if anim.action is not None:
+        bpy.data.actions.remove(anim.action)
+    anim.action = bpy.data.actions.new(name=CROP_ACTION_NAME)
+
+    frames = np.arange(frame_start, frame_start + len(borders), dtype=np.float64)
+    for axis, data_path in enumerate(BORDER_PATHS):
+        fc = anim.action.fcurves.new(data_path)
+        fc.keyframe_points.add(len(frames))
+        fc.keyframe_points.foreach_set("co", np.column_stack((frames, borders[:, axis])).ravel())
+        fc.keyframe_points.foreach_set("interpolation", np.zeros(len(frames), dtype=np.int32))  # CONSTANT
+        fc.update()
+    return True
+
+def clear_border_keys(scene):
+    anim = scene.animation_data
+    if anim is not None and anim.action is not None and anim.action.name == CROP_ACTION_NAME:
+        action = anim.action
+        anim.action = None
+        bpy.data.actions.remove(action)
+    apply_border(scene, None)
@@ -0,0 +1,177 @@
+# Image encoding off the render thread. No bpy imports: render_worker.py loads this module
+# directly inside headless shard processes.
+import os
+import time
+import zlib
+import struct
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import numpy as np
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+PILLOW_FORMATS = {"WEBP", "JPEG"}
+INTERMEDIATE_EXT = ".tga"
+
+def read_tga(path: str):
+    # Uncompressed true-colour TGA as written by Blender's TARGA_RAW: BGR(A), usually bottom-up.
+    with open(path, "rb") as f:
+        data = f.read()
+    id_len, cmap_type, img_type = data[0], data[1], data[2]
+    if img_type != 2 or cmap_type != 0:
+        raise ValueError(f"{path}: not an uncompressed true-colour TGA (type {img_type})")
+    w, h = struct.unpack_from("<HH", data, 12)
+    bpp, desc = data[16], data[17]
+    channels = bpp // 8
+    px = np.frombuffer(data, dtype=np.uint8, count=w * h * channels, offset=18 + id_len).reshape(h, w, channels)
+    px = px[..., [2, 1, 0, 3][:channels]]
+    if not desc & 0x20:
+        px = px[::-1]
+    return np.ascontiguousarray(px)
+
+def _png_chunk(tag: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I", len(payload)) + tag + payload + struct.pack(">I", zlib.crc32(tag + payload) & 0xFFFFFFFF)
+
+def encode_png(pixels, level: int) -> bytes:
+    # 8-bit PNG with the Up filter on every row; zlib releases the GIL, so threads encode in parallel.
+    pixels = pixels if pixels.ndim == 3 else pixels[..., None]
+    h, w, channels = pixels.shape
+    color_type = {1: 0, 2: 4, 3: 2, 4: 6}[channels]
+    rows = pixels.reshape(h, w * channels)
+    filtered = np.empty((h, w * channels + 1), dtype=np.uint8)
+    filtered[:, 0] = 2
+    filtered[0, 1:] = rows[0]
+    np.subtract(rows[1:], rows[:-1], out=filtered[1:, 1:])
+    return b"".join(
+        (
+            b"\x89PNG\r\n\x1a\n",
+            _png_chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, color_type, 0, 0, 0)),
+            _png_chunk(b"IDAT", zlib.compress(filtered.tobytes(), level)),
+            _png_chunk(b"IEND", b""),
+        )
+    )
+
+def premultiply(px):
+    out = px.astype(np.float32)
+    if out.shape[2] == 4:
+        out[..., :3] *= out[..., 3:4] * (1.0 / 255.0)
+    return out
+
+def unpremultiply(pm):
+    out = pm.copy()
+    if out.shape[2] == 4:
+        a = out[..., 3:4]
+        out[..., :3] = np.divide(out[..., :3] * 255.0, a, out=np.zeros_like(out[..., :3]), where=a > 0.0)
+    return np.clip(np.rint(out), 0, 255).astype(np.uint8)
+
+def halve(pm):
+    # 2x2 box average of premultiplied pixels; odd trailing rows/columns are dropped like a floor resize.
+    h, w, c = pm.shape
+    h2, w2 = h // 2, w // 2
+    return pm[:h2 * 2, :w2 * 2].reshape(h2, 2, w2, 2, c).mean(axis=(1, 3), dtype=np.float32)
+
+def downscale_pyramid(px, factors):
+    # Alpha-aware area downsampling: averaging premultiplied colour keeps transparent (black) pixels from
+    # bleeding into edges. Each level cascades from the previous one, which equals a direct box average
+    # over the full factor because floor(w/2)/2 == floor(w/4).
+    pm = premultiply(px)
+    level = 1
+    for factor in sorted(factors):
+        while level < factor:
+            pm = halve(pm)
+            level *= 2
+        yield factor, unpremultiply(pm)
+
+def _write_atomic(path: str, payload: bytes):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(payload)
+    os.replace(tmp, path)
+
+def _save_pillow(path: str, image, fmt: str, **kwargs):
+    tmp = path + ".tmp"
+    image.save(tmp, format=fmt, **kwargs)
+    os.replace(tmp, path)
+
+def write_image(px, dst: str, fmt: str, png_level: int, quality: int, mask_path: str = ""):
+    # Returns bytes written (image + mask).
+    mask_bytes = 0
+    if fmt == "PNG":
+        _write_atomic(dst, encode_png(px, png_level))
+    elif fmt == "WEBP":
+        _save_pillow(dst, Image.fromarray(px), "WEBP", lossless=True, quality=quality)
+    elif fmt == "JPEG":
+        _save_pillow(dst, Image.fromarray(px[..., :3]), "JPEG", quality=quality, subsampling=0)
+        if mask_path and px.shape[2] == 4:
+            _write_atomic(mask_path, encode_png(px[..., 3], png_level))
+            mask_bytes = os.path.getsize(mask_path)
+    else:
+        raise ValueError(f"Unknown image format: {fmt}")
+    return os.path.getsize(dst), mask_bytes
+
+def encode_file(src: str, dst: str, fmt: str, png_level: int = 6, quality: int = 95, mask_path: str = "", pyramid=()):
+    # Encodes an intermediate TGA into the dataset format plus its downscales, removes it and returns
+    # size/timing stats. pyramid: [(factor, dst, mask_path)].
+    t0 = time.perf_counter()
+    px = read_tga(src)
+    size, mask_bytes = write_image(px, dst, fmt, png_level, quality, mask_path)
+    t1 = time.perf_counter()
+
+    pyramid_bytes = 0
+    targets = {factor: (level_dst, level_mask) for factor, level_dst, level_mask in pyramid}
+    for factor, level_px in downscale_pyramid(px, targets):
+        level_dst, level_mask = targets[factor]
+        pyramid_bytes += sum(write_image(level_px, level_dst, fmt, png_level, quality, level_mask))
+    os.remove(src)
+    return {
+        "bytes": size,
+        "mask_bytes": mask_bytes,
+        "pyramid_bytes": pyramid_bytes,
+        "encode_s": t1 - t0,
+        "pyramid_s": time.perf_counter() - t1,
+    }
+
+def format_available(fmt: str) -> bool:
+    return fmt not in PILLOW_FORMATS or Image is not None
+
+class ImageEncoder:
+    # Thread pool fed by the render loop. Results are collected on the caller's thread with drain(),
+    # so manifest and telemetry bookkeeping never runs concurrently.
+    def __init__(self, fmt: str, png_level: int, quality: int, threads: int = 0, max_pending: int = 0):
+        threads = threads or max(1, min(8, (os.cpu_count() or 2) // 2))
+        self.fmt = fmt
+        self.png_level = png_level
+        self.quality = quality
+        self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="nsot_encode")
+        self.max_pending = max_pending or 2 * threads
+        self.pending = {}
+
+    def submit(self, tag, src: str, dst: str, mask_path: str = "", pyramid=()):
+        # Bound the queue so intermediates don't pile up when encoding is slower than rendering.
+        while True:
+            running = [f for f in self.pending if not f.done()]
+            if len(running) < self.max_pending:
+                break
+            wait(running, return_when=FIRST_COMPLETED)
+        future = self.pool.submit(encode_file, src, dst, self.fmt, self.png_level, self.quality, mask_path, pyramid)
+        self.pending[future] = tag
+
+    def drain(self, block: bool = False):
+        # Returns [(tag, stats)] for finished jobs; with block=True waits for all of them.
+        # A failed job reports {"error": message} instead of raising into the render loop.
+        if block and self.pending:
+            wait(list(self.pending))
+        results = []
+        for f in [f for f in self.pending if f.done()]:
+            tag = self.pending.pop(f)
+            exc = f.exception()
+            results.append((tag, {"error": str(exc)} if exc is not None else f.result()))
+        return results
+
+    def close(self):
+        results = self.drain(block=True)
+        self.pool.shutdown(wait=True)
+        return results
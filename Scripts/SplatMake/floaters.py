@@ -0,0 +1,118 @@
+import bpy
+import os
+import time
+
+import numpy as np
+from mathutils.bvhtree import BVHTree
+
+from .seed_points import _world_triangles, source_mesh
+from .splat_frame import transform_points
+from .splat_io import open_splat
+from .splat_ops import FINAL_SPLAT_NAME, RAW_SPLAT_NAME, backup_raw, final_splat_path, splat_world
+from .splat_prune import DERIVED_PREFIX, filter_splat
+
+# Gaussians farther from the source mesh than epsilon + size_factor * (largest axis) are floaters.
+# Queries run chunk by chunk over the memory-mapped splat; a bounding-box test settles most far-away
+# gaussians in NumPy, and only the rest go through BVHTree.find_nearest with the band as search radius.
+CHUNK = 1 << 18
+FLOATER_KEYS = ("bbox", "surface")
+FLOATER_COMMENT = DERIVED_PREFIX + "floaters removed"
+
+def surface_bvh(obj, depsgraph):
+    # (BVHTree, bbox min, bbox max) of the evaluated mesh in world space.
+    eval_obj = obj.evaluated_get(depsgraph)
+    mesh = eval_obj.to_mesh()
+    try:
+        co, tri_verts = _world_triangles(eval_obj, mesh)
+    finally:
+        eval_obj.to_mesh_clear()
+    if len(tri_verts) == 0:
+        return None, None, None
+    return BVHTree.FromPolygons(co.tolist(), tri_verts.tolist()), co.min(axis=0), co.max(axis=0)
+
+def floater_masks(bvh, lo, hi, to_world, epsilon: float, size_factor: float):
+    matrix, world_per_unit = to_world
+
+    def masks(block):
+        xyz = transform_points(np.stack((block["x"], block["y"], block["z"]), axis=1).astype(np.float64), matrix)
+        log_max = np.maximum(np.maximum(block["scale_0"], block["scale_1"]), block["scale_2"]).astype(np.float64)
+        band = epsilon + size_factor * world_per_unit * np.exp(np.minimum(log_max, 20.0))
+        # Distance to the bounding box never exceeds distance to the surface.
+        gap = np.linalg.norm(np.maximum(np.maximum(lo - xyz, xyz - hi), 0.0), axis=1)
+        outside = gap > band
+        near = np.flatnonzero(~outside)
+        find = bvh.find_nearest
+        miss = np.fromiter((find(co, r)[0] is None for co, r in zip(xyz[near].tolist(), band[near].tolist())), bool, len(near))
+        surface = np.zeros(len(block), bool)
+        surface[near[miss]] = True
+        return {"bbox": outside, "surface": surface}
+
+    return masks
+
+def flag_floaters(src: str, dst: str, masks_fn, chunk: int = CHUNK):
+    # Writes a boolean .npy mask (True = floater) without touching the splat.
+    t0 = time.perf_counter()
+    splat = open_splat(src)
+    n = len(splat)
+    removed = dict.fromkeys(FLOATER_KEYS, 0)
+    flags = np.lib.format.open_memmap(dst, mode="w+", dtype=bool, shape=(n,))
+    for s in range(0, n, chunk):
+        drop = np.zeros(min(chunk, n - s), bool)
+        for key, mask in masks_fn(np.asarray(splat.data[s:s + chunk])).items():
+            removed[key] += int(mask.sum())
+            drop |= mask
+        flags[s:s + chunk] = drop
+    count = int(np.count_nonzero(flags))
+    flags.flush()
+    del flags, splat
+    return {"count_before": n, "count_after": n - count, "removed": removed, "seconds": time.perf_counter() - t0}
+
+class NSOT_OT_remove_floaters(bpy.types.Operator):
+    bl_idname = "nsot.remove_floaters"
+    bl_label = "Remove Floaters"
+    bl_description = "Drops or flags gaussians in FINAL_GSPLAT.ply that lie off the source object's surface, using its BVH"
+    bl_options = {"REGISTER"}
+
+    def execute(self, context):
+        p = context.scene.nsot_props
+        obj = source_mesh(p)
+        if obj is None:
+            self.report({"ERROR"}, "Source Object must be a mesh.")
+            return {"CANCELLED"}
+        path = final_splat_path(p)
+        if not os.path.isfile(path):
+            self.report({"ERROR"}, f"No splat found: {path}")
+            return {"CANCELLED"}
+        # Distances to the mesh are only meaningful in Blender world space, like prune's world criteria.
+        if p.pipeline_mode == "SFM":
+            self.report({"ERROR"}, "COLMAP SfM splats are not in Blender world space; use Known Poses or transforms.json.")
+            return {"CANCELLED"}
+        try:
+            to_world = splat_world(p)
+        except FileNotFoundError as exc:
+            self.report({"ERROR"}, str(exc))
+            return {"CANCELLED"}
+
+        bvh, lo, hi = surface_bvh(obj, context.evaluated_depsgraph_get())
+        if bvh is None:
+            self.report({"ERROR"}, "Source Object has no faces.")
+            return {"CANCELLED"}
+        masks = floater_masks(bvh, lo, hi, to_world, float(p.floater_epsilon), float(p.floater_size_factor))
+
+        if p.floater_action == "FLAG":
+            out = os.path.splitext(path)[0] + "_floaters.npy"
+            report = flag_floaters(path, out, masks)
+        else:
+            # Filters FINAL as it stands (pruned or not); pruning again restarts from the raw export.
+            if backup_raw(path) is None:
+                self.report({"ERROR"}, f"{FINAL_SPLAT_NAME} was already rewritten and {RAW_SPLAT_NAME} is missing.")
+                return {"CANCELLED"}
+            out = path
+            report = filter_splat(path, path, masks, FLOATER_KEYS, FLOATER_COMMENT, sh_degree=3, chunk=CHUNK)
+
+        n0, n1 = report["count_before"], report["count_after"]
+        r = report["removed"]
+        print(f"[NSOT] floaters {n0 - n1} of {n0} ({r['bbox']} outside bbox, {r['surface']} off surface) in {report['seconds']:.2f}s -> {out}")
+        verb = "Flagged" if p.floater_action == "FLAG" else "Removed"
+        self.report({"INFO"}, f"{verb} {n0 - n1} floaters of {n0} gaussians")
+        return {"FINISHED"}
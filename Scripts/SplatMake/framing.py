@@ -0,0 +1,118 @@
+import bpy
+import math
+
+import numpy as np
+
+from .utils import foreach_array
+
+MAX_LAYERS = 10
+
+def selected_points(context):
+    # World-space evaluated vertices of the selected meshes (or the active one).
+    objects = [o for o in context.selected_objects if o.type == "MESH"]
+    if not objects and context.active_object is not None and context.active_object.type == "MESH":
+        objects = [context.active_object]
+
+    depsgraph = context.evaluated_depsgraph_get()
+    chunks = []
+    for obj in objects:
+        eval_obj = obj.evaluated_get(depsgraph)
+        mesh = eval_obj.to_mesh()
+        try:
+            co = foreach_array(mesh.vertices, "co", 3, np.float32).astype(np.float64)
+        finally:
+            eval_obj.to_mesh_clear()
+        mw = np.array(eval_obj.matrix_world, dtype=np.float64)
+        chunks.append(co @ mw[:3, :3].T + mw[:3, 3])
+    return np.concatenate(chunks) if chunks else np.zeros((0, 3))
+
+def minimal_enclosing_sphere(points, iterations: int = 200):
+    # Badoiu-Clarkson core-set iteration: step the centre towards the farthest point with a shrinking step.
+    # The returned radius is the exact max distance from the final centre, so the sphere always encloses.
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    if len(points) == 0:
+        return np.zeros(3), 0.0
+    lo, hi = points.min(axis=0), points.max(axis=0)
+    center = 0.5 * (lo + hi)
+    # |p - c|^2 = |p|^2 - 2 p.c + |c|^2; the argmax only needs the first two terms, one matvec per step.
+    sq = np.einsum("ij,ij->i", points, points)
+    for i in range(1, iterations + 1):
+        far = points[int(np.argmax(sq - 2.0 * (points @ center)))]
+        center = center + (far - center) / (i + 1)
+    d2 = sq - 2.0 * (points @ center) + center @ center
+    return center, float(math.sqrt(max(0.0, d2.max())))
+
+def framing_distance(radius: float, fill: float, tan_half_fov: float) -> float:
+    # Distance at which a sphere's silhouette spans `fill` of the frame's short side.
+    return radius / math.sin(math.atan(fill * tan_half_fov))
+
+def fit_rig(radius: float, fills, focal_mm: float, sensor_width_mm: float, res_x: int, res_y: int, clearance: float, detail_px: float):
+    # Returns (focal_mm, distances per layer, resolution scale per layer).
+    long_px, short_px = max(res_x, res_y), min(res_x, res_y)
+    f_px = focal_mm / sensor_width_mm * long_px
+    tan_half = 0.5 * short_px / f_px
+
+    inner_fill = max(fills)
+    if framing_distance(radius, inner_fill, tan_half) < clearance * radius:
+        # The innermost layer would sit too close to the surface; widen the lens until it backs off.
+        tan_half = math.tan(math.asin(1.0 / clearance)) / inner_fill
+        f_px = 0.5 * short_px / tan_half
+        focal_mm = f_px * sensor_width_mm / long_px
+
+    distances = [framing_distance(radius, fill, tan_half) for fill in fills]
+    if detail_px > 0.0:
+        res_scales = [min(1.0, detail_px / (fill * short_px)) for fill in fills]
+    else:
+        res_scales = [1.0 for _ in fills]
+    return focal_mm, distances, res_scales
+
+def apply_fit(p, center, radius: float):
+    layer_count = int(p.layer_count) if p.use_radius_layers else 1
+    if layer_count > 1:
+        fills = list(np.linspace(p.fit_fill_outer, p.fit_fill_inner, layer_count))
+    else:
+        fills = [p.fit_fill_outer]
+
+    detail = float(p.fit_detail_pixels) if p.use_layer_resolution else 0.0
+    focal_mm, distances, res_scales = fit_rig(radius, fills, p.focal_mm, p.sensor_width_mm, p.res_x, p.res_y, p.fit_clearance, detail)
+
+    # Keep the angular camera spacing so the camera count doesn't swing with object size.
+    old_radius = max(1e-6, float(p.radius))
+    p.max_dist = max(0.001, p.max_dist * distances[0] / old_radius)
+
+    p.target_x, p.target_y, p.target_z = (float(v) for v in center)
+    p.radius = distances[0]
+    p.focal_mm = focal_mm
+    for i in range(1, MAX_LAYERS + 1):
+        setattr(p, f"layer_scale_{i:02d}", distances[i - 1] / distances[0] if i <= layer_count else 0.0)
+        setattr(p, f"layer_res_scale_{i:02d}", res_scales[i - 1] if i <= layer_count else 1.0)
+
+    nearest = min(distances) - radius
+    if p.clip_start > 0.5 * nearest:
+        p.clip_start = max(0.0001, 0.1 * nearest)
+    if p.clip_end < max(distances) + radius:
+        p.clip_end = 2.0 * (max(distances) + radius)
+    return distances, res_scales
+
+class NSOT_OT_fit_to_selection(bpy.types.Operator):
+    bl_idname = "nsot.fit_to_selection"
+    bl_label = "Fit Rig to Selection"
+    bl_description = "Sets target, radius, layer scales, focal length and per-layer resolution from the selected meshes' minimal enclosing sphere"
+    bl_options = {"REGISTER", "UNDO"}
+
+    def execute(self, context):
+        p = context.scene.nsot_props
+        points = selected_points(context)
+        if len(points) == 0:
+            self.report({"ERROR"}, "Select at least one mesh object.")
+            return {"CANCELLED"}
+
+        center, radius = minimal_enclosing_sphere(points)
+        if radius <= 0.0:
+            self.report({"ERROR"}, "Selection has no extent.")
+            return {"CANCELLED"}
+
+        distances, res_scales = apply_fit(p, center, radius)
+        layers = ", ".join(f"{d:.3g}" + (f" @{s:.0%}" if s < 1.0 else "") for d, s in zip(distances, res_scales))
+        self.report({"INFO"}, f"Bounding sphere r={radius:.4g}; focal {p.focal_mm:.1f}mm; layer distances {layers}")
+        return {"FINISHED"}
@@ -0,0 +1,164 @@
+# Turns pipeline console output (orchestrator or BAT) into stage/progress state for the panel.
+# No bpy imports, so a recorded log can be replayed outside Blender: python log_parser.py _pipeline/pipeline.log
+import re
+import sys
+import time
+
+ORCH_STAGE_RE = re.compile(r"^\[nsot\] stage=(\S+) status=(RUN|DONE|FAIL)\b(?:.*error=(.*))?")
+ORCH_ALL_DONE_RE = re.compile(r"^\[nsot\] status=ALL_DONE")
+BAT_STEP_RE = re.compile(r"^\[(\d+(?:\.\d+)?)\]\s+(.*?)(?:\.\.\.)?\s*$")
+BAT_OK_RE = re.compile(r"^\[OK\]")
+BAT_FAIL_RE = re.compile(r"^\[X\]\s*(.*)")
+
+COLMAP_FILE_RE = re.compile(r"Processed file \[(\d+)/(\d+)\]")
+COLMAP_BLOCK_RE = re.compile(r"Matching block \[(\d+)/(\d+)(?:,\s*(\d+)/(\d+))?\]")
+COLMAP_REGISTER_RE = re.compile(r"Registering image #\d+ \((\d+)\)")
+TRAIN_ROW_RE = re.compile(r"^(\d+)\s+\((\d+(?:\.\d+)?)%\)$")
+EXPORT_RE = re.compile(r"Sav(?:ed|ing)\b.*\.ply", re.IGNORECASE)
+
+class StageTiming:
+    def __init__(self, name: str, start: float):
+        self.name = name
+        self.start = start
+        self.end = None
+        self.status = "RUN"
+
+    def elapsed(self, now: float) -> float:
+        return (self.end if self.end is not None else now) - self.start
+
+class PipelineProgress:
+    def __init__(self):
+        self.stages = []
+        self.state = "RUNNING"  # RUNNING, DONE, FAILED
+        self.error = ""
+        self.done = 0
+        self.total = 0
+        self.unit = ""  # what throughput() counts: images, blocks or steps
+        self.detail = ""
+        self.image_count = 0
+        self.train_step = 0
+        self.train_eta = ""
+        self.train_rate = ""
+        self.exported = False
+
+    @property
+    def current(self):
+        return self.stages[-1] if self.stages and self.stages[-1].end is None else None
+
+    def fraction(self) -> float:
+        return self.done / self.total if self.total else 0.0
+
+    def begin(self, name: str, now: float):
+        self.end_stage(now, "DONE")
+        self.stages.append(StageTiming(name, now))
+        self.done = self.total = 0
+        self.unit = ""
+        self.detail = ""
+
+    def end_stage(self, now: float, status: str):
+        stage = self.current
+        if stage is not None:
+            stage.end = now
+            stage.status = status
+
+    def throughput(self, now: float) -> float:
+        # self.unit per second within the current stage. Training progress is tracked in hundredths of a
+        # percent for fraction(), so its rate is counted in steps instead.
+        stage = self.current
+        elapsed = stage.elapsed(now) if stage is not None else 0.0
+        count = self.train_step if self.unit == "steps" else self.done
+        return count / elapsed if elapsed > 0.0 else 0.0
+
+    def feed(self, line: str, now: float = None):
+        now = time.monotonic() if now is None else now
+        line = line.rstrip()
+        text = line.strip(" │|")
+
+        m = ORCH_STAGE_RE.match(line)
+        if m:
+            name, status = m.group(1), m.group(2)
+            if status == "RUN":
+                self.begin(name, now)
+            else:
+                self.end_stage(now, status)
+                if status == "FAIL":
+                    self.state = "FAILED"
+                    self.error = (m.group(3) or name).strip()
+            return
+        if ORCH_ALL_DONE_RE.match(line) or BAT_OK_RE.match(line):
+            self.end_stage(now, "DONE")
+            self.state = "DONE"
+            return
+        m = BAT_FAIL_RE.match(line)
+        if m:
+            self.end_stage(now, "FAIL")
+            self.state = "FAILED"
+            self.error = m.group(1)
+            return
+        m = BAT_STEP_RE.match(line)
+        if m:
+            self.begin(m.group(2), now)
+            return
+
+        m = COLMAP_FILE_RE.search(line)
+        if m:
+            self.done, self.total = int(m.group(1)), int(m.group(2))
+            self.image_count = self.total
+            self.unit = "images"
+            self.detail = f"features {self.done}/{self.total} images"
+            return
+        m = COLMAP_BLOCK_RE.search(line)
+        if m:
+            i, n = int(m.group(1)), int(m.group(2))
+            if m.group(3):
+                j, k = int(m.group(3)), int(m.group(4))
+                self.done, self.total = (i - 1) * k + j, n * k
+            else:
+                self.done, self.total = i, n
+            self.unit = "blocks"
+            self.detail = f"matching block {self.done}/{self.total}"
+            return
+        m = COLMAP_REGISTER_RE.search(line)
+        if m:
+            self.done, self.total = int(m.group(1)), self.image_count
+            self.unit = "images"
+            self.detail = f"registered {self.done}" + (f"/{self.total}" if self.total else "") + " images"
+            return
+
+        # ns-train prints a table: "Step (% Done) | Train Iter (time) | ETA (time) | Train Rays / Sec".
+        cols = re.split(r"\s{2,}", text)
+        m = TRAIN_ROW_RE.match(cols[0]) if cols else None
+        if m and len(cols) >= 3:
+            self.train_step = int(m.group(1))
+            pct = float(m.group(2))
+            self.done, self.total = int(round(pct * 100)), 10000
+            self.unit = "steps"
+            self.train_eta = cols[2]
+            self.train_rate = cols[3] if len(cols) > 3 else ""
+            self.detail = f"step {self.train_step} ({pct:.1f}%), ETA {self.train_eta}" + (f", {self.train_rate} rays/s" if self.train_rate else "")
+            return
+        if EXPORT_RE.search(line):
+            self.exported = True
+            self.detail = "splat exported"
+
+    def summary(self, now: float = None) -> str:
+        now = time.monotonic() if now is None else now
+        parts = [f"{s.name} {s.status} {s.elapsed(now):.1f}s" for s in self.stages]
+        tail = self.state + (f": {self.error}" if self.error else "")
+        return "; ".join(parts + [tail])
+
+def main(argv=None):
+    # Replays a recorded log with one second per line, printing each stage transition.
+    argv = sys.argv[1:] if argv is None else argv
+    progress = PipelineProgress()
+    with open(argv[0], "r", encoding="utf-8", errors="replace") as f:
+        for t, line in enumerate(f):
+            before = (len(progress.stages), progress.detail)
+            progress.feed(line, now=float(t))
+            if (len(progress.stages), progress.detail) != before and progress.current is not None:
+                print(f"{progress.current.name}: {progress.detail}")
+    print(progress.summary(now=float(t)))
+    return 0 if progress.state != "FAILED" else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
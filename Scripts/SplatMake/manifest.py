@@ -0,0 +1,249 @@
+import bpy
+import os
+import json
+import time
+import hashlib
+
+import numpy as np
+
+from .utils import IMAGE_EXTENSIONS, ensure_dir, image_filename, pyramid_dir, pyramid_factors
+from .cameras import dataset_rig
+from .rig import view_resolutions
+
+MANIFEST_NAME = "render_manifest.json"
+MANIFEST_VERSION = 1
+# Rewriting the whole manifest after every image is quadratic in the dataset size; batch the saves instead.
+FLUSH_EVERY = 64
+FLUSH_SECONDS = 5.0
+
+def render_settings_dict(p):
+    settings = {
+        "engine": p.engine,
+        "res_x": int(p.res_x),
+        "res_y": int(p.res_y),
+        "png_compression": int(p.png_compression),
+        "film_transparent": bool(p.film_transparent),
+        "cycles_samples": int(p.cycles_samples),
+        "cycles_denoise": bool(p.cycles_denoise),
+    }
+    if p.crop_mode != "OFF":
+        # Only present when enabled so datasets rendered before auto-crop existed keep their keys.
+        settings["crop"] = [p.crop_mode, int(p.crop_padding_px)]
+    if p.image_format != "PNG":
+        settings["image_format"] = [p.image_format, int(p.image_quality)]
+    return settings
+
+def intrinsics_dict(p):
+    return {
+        "focal_mm": float(p.focal_mm),
+        "sensor_width_mm": float(p.sensor_width_mm),
+        "clip_start": float(p.clip_start),
+        "clip_end": float(p.clip_end),
+    }
+
+def _hash_socket_values(h, node_tree):
+    for node in node_tree.nodes:
+        h.update(node.bl_idname.encode())
+        h.update(node.name.encode())
+        image = getattr(node, "image", None)
+        if image is not None:
+            h.update(image.filepath.encode())
+        for sock in node.inputs:
+            value = getattr(sock, "default_value", None)
+            if value is None:
+                continue
+            h.update(repr(tuple(value) if hasattr(value, "__len__") else value).encode())
+    for link in node_tree.links:
+        h.update(f"{link.from_node.name}.{link.from_socket.identifier}>{link.to_node.name}.{link.to_socket.identifier}".encode())
+
+def scene_fingerprint(scene, depsgraph):
+    # Evaluated mesh geometry, transforms and material node settings of every visible mesh object.
+    h = hashlib.sha1()
+    materials = {}
+    for obj in sorted(scene.objects, key=lambda o: o.name):
+        if obj.type != "MESH" or not obj.visible_get():
+            continue
+        eval_obj = obj.evaluated_get(depsgraph)
+        mesh = eval_obj.to_mesh()
+        try:
+            co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+            mesh.vertices.foreach_get("co", co)
+            h.update(obj.name.encode())
+            h.update(co.tobytes())
+            h.update(np.array(eval_obj.matrix_world, dtype=np.float32).tobytes())
+            for mat in mesh.materials:
+                if mat is not None:
+                    materials[mat.name] = mat
+        finally:
+            eval_obj.to_mesh_clear()
+
+    for name in sorted(materials):
+        mat = materials[name]
+        h.update(name.encode())
+        if mat.use_nodes and mat.node_tree is not None:
+            _hash_socket_values(h, mat.node_tree)
+        else:
+            h.update(repr(tuple(mat.diffuse_color)).encode())
+
+    world = scene.world
+    if world is not None:
+        h.update(world.name.encode())
+        if world.use_nodes and world.node_tree is not None:
+            _hash_socket_values(h, world.node_tree)
+    return h.hexdigest()
+
+def image_keys(matrices, intrinsics: dict, settings: dict, scene_fp: str, resolutions=None):
+    shared = json.dumps({"intrinsics": intrinsics, "settings": settings, "scene": scene_fp}, sort_keys=True).encode()
+    # Round so float noise from re-creating the same rig doesn't invalidate images.
+    mats = np.round(np.asarray(matrices, dtype=np.float64).reshape(-1, 4, 4), 6) + 0.0
+    if resolutions is None:
+        return [hashlib.sha1(shared + m.tobytes()).hexdigest() for m in mats]
+    res = np.asarray(resolutions, dtype=np.int64).reshape(-1, 2)
+    return [hashlib.sha1(shared + m.tobytes() + r.tobytes()).hexdigest() for m, r in zip(mats, res)]
+
+def load_manifest(out_images: str):
+    path = os.path.join(out_images, MANIFEST_NAME)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = None
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        data = {"version": MANIFEST_VERSION, "images": {}}
+    data.setdefault("images", {})
+    return data
+
+def save_manifest(out_images: str, data: dict):
+    ensure_dir(out_images)
+    path = os.path.join(out_images, MANIFEST_NAME)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+class ManifestSaver:
+    # Records finished images and saves the manifest every FLUSH_EVERY records or FLUSH_SECONDS, whichever
+    # comes first. flush() writes whatever is pending; an interrupted render loses at most one batch,
+    # which the next run simply re-renders.
+    def __init__(self, out_images: str, data: dict, every: int = FLUSH_EVERY, seconds: float = FLUSH_SECONDS):
+        self.out_images = out_images
+        self.data = data
+        self.every = every
+        self.seconds = seconds
+        self.pending = 0
+        self.t_saved = time.monotonic()
+
+    def record(self, filename: str, key: str, factors=()):
+        record_image(self.data, self.out_images, filename, key, factors)
+        self.pending += 1
+        if self.pending >= self.every or time.monotonic() - self.t_saved >= self.seconds:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            save_manifest(self.out_images, self.data)
+            self.pending = 0
+        self.t_saved = time.monotonic()
+
+def _pyramid_path(out_images: str, factor, filename: str) -> str:
+    return os.path.join(pyramid_dir(os.path.dirname(out_images), int(factor)), filename)
+
+def record_image(data: dict, out_images: str, filename: str, key: str, factors=()):
+    path = os.path.join(out_images, filename)
+    entry = {"key": key, "size": os.path.getsize(path)}
+    if factors:
+        entry["pyramid"] = {str(f): os.path.getsize(_pyramid_path(out_images, f, filename)) for f in factors}
+    data["images"][filename] = entry
+
+def _pyramid_ok(out_images: str, filename: str, entry, factors) -> bool:
+    levels = entry.get("pyramid", {})
+    try:
+        return all(os.path.getsize(_pyramid_path(out_images, f, filename)) == levels.get(str(f)) for f in factors)
+    except OSError:
+        return False
+
+def _entry_ok(out_images: str, filename: str, entry, key: str, factors=()):
+    if entry is None or entry.get("key") != key:
+        return False
+    try:
+        if os.path.getsize(os.path.join(out_images, filename)) != entry.get("size"):
+            return False
+    except OSError:
+        return False
+    return _pyramid_ok(out_images, filename, entry, factors)
+
+def find_orphans(out_images: str, data: dict, filenames, prefix: str):
+    wanted = set(filenames)
+    orphans = {f for f in data["images"] if f not in wanted}
+    # Any dataset image format counts, so switching formats clears out the old files.
+    exts = tuple(IMAGE_EXTENSIONS.values())
+    if os.path.isdir(out_images):
+        for f in os.listdir(out_images):
+            if f.startswith(prefix) and f.endswith(exts) and f not in wanted:
+                orphans.add(f)
+    return sorted(orphans)
+
+def plan_render(out_images: str, data: dict, filenames, keys, factors=()):
+    # Indices of images that are missing on disk (at any pyramid level) or whose inputs changed since they were rendered.
+    images = data["images"]
+    return [i for i, (f, k) in enumerate(zip(filenames, keys)) if not _entry_ok(out_images, f, images.get(f), k, factors)]
+
+def remove_orphans(out_images: str, data: dict, orphans):
+    for f in orphans:
+        try:
+            os.remove(os.path.join(out_images, f))
+        except FileNotFoundError:
+            pass
+        for factor in data["images"].get(f, {}).get("pyramid", {}):
+            try:
+                os.remove(_pyramid_path(out_images, factor, f))
+            except FileNotFoundError:
+                pass
+        data["images"].pop(f, None)
+
+def verify_dataset(out_images: str, data: dict, filenames, keys, prefix: str, factors=()):
+    images = data["images"]
+    result = {"ok": 0, "missing": [], "stale": [], "size_mismatch": [], "orphans": find_orphans(out_images, data, filenames, prefix)}
+    for f, k in zip(filenames, keys):
+        entry = images.get(f)
+        path = os.path.join(out_images, f)
+        if not os.path.exists(path):
+            result["missing"].append(f)
+        elif entry is None or entry.get("key") != k:
+            result["stale"].append(f)
+        elif os.path.getsize(path) != entry.get("size") or not _pyramid_ok(out_images, f, entry, factors):
+            result["size_mismatch"].append(f)
+        else:
+            result["ok"] += 1
+    return result
+
+def dataset_keys(p, context, rig):
+    scene_fp = scene_fingerprint(context.scene, context.evaluated_depsgraph_get())
+    # Per-view resolutions only join the key when enabled so existing datasets keep their keys.
+    resolutions = view_resolutions(p, rig.layers) if p.use_layer_resolution else None
+    return image_keys(rig.matrices, intrinsics_dict(p), render_settings_dict(p), scene_fp, resolutions)
+
+class NSOT_OT_verify_dataset(bpy.types.Operator):
+    bl_idname = "nsot.verify_dataset"
+    bl_label = "Verify Dataset"
+    bl_description = "Checks images/ against render_manifest.json and the current rig, scene and settings without rendering"
+    bl_options = {"REGISTER"}
+
+    def execute(self, context):
+        p = context.scene.nsot_props
+        if not p.output_dir:
+            self.report({"ERROR"}, "Output Directory is empty.")
+            return {"CANCELLED"}
+
+        out_images = os.path.join(bpy.path.abspath(p.output_dir), "images")
+        rig = dataset_rig(p)
+        filenames = [image_filename(n, p.image_format) for n in rig.names]
+        result = verify_dataset(out_images, load_manifest(out_images), filenames, dataset_keys(p, context, rig), p.name_prefix, pyramid_factors(p.pyramid_levels))
+
+        bad = len(result["missing"]) + len(result["stale"]) + len(result["size_mismatch"])
+        msg = (
+            f"{result['ok']}/{len(filenames)} up to date, {len(result['missing'])} missing, "
+            f"{len(result['stale'])} stale, {len(result['size_mismatch'])} size mismatch, {len(result['orphans'])} orphans"
+        )
+        self.report({"WARNING"} if bad or result["orphans"] else {"INFO"}, msg)
+        return {"FINISHED"}
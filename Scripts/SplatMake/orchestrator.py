@@ -0,0 +1,440 @@
+# Cross-platform pipeline runner: python orchestrator.py pipeline.json [--dry-run] [--force STAGE] [--fake-tools]
+# Standalone on purpose: Blender copies it next to the dataset so it also runs on nodes without the add-on.
+# Stages form a DAG; each stage is fingerprinted from its parameters, input files and upstream fingerprints,
+# and skipped when nothing changed since it last succeeded. State lives in _pipeline/state.json, so a
+# failed run resumes from the failing stage.
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import subprocess
+from collections import namedtuple
+
+# staging.py (and the splat_* modules for the prune/compress stages) are copied alongside this script.
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from staging import stage_dataset
+
+STATE_DIR = "_pipeline"
+STATE_NAME = "state.json"
+LOG_PREFIX = "[nsot]"
+
+# run(ctx) -> result dict (stored in state), outputs(ctx, result) -> paths that must exist for a cache hit.
+Stage = namedtuple("Stage", ("name", "deps", "inputs", "params", "run", "outputs"))
+
+def log(msg: str):
+    print(f"{LOG_PREFIX} {msg}", flush=True)
+
+# ----------------------------------------------------------------------------- fingerprints
+
+def _hash_path(h, root: str, rel: str):
+    # Size + mtime, not content: cheap enough for thousands of images and changes whenever a file is rewritten.
+    path = os.path.join(root, rel)
+    if os.path.isfile(path):
+        st = os.stat(path)
+        h.update(f"{rel}|{st.st_size}|{st.st_mtime_ns}\n".encode())
+    elif os.path.isdir(path):
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            for name in sorted(filenames):
+                full = os.path.join(dirpath, name)
+                st = os.stat(full)
+                h.update(f"{os.path.relpath(full, root)}|{st.st_size}|{st.st_mtime_ns}\n".encode())
+    else:
+        h.update(f"{rel}|missing\n".encode())
+
+def stage_fingerprint(ctx, stage, dep_prints):
+    h = hashlib.sha1()
+    h.update(stage.name.encode())
+    h.update(json.dumps(stage.params, sort_keys=True).encode())
+    for dep in stage.deps:
+        h.update(dep_prints[dep].encode())
+    for rel in stage.inputs:
+        _hash_path(h, ctx.root, rel)
+    return h.hexdigest()
+
+# ----------------------------------------------------------------------------- tools
+
+class Context:
+    def __init__(self, root: str, config: dict, fake_tools: bool):
+        self.root = root
+        self.config = config
+        self.fake_tools = fake_tools
+        self.dataset = config.get("dataset", "colmap_data")
+        self.method = config.get("method", "splatfacto")
+        self.results = {}
+        self.log_dir = os.path.join(root, STATE_DIR, "logs")
+        os.makedirs(self.log_dir, exist_ok=True)
+
+    def path(self, *parts):
+        return os.path.join(self.root, *parts)
+
+    def tool(self, stage_name: str, argv):
+        # Runs one external tool, teeing its output to the console and _pipeline/logs/<stage>.log.
+        if self.fake_tools:
+            cmd = [sys.executable, os.path.abspath(__file__), "--fake-tool", *argv]
+        else:
+            cmd = list(self.config.get("tool_prefix", [])) + list(argv)
+        log(f"stage={stage_name} exec={subprocess.list2cmdline(cmd)}")
+        with open(os.path.join(self.log_dir, f"{stage_name}.log"), "a", encoding="utf-8") as logf:
+            logf.write(f"\n$ {subprocess.list2cmdline(cmd)}\n")
+            proc = subprocess.Popen(
+                cmd,
+                cwd=self.root,
+                env=dict(os.environ, PYTHONUNBUFFERED="1"),  # ns-* are Python; keep their progress lines live.
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                bufsize=1,
+            )
+            for line in proc.stdout:
+                sys.stdout.write(line)
+                sys.stdout.flush()
+                logf.write(line)
+            code = proc.wait()
+        if code != 0:
+            raise RuntimeError(f"{argv[0]} exited with code {code}")
+
+def _copy_atomic(src: str, dst: str):
+    tmp = dst + ".tmp"
+    shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+
+# ----------------------------------------------------------------------------- stages
+
+def _stage_images(ctx):
+    stats = stage_dataset(ctx.root, ctx.dataset, ctx.config.get("stage_dirs", ["images"]), ctx.config.get("staging_mode", "AUTO"),
+                          log=lambda msg: log(f"stage=stage_images {msg}"), extensions=ctx.config.get("stage_extensions"))
+    log(f"stage=stage_images bytes_linked={stats.bytes_linked} bytes_copied={stats.bytes_copied}")
+    return {"bytes_linked": stats.bytes_linked, "bytes_copied": stats.bytes_copied}
+
+def _feature_extraction(ctx):
+    db = ctx.path(ctx.dataset, "db_on.db")
+    if os.path.exists(db):
+        os.remove(db)  # feature_extractor appends; this stage owns the database.
+    ctx.tool("feature_extraction", [
+        "colmap", "feature_extractor",
+        "--database_path", db,
+        "--image_path", ctx.path(ctx.dataset, "images"),
+        "--ImageReader.single_camera", "1" if ctx.config.get("single_camera", True) else "0",
+        "--ImageReader.camera_model", "OPENCV",
+    ])
+    return {}
+
+def _matching(ctx):
+    db = ctx.path(ctx.dataset, "db_on.db")
+    if ctx.config.get("matcher") == "POSE_PAIRS":
+        ctx.tool("matching", ["colmap", "matches_importer", "--database_path", db, "--match_list_path", ctx.path("pairs.txt"), "--match_type", "pairs"])
+    else:
+        ctx.tool("matching", ["colmap", "exhaustive_matcher", "--database_path", db])
+    return {}
+
+def _mapping(ctx):
+    out = ctx.path(ctx.dataset, "sparse_on")
+    shutil.rmtree(out, ignore_errors=True)
+    os.makedirs(out)
+    ctx.tool("mapping", ["colmap", "mapper", "--database_path", ctx.path(ctx.dataset, "db_on.db"), "--image_path", ctx.path(ctx.dataset, "images"), "--output_path", out])
+    return {}
+
+def _copy_sparse(ctx):
+    dst = ctx.path(ctx.dataset, "sparse_on")
+    shutil.rmtree(dst, ignore_errors=True)
+    shutil.copytree(ctx.path("sparse"), dst)
+    return {}
+
+def _process_data(ctx):
+    data = ctx.path(ctx.dataset)
+    ctx.tool("process_data", [
+        "ns-process-data", "images",
+        "--data", data,
+        "--output-dir", data,
+        "--skip-colmap",
+        "--skip-image-processing",
+        "--colmap-model-path", "sparse_on/0",
+    ])
+    return {}
+
+def _copy_transforms(ctx):
+    _copy_atomic(ctx.path("transforms.json"), ctx.path(ctx.dataset, "transforms.json"))
+    if os.path.isfile(ctx.path("sparse_pc.ply")):
+        _copy_atomic(ctx.path("sparse_pc.ply"), ctx.path(ctx.dataset, "sparse_pc.ply"))
+    return {}
+
+def _run_dirs(ctx):
+    base = ctx.path("outputs", ctx.dataset, ctx.method)
+    if not os.path.isdir(base):
+        return []
+    dirs = [os.path.join(base, d) for d in os.listdir(base) if os.path.isdir(os.path.join(base, d))]
+    return sorted(dirs, key=os.path.getmtime, reverse=True)
+
+def _train(ctx):
+    before = set(_run_dirs(ctx))
+    vis = ["--vis", "viewer", "--viewer.quit-on-train-completion", "True"] if ctx.config.get("viewer") else ["--vis", "tensorboard"]
+    ctx.tool("train", [
+        "ns-train", ctx.method,
+        "--data", ctx.path(ctx.dataset),
+        "--output-dir", ctx.path("outputs"),
+        *vis,
+        "--max-num-iterations", str(int(ctx.config.get("max_iters", 30000))),
+    ])
+    new = [d for d in _run_dirs(ctx) if d not in before]
+    if not new:
+        raise RuntimeError(f"ns-train finished but created no run folder under outputs/{ctx.dataset}/{ctx.method}")
+    return {"run_dir": os.path.relpath(new[0], ctx.root)}
+
+def _export(ctx):
+    run_dir = ctx.path(ctx.results["train"]["run_dir"])
+    ctx.tool("export", ["ns-export", "gaussian-splat", "--load-config", os.path.join(run_dir, "config.yml"), "--output-dir", os.path.join(run_dir, "export")])
+    plys = []
+    for dirpath, _, filenames in os.walk(os.path.join(run_dir, "export")):
+        plys += [os.path.join(dirpath, f) for f in filenames if f.lower().endswith(".ply")]
+    if not plys:
+        raise RuntimeError(f"No .ply found under {run_dir}/export")
+    return {"ply": os.path.relpath(max(plys, key=os.path.getmtime), ctx.root)}
+
+def _copy_final(ctx):
+    _copy_atomic(ctx.path(ctx.results["export"]["ply"]), ctx.path(ctx.config.get("final_name", "FINAL_GSPLAT.ply")))
+    return {}
+
+def _compress(ctx):
+    # numpy is only needed from here on, so the stdlib-only stages still run without it.
+    from splat_compress import compress_splat
+    opts = ctx.config["compress"]
+    reports = compress_splat(ctx.path(ctx.config.get("final_name", "FINAL_GSPLAT.ply")), opts["formats"], opts.get("pos_bits", 16),
+                             opts.get("sh_degree", 3), opts.get("sh_mode", "u8"), log=lambda msg: log(f"stage=compress {msg}"))
+    return {"files": [os.path.relpath(r["path"], ctx.root) for r in reports]}
+
+def _prune(ctx):
+    # Always prunes the raw export, so rerunning with new thresholds never compounds.
+    # target/radius are Blender world units, so map them through the run's dataparser transform.
+    from splat_frame import splat_to_world
+    from splat_prune import WORLD_SETTINGS, format_prune_report, prune_splat, without_world_criteria
+    opts = ctx.config["prune"]
+    if ctx.config.get("mode", "SFM") == "SFM" and any(opts[k] for k in WORLD_SETTINGS):
+        log("stage=prune warning=SfM splats are not in Blender world space; pruning by opacity and SH only")
+        opts = without_world_criteria(opts)
+    # Only the world criteria need the transform; without it splat_to_world raises and the stage fails.
+    to_world = None
+    if any(opts[k] for k in WORLD_SETTINGS):
+        to_world = splat_to_world(ctx.path(ctx.results["train"]["run_dir"]), ctx.path(ctx.dataset))
+    report = prune_splat(ctx.path(ctx.results["export"]["ply"]), ctx.path(ctx.config.get("final_name", "FINAL_GSPLAT.ply")),
+                         opts["target"], opts["radius"], opts["min_opacity"], opts["max_scale_ratio"], opts["min_scale_ratio"],
+                         opts["max_distance_ratio"], opts["sh_degree"], to_world=to_world)
+    log(f"stage=prune {format_prune_report(report)}")
+    return {"count": report["count_after"]}
+
+def build_stages(ctx):
+    cfg = ctx.config
+    d = ctx.dataset
+    mode = cfg.get("mode", "SFM")
+    stage_dirs = [n for n in cfg.get("stage_dirs", ["images"])]
+    stage_params = {"dirs": stage_dirs, "staging_mode": cfg.get("staging_mode", "AUTO"), "extensions": cfg.get("stage_extensions")}
+    stages = [Stage("stage_images", (), stage_dirs, stage_params, _stage_images, lambda c, r: [c.path(d, "images")])]
+
+    if mode == "TRANSFORMS":
+        stages.append(Stage("copy_transforms", ("stage_images",), ["transforms.json", "sparse_pc.ply"], {}, _copy_transforms,
+                            lambda c, r: [c.path(d, "transforms.json")]))
+        data_stage = "copy_transforms"
+    else:
+        if mode == "KNOWN_POSES":
+            stages.append(Stage("copy_sparse", ("stage_images",), ["sparse"], {}, _copy_sparse, lambda c, r: [c.path(d, "sparse_on", "0")]))
+            model_stage = "copy_sparse"
+        else:
+            stages.append(Stage("feature_extraction", ("stage_images",), [], {"single_camera": cfg.get("single_camera", True)},
+                                _feature_extraction, lambda c, r: [c.path(d, "db_on.db")]))
+            pairs = ["pairs.txt"] if cfg.get("matcher") == "POSE_PAIRS" else []
+            stages.append(Stage("matching", ("feature_extraction",), pairs, {"matcher": cfg.get("matcher", "EXHAUSTIVE")},
+                                _matching, lambda c, r: [c.path(d, "db_on.db")]))
+            stages.append(Stage("mapping", ("matching",), [], {}, _mapping, lambda c, r: [c.path(d, "sparse_on", "0")]))
+            model_stage = "mapping"
+        stages.append(Stage("process_data", (model_stage,), [], {}, _process_data, lambda c, r: [c.path(d, "transforms.json")]))
+        data_stage = "process_data"
+
+    stages.append(Stage("train", (data_stage,), [], {"method": ctx.method, "max_iters": int(cfg.get("max_iters", 30000))}, _train,
+                        lambda c, r: [c.path(r["run_dir"], "config.yml")] if r.get("run_dir") else [None]))
+    stages.append(Stage("export", ("train",), [], {}, _export, lambda c, r: [c.path(r["ply"])] if r.get("ply") else [None]))
+    stages.append(Stage("copy_final", ("export",), [], {}, _copy_final, lambda c, r: [c.path(cfg.get("final_name", "FINAL_GSPLAT.ply"))]))
+    final_stage = "copy_final"
+    if cfg.get("prune"):
+        stages.append(Stage("prune", ("copy_final",), [], cfg["prune"], _prune, lambda c, r: [c.path(cfg.get("final_name", "FINAL_GSPLAT.ply"))]))
+        final_stage = "prune"
+    if cfg.get("compress", {}).get("formats"):
+        stages.append(Stage("compress", (final_stage,), [], cfg["compress"], _compress,
+                            lambda c, r: [c.path(f) for f in r["files"]] if r.get("files") else [None]))
+    return stages
+
+# ----------------------------------------------------------------------------- runner
+
+def load_state(root: str):
+    try:
+        with open(os.path.join(root, STATE_DIR, STATE_NAME), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"stages": {}}
+
+def save_state(root: str, state: dict):
+    path = os.path.join(root, STATE_DIR, STATE_NAME)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+def descendants(stages, names):
+    out = set(names)
+    for stage in stages:  # stages are in topological order
+        if any(dep in out for dep in stage.deps):
+            out.add(stage.name)
+    return out
+
+def _cache_hit(ctx, stage, entry, fingerprint):
+    if entry is None or entry.get("status") != "done" or entry.get("fingerprint") != fingerprint:
+        return False
+    return all(p is not None and os.path.exists(p) for p in stage.outputs(ctx, entry.get("result", {})))
+
+def run_pipeline(ctx, dry_run: bool = False, force=()):
+    stages = build_stages(ctx)
+    state = load_state(ctx.root)
+    forced = descendants(stages, force)
+    prints = {}
+    rerun = set()
+    plan = []
+    for stage in stages:
+        fp = stage_fingerprint(ctx, stage, prints)
+        prints[stage.name] = fp
+        entry = state["stages"].get(stage.name)
+        if stage.name in forced:
+            reason = "forced"
+        elif any(dep in rerun for dep in stage.deps):
+            reason = "upstream changed"
+        elif not _cache_hit(ctx, stage, entry, fp):
+            reason = "failed last run" if entry and entry.get("status") == "failed" else ("inputs changed" if entry else "never run")
+        else:
+            reason = None
+        plan.append((stage, fp, reason))
+        if reason is not None:
+            rerun.add(stage.name)
+            # Upstream outputs change on a rerun, so the fingerprint of later stages can't be trusted yet.
+        else:
+            ctx.results[stage.name] = entry.get("result", {})
+
+    for stage, fp, reason in plan:
+        log(f"stage={stage.name} plan={'RUN' if reason else 'SKIP'}" + (f" reason={reason.replace(' ', '_')}" if reason else ""))
+    if dry_run:
+        return 0
+
+    for stage, fp, reason in plan:
+        if reason is None:
+            continue
+        log(f"stage={stage.name} status=RUN")
+        t0 = time.time()
+        state["stages"][stage.name] = {"status": "running", "fingerprint": fp, "started": t0}
+        save_state(ctx.root, state)
+        try:
+            result = stage.run(ctx) or {}
+        except Exception as exc:
+            state["stages"][stage.name] = {"status": "failed", "fingerprint": fp, "error": str(exc), "seconds": time.time() - t0}
+            save_state(ctx.root, state)
+            log(f"stage={stage.name} status=FAIL error={exc}")
+            return 1
+        ctx.results[stage.name] = result
+        # Inputs may have been rewritten by upstream stages of this run; fingerprint what is on disk now.
+        fp = stage_fingerprint(ctx, stage, prints)
+        prints[stage.name] = fp
+        state["stages"][stage.name] = {"status": "done", "fingerprint": fp, "result": result, "seconds": round(time.time() - t0, 2)}
+        save_state(ctx.root, state)
+        log(f"stage={stage.name} status=DONE seconds={time.time() - t0:.1f}")
+
+    log("status=ALL_DONE")
+    return 0
+
+# ----------------------------------------------------------------------------- fake tools
+
+def _flag(args, name, default=None):
+    return args[args.index(name) + 1] if name in args else default
+
+def _touch(path: str, payload: bytes = b""):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "ab") as f:
+        f.write(payload)
+
+def _fake_splat(count: int) -> bytes:
+    # SH degree 0 splat of random gaussians in the unit sphere, enough for downstream stages to parse.
+    import random
+    import struct
+    fields = ["x", "y", "z", "nx", "ny", "nz", "f_dc_0", "f_dc_1", "f_dc_2", "opacity", "scale_0", "scale_1", "scale_2", "rot_0", "rot_1", "rot_2", "rot_3"]
+    header = "ply\nformat binary_little_endian 1.0\nelement vertex %d\n%send_header\n" % (count, "".join(f"property float {f}\n" for f in fields))
+    rng = random.Random(0)
+    rows = []
+    for _ in range(count):
+        rows.append(struct.pack("<17f", *(rng.uniform(-0.5, 0.5) for _ in range(3)), 0.0, 0.0, 0.0,
+                                *(rng.gauss(0.0, 1.0) for _ in range(4)), *(rng.gauss(-4.0, 0.5) for _ in range(3)),
+                                *(rng.gauss(0.0, 1.0) for _ in range(4))))
+    return header.encode("ascii") + b"".join(rows)
+
+def fake_tool(argv):
+    # Writes the files each real tool would produce, so the DAG can be exercised without COLMAP or a GPU.
+    tool, args = argv[0], argv[1:]
+    print(f"fake {tool} {' '.join(args)}")
+    if tool == "colmap":
+        sub = args[0]
+        if sub in {"feature_extractor", "exhaustive_matcher", "matches_importer"}:
+            _touch(_flag(args, "--database_path"), f"{sub}\n".encode())
+        elif sub == "mapper":
+            for name in ("cameras.bin", "images.bin", "points3D.bin"):
+                _touch(os.path.join(_flag(args, "--output_path"), "0", name))
+        else:
+            return 2
+    elif tool == "ns-process-data":
+        with open(os.path.join(_flag(args, "--output-dir"), "transforms.json"), "w", encoding="utf-8") as f:
+            json.dump({"frames": []}, f)
+    elif tool == "ns-train":
+        data = _flag(args, "--data")
+        iters = int(_flag(args, "--max-num-iterations", "100"))
+        print("Step (% Done)       Train Iter (time)    ETA (time)           Train Rays / Sec")
+        for step in range(0, iters, max(1, iters // 4)):
+            print(f"{step} ({100.0 * step / iters:.2f}%)        20.000 ms            {(iters - step) // 3000} m, 0 s          250.00 K", flush=True)
+        run = os.path.join(_flag(args, "--output-dir", "outputs"), os.path.basename(os.path.normpath(data)), args[0], time.strftime("%Y-%m-%d_%H%M%S") + f"_{os.getpid()}")
+        _touch(os.path.join(run, "config.yml"), f"data: {data}\n".encode())
+        # Identity dataparser transform, so world-space prune criteria can map the fake splat.
+        with open(os.path.join(run, "dataparser_transforms.json"), "w", encoding="utf-8") as f:
+            json.dump({"transform": [[1.0, 0.0, 0.0, 0.0], [0.0, 1.0, 0.0, 0.0], [0.0, 0.0, 1.0, 0.0]], "scale": 1.0}, f)
+    elif tool == "ns-export":
+        os.makedirs(_flag(args, "--output-dir"), exist_ok=True)
+        with open(os.path.join(_flag(args, "--output-dir"), "splat.ply"), "wb") as f:
+            f.write(_fake_splat(1000))
+        print(f"Saved PLY to {os.path.join(_flag(args, '--output-dir'), 'splat.ply')}")
+    else:
+        return 2
+    return 0
+
+# ----------------------------------------------------------------------------- entry point
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "--fake-tool":
+        return fake_tool(argv[1:])
+
+    parser = argparse.ArgumentParser(description="Run the splat pipeline with stage-level caching.")
+    parser.add_argument("config", help="pipeline.json written by the Blender add-on")
+    parser.add_argument("--dry-run", action="store_true", help="print which stages would run or be skipped, then exit")
+    parser.add_argument("--force", action="append", default=[], metavar="STAGE", help="rerun STAGE and everything after it")
+    parser.add_argument("--fake-tools", action="store_true", help="replace colmap/ns-* with stand-ins that only write their outputs")
+    args = parser.parse_args(argv)
+
+    config_path = os.path.abspath(args.config)
+    with open(config_path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    root = os.path.abspath(config.get("root") or os.path.dirname(config_path))
+    ctx = Context(root, config, args.fake_tools)
+
+    unknown = [s for s in args.force if s not in {st.name for st in build_stages(ctx)}]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+    return run_pipeline(ctx, dry_run=args.dry_run, force=args.force)
+
+if __name__ == "__main__":
+    sys.exit(main())
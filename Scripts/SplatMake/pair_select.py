@@ -0,0 +1,119 @@
+# Pose-aware image pairs for COLMAP matches_importer. No bpy imports: inside Blender the neighbour search
+# runs on mathutils' KDTree, elsewhere on a chunked NumPy search, so the benchmark needs only Python:
+#   python pair_select.py --bench 200 1000 5000 [--write DIR]
+# Matcher time against COLMAP (images must already be in DIR/images with features in DIR/db.db):
+#   colmap exhaustive_matcher --database_path DIR/db.db
+#   colmap matches_importer --database_path DIR/db.db --match_list_path DIR/pairs_N.txt --match_type pairs
+import os
+import sys
+import math
+import time
+
+import numpy as np
+
+try:
+    from mathutils import Vector
+    from mathutils.kdtree import KDTree
+except ImportError:
+    KDTree = None
+
+try:
+    from .utils import image_filename
+    from .rig import build_rig
+except ImportError:
+    from utils import image_filename
+    from rig import build_rig
+
+def view_directions(rig):
+    # Blender cameras look down their local -Z axis.
+    d = -rig.matrices[:, :3, 2]
+    return d / np.linalg.norm(d, axis=1, keepdims=True)
+
+def _kdtree_neighbours(dirs, query_n: int):
+    tree = KDTree(len(dirs))
+    for i, d in enumerate(dirs.tolist()):
+        tree.insert(d, i)
+    tree.balance()
+    for d in dirs.tolist():
+        yield [(j, chord) for _, j, chord in tree.find_n(Vector(d), query_n)]
+
+def _numpy_neighbours(dirs, query_n: int, chunk: int = 1024):
+    # The query_n smallest chords per view, nearest first; same answer as the KD-tree up to exact ties.
+    for s in range(0, len(dirs), chunk):
+        chords = np.sqrt(np.maximum(2.0 - 2.0 * (dirs[s:s + chunk] @ dirs.T), 0.0))
+        nearest = np.argpartition(chords, query_n - 1, axis=1)[:, :query_n]
+        for row, cand in zip(chords, nearest):
+            order = cand[np.argsort(row[cand], kind="stable")]
+            yield list(zip(order.tolist(), row[order].tolist()))
+
+def select_pairs(rig, target, k: int, max_angle_deg: float, max_scale_ratio: float):
+    n = len(rig.names)
+    if n < 2:
+        return []
+
+    # Only view directions are indexed. Rig cameras all aim at the target, so a camera centre is
+    # target - distance * direction: the direction search plus the distance-ratio check below bounds
+    # the centre offset as well, without a separate centre term.
+    dirs = view_directions(rig)
+    dist = np.maximum(np.linalg.norm(rig.positions - np.asarray(target, dtype=np.float64), axis=1), 1e-9)
+    layer_count = int(rig.layers.max()) + 1 if len(rig.layers) else 1
+
+    # Chord length between unit view directions for the angle threshold.
+    max_chord = 2.0 * math.sin(math.radians(max_angle_deg) / 2.0)
+    query_n = min(n, k * layer_count + 1)
+    neighbours = _kdtree_neighbours if KDTree is not None else _numpy_neighbours
+
+    pairs = set()
+    for i, found in enumerate(neighbours(dirs, query_n)):
+        kept = 0
+        for j, chord in found:
+            if j == i:
+                continue
+            if chord > max_chord:
+                break
+            ratio = dist[i] / dist[j]
+            if max(ratio, 1.0 / ratio) > max_scale_ratio:
+                continue
+            pairs.add((i, j) if i < j else (j, i))
+            kept += 1
+            if kept >= k:
+                break
+    return sorted(pairs)
+
+def write_pair_list(path: str, names, pairs, image_format: str = "PNG"):
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        for i, j in pairs:
+            f.write(f"{image_filename(names[i], image_format)} {image_filename(names[j], image_format)}\n")
+
+def benchmark(counts, layer_scales=(1.0, 1.5, 2.0), k: int = 20, max_angle_deg: float = 45.0, max_scale_ratio: float = 3.0, write_dir: str = ""):
+    # Fibonacci rigs split evenly over the radius layers, with the panel's default pair settings.
+    print(f"neighbour search: {'mathutils KDTree' if KDTree is not None else 'NumPy (mathutils not available)'}; "
+          f"k={k}, max angle {max_angle_deg:g} deg, max scale ratio {max_scale_ratio:g}, layers {list(layer_scales)}")
+    print("COLMAP matcher time is not measured; the pair ratio only estimates the matching speedup.")
+    for count in counts:
+        rig = build_rig("Cam_", [5.0 * s for s in layer_scales], 1.0, (0.0, 0.0, 0.0), (0.0, 0.0, 1.0), sampler="FIBONACCI",
+                        count=max(1, count // len(layer_scales)))
+        n = len(rig.names)
+        t0 = time.perf_counter()
+        pairs = select_pairs(rig, (0.0, 0.0, 0.0), k, max_angle_deg, max_scale_ratio)
+        seconds = time.perf_counter() - t0
+        exhaustive = n * (n - 1) // 2
+        # Only pair counts and selection time are measured here; COLMAP matcher time is not. matches_importer
+        # and exhaustive_matcher both match per pair, so the pair ratio is an estimate of the matching speedup.
+        print(f"{n:6d} cameras: {len(pairs):8d} pairs vs {exhaustive:9d} exhaustive ({exhaustive / max(1, len(pairs)):6.1f}x fewer), "
+              f"{len(pairs) / n:5.1f} per image, selected in {seconds:.2f}s")
+        if write_dir:
+            os.makedirs(write_dir, exist_ok=True)
+            write_pair_list(os.path.join(write_dir, f"pairs_{n}.txt"), rig.names, pairs)
+
+if __name__ == "__main__":
+    # Under "blender -b -P pair_select.py -- --bench ..." the script's own arguments follow "--".
+    args = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    if args and args[0] == "--bench":
+        write_dir = ""
+        if "--write" in args:
+            write_dir = args[args.index("--write") + 1]
+            args = args[:args.index("--write")]
+        benchmark([int(a) for a in args[1:]] or [200, 1000, 5000], write_dir=write_dir)
+    else:
+        print("usage: python pair_select.py --bench [COUNT ...] [--write DIR]")
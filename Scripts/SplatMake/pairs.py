@@ -0,0 +1,45 @@
+import bpy
+import os
+
+from .utils import ensure_dir
+from .cameras import dataset_rig
+from .pair_select import select_pairs, write_pair_list
+
+def write_dataset_pairs(p, out_root: str):
+    rig = dataset_rig(p)
+    if not rig.names:
+        return None
+
+    ensure_dir(out_root)
+    pairs = select_pairs(
+        rig,
+        (p.target_x, p.target_y, p.target_z),
+        int(p.pair_neighbors),
+        p.pair_max_angle,
+        p.pair_max_scale_ratio,
+    )
+    path = os.path.join(out_root, "pairs.txt")
+    write_pair_list(path, rig.names, pairs, p.image_format)
+    n = len(rig.names)
+    return path, len(pairs), n * (n - 1) // 2
+
+class NSOT_OT_write_pairs(bpy.types.Operator):
+    bl_idname = "nsot.write_pairs"
+    bl_label = "Write Pose-Aware Pair List"
+    bl_description = "Writes pairs.txt for COLMAP matches_importer, keeping only nearby views from the rig geometry"
+    bl_options = {"REGISTER"}
+
+    def execute(self, context):
+        p = context.scene.nsot_props
+        if not p.output_dir:
+            self.report({"ERROR"}, "Output Directory is empty.")
+            return {"CANCELLED"}
+
+        result = write_dataset_pairs(p, bpy.path.abspath(p.output_dir))
+        if result is None:
+            self.report({"ERROR"}, f"No rig cameras found for prefix '{p.name_prefix}'.")
+            return {"CANCELLED"}
+
+        path, count, exhaustive = result
+        self.report({"INFO"}, f"Wrote {count} pairs (exhaustive: {exhaustive}): {path}")
+        return {"FINISHED"}
@@ -1,8 +1,138 @@
 import bpy
 import os
+import sys
+import json
+import shutil
 import subprocess
 
-from .utils import ensure_dir
+from .utils import IMAGE_EXTENSIONS, ensure_dir
+from .colmap import write_known_poses_model
+from .transforms import write_dataset_transforms
+from .pairs import write_dataset_pairs
+from .staging import stage_dataset
+from .splat_prune import without_world_criteria
+from .pipeline_monitor import is_running, start_monitor
+
+ORCHESTRATOR_NAME = "orchestrator.py"
+# log_parser.py is not imported by the orchestrator; it is copied so recorded logs can be replayed in place.
+ORCHESTRATOR_MODULES = (ORCHESTRATOR_NAME, "staging.py", "splat_io.py", "splat_compress.py", "splat_prune.py",
+                        "splat_frame.py", "rig.py", "log_parser.py")
+DATASET_NAME = "colmap_data"
+PIPELINE_CONFIG_NAME = "pipeline.json"
+# Everything the render step may write next to images/; missing folders are skipped.
+STAGE_DIRS = ("images", "images_2", "images_4", "images_8", "masks", "masks_2", "masks_4", "masks_8")
+# Dataset image formats; masks are PNGs, so they are covered too.
+STAGE_EXTENSIONS = tuple(sorted(set(IMAGE_EXTENSIONS.values())))
+
+COLMAP_CHECK = r"""where colmap >nul || (echo [X] colmap not found on PATH & goto FAIL)
+"""
+
+SFM_STEPS = r"""echo [1] colmap feature_extractor...
+call colmap feature_extractor --database_path "%DATASET_NAME%\db_on.db" --image_path "%DATASET_NAME%\images" --ImageReader.single_camera {SINGLE_CAMERA} --ImageReader.camera_model OPENCV
+if errorlevel 1 goto FAIL
+
+{MATCH_STEP}
+echo [3] colmap mapper...
+if not exist "%DATASET_NAME%\sparse_on" mkdir "%DATASET_NAME%\sparse_on"
+call colmap mapper --database_path "%DATASET_NAME%\db_on.db" --image_path "%DATASET_NAME%\images" --output_path "%DATASET_NAME%\sparse_on"
+if errorlevel 1 goto FAIL
+
+"""
+
+EXHAUSTIVE_MATCH_STEP = r"""echo [2] colmap exhaustive_matcher...
+call colmap exhaustive_matcher --database_path "%DATASET_NAME%\db_on.db"
+if errorlevel 1 goto FAIL
+"""
+
+PAIRS_MATCH_STEP = r"""echo [2] colmap matches_importer (pose-aware pairs)...
+call colmap matches_importer --database_path "%DATASET_NAME%\db_on.db" --match_list_path "pairs.txt" --match_type pairs
+if errorlevel 1 goto FAIL
+"""
+
+KNOWN_POSES_STEPS = r"""echo [1] known poses: using sparse model written by Blender, skipping COLMAP...
+if not exist "sparse\0\images.bin" (
+  echo [X] Missing sparse\0\images.bin, write the COLMAP model first
+  goto FAIL
+)
+xcopy /e /i /y "sparse" "%DATASET_NAME%\sparse_on" >nul
+if errorlevel 1 goto FAIL
+
+"""
+
+PROCESS_DATA_STEPS = r"""echo [4] nerfstudio process-data...
+ns-process-data images --data "%DATASET_NAME%" --output-dir "%DATASET_NAME%" --skip-colmap --skip-image-processing --colmap-model-path "sparse_on/0"
+if errorlevel 1 goto FAIL
+
+"""
+
+NATIVE_TRANSFORMS_STEPS = r"""echo [1] native transforms.json: skipping COLMAP and ns-process-data...
+if not exist "transforms.json" (
+  echo [X] Missing transforms.json, write it first
+  goto FAIL
+)
+copy /y "transforms.json" "%DATASET_NAME%\transforms.json" >nul
+if errorlevel 1 goto FAIL
+if exist "sparse_pc.ply" copy /y "sparse_pc.ply" "%DATASET_NAME%\sparse_pc.ply" >nul
+
+"""
+
+def single_camera(p) -> bool:
+    # Per-layer resolutions mean one intrinsics set per image size, so COLMAP can't share a single camera.
+    return not (p.use_layer_resolution and p.render_mode != "VIRTUAL")
+
+def tool_prefix(p):
+    # Tools run inside the conda env via `conda run`; without a conda install they must be on PATH.
+    conda = bpy.path.abspath(p.conda_bat) if p.conda_bat else ""
+    if conda and os.path.isfile(conda):
+        return [conda, "run", "-n", p.conda_env, "--no-capture-output"]
+    return []
+
+def compress_options(p):
+    formats = [fmt for fmt, on in (("splat", p.export_dot_splat), ("nspz", p.export_nspz)) if on]
+    return {"formats": formats, "pos_bits": int(p.nspz_position_bits), "sh_degree": int(p.nspz_sh_degree), "sh_mode": p.nspz_sh_mode}
+
+def prune_settings(p):
+    # Distance and scale criteria are only meaningful when the splat can be mapped back to world space.
+    settings = {
+        "target": [p.target_x, p.target_y, p.target_z],
+        "radius": float(p.radius),
+        "min_opacity": float(p.prune_min_opacity),
+        "max_scale_ratio": float(p.prune_max_scale),
+        "min_scale_ratio": float(p.prune_min_scale),
+        "max_distance_ratio": float(p.prune_max_distance),
+        "sh_degree": int(p.prune_sh_degree),
+    }
+    return without_world_criteria(settings) if p.pipeline_mode == "SFM" else settings
+
+def write_orchestrator(p, out_root: str):
+    # Copies the standalone orchestrator next to the dataset so the folder can be rerun on another machine.
+    for name in ORCHESTRATOR_MODULES:
+        shutil.copy2(os.path.join(os.path.dirname(__file__), name), os.path.join(out_root, name))
+    script = os.path.join(out_root, ORCHESTRATOR_NAME)
+    config = {
+        "dataset": DATASET_NAME,
+        "method": "splatfacto",
+        "mode": p.pipeline_mode,
+        "matcher": p.matcher,
+        "single_camera": single_camera(p),
+        "max_iters": int(p.max_num_iterations),
+        "viewer": bool(p.open_viewer),
+        "tool_prefix": tool_prefix(p),
+        "stage_dirs": list(STAGE_DIRS),
+        "staging_mode": p.staging_mode,
+        "stage_extensions": list(STAGE_EXTENSIONS),
+        "prune": prune_settings(p) if p.use_prune else None,
+        "compress": compress_options(p),
+    }
+    config_path = os.path.join(out_root, PIPELINE_CONFIG_NAME)
+    with open(config_path, "w", encoding="utf-8") as f:
+        json.dump(config, f, indent=2)
+    return script, config_path
+
+def launch_orchestrator(p, out_root: str, extra_args=(), label: str = "Pipeline"):
+    script, config_path = write_orchestrator(p, out_root)
+    # sys.executable is Blender's bundled Python; the orchestrator only needs the standard library.
+    return start_monitor([sys.executable, "-u", script, config_path, *extra_args], out_root, label)
 
 class NSOT_OT_write_pipeline_bat(bpy.types.Operator):
     bl_idname = "nsot.write_pipeline_bat"
@@ -15,12 +145,45 @@ class NSOT_OT_write_pipeline_bat(bpy.types.Operator):
         if not p.output_dir:
             self.report({"ERROR"}, "Output Directory is empty.")
             return {"CANCELLED"}
+        if is_running():
+            self.report({"ERROR"}, "A pipeline is already running; cancel it first.")
+            return {"CANCELLED"}
 
         out_root = bpy.path.abspath(p.output_dir)
         ensure_dir(out_root)
 
         bat_path = os.path.join(out_root, "run_pipeline.bat")
 
+        known_poses = p.pipeline_mode == "KNOWN_POSES"
+        native = p.pipeline_mode == "TRANSFORMS"
+        if known_poses:
+            written = write_known_poses_model(p, out_root, context)
+        elif native:
+            written = write_dataset_transforms(p, out_root, context)
+        elif p.matcher == "POSE_PAIRS":
+            written = write_dataset_pairs(p, out_root)
+        else:
+            written = True
+        if written is None:
+            self.report({"ERROR"}, f"No rig cameras found for prefix '{p.name_prefix}'.")
+            return {"CANCELLED"}
+
+        if p.pipeline_backend == "PYTHON":
+            launch_orchestrator(p, out_root)
+            self.report({"INFO"}, f"Started pipeline orchestrator in {out_root} (state in _pipeline/)")
+            return {"FINISHED"}
+
+        try:
+            stats = stage_dataset(out_root, DATASET_NAME, STAGE_DIRS, p.staging_mode, log=lambda msg: print(f"[NSOT] staging {msg}"),
+                                  extensions=STAGE_EXTENSIONS)
+        except OSError as exc:
+            # HARDLINK/SYMLINK do not fall back; AUTO and COPY always can.
+            self.report({"ERROR"}, f"Dataset staging ({p.staging_mode.title()}) failed: {exc}. Set Dataset Staging to Auto or Copy.")
+            return {"CANCELLED"}
+        if stats.linked + stats.symlinked + stats.copied + stats.unchanged == 0:
+            self.report({"ERROR"}, "No rendered images found in images/.")
+            return {"CANCELLED"}
+
         bat = r"""@echo off
 setlocal EnableExtensions EnableDelayedExpansion
 
@@ -47,35 +210,16 @@ if errorlevel 1 goto FAIL
 where ns-process-data >nul || (echo [X] ns-process-data not found & goto FAIL)
 where ns-train >nul || (echo [X] ns-train not found & goto FAIL)
 where ns-export >nul || (echo [X] ns-export not found & goto FAIL)
-where colmap >nul || (echo [X] colmap not found on PATH & goto FAIL)
-
-echo [0.1] reset dataset folder
-if exist "%DATASET_NAME%" rmdir /s /q "%DATASET_NAME%"
-mkdir "%DATASET_NAME%"
-mkdir "%DATASET_NAME%\images"
-
-echo [0.2] copying images...
-xcopy /e /i /y "images" "%DATASET_NAME%\images" >nul
-if errorlevel 1 goto FAIL
-
-echo [1] colmap feature_extractor...
-call colmap feature_extractor --database_path "%DATASET_NAME%\db_on.db" --image_path "%DATASET_NAME%\images" --ImageReader.single_camera 1 --ImageReader.camera_model OPENCV
-if errorlevel 1 goto FAIL
-
-echo [2] colmap exhaustive_matcher...
-call colmap exhaustive_matcher --database_path "%DATASET_NAME%\db_on.db"
-if errorlevel 1 goto FAIL
-
-echo [3] colmap mapper...
-if not exist "%DATASET_NAME%\sparse_on" mkdir "%DATASET_NAME%\sparse_on"
-call colmap mapper --database_path "%DATASET_NAME%\db_on.db" --image_path "%DATASET_NAME%\images" --output_path "%DATASET_NAME%\sparse_on"
-if errorlevel 1 goto FAIL
-
-echo [4] nerfstudio process-data...
-ns-process-data images --data "%DATASET_NAME%" --output-dir "%DATASET_NAME%" --skip-colmap --skip-image-processing --colmap-model-path "sparse_on/0"
-if errorlevel 1 goto FAIL
+{COLMAP_CHECK}
+echo [0.1] reset reconstruction outputs (images are staged by Blender)
+if exist "%DATASET_NAME%\db_on.db" del /q "%DATASET_NAME%\db_on.db"
+if exist "%DATASET_NAME%\sparse_on" rmdir /s /q "%DATASET_NAME%\sparse_on"
+if not exist "%DATASET_NAME%\images" (
+  echo [X] Missing %DATASET_NAME%\images, staging failed
+  goto FAIL
+)
 
-echo [5] training... OPEN_VIEWER=%OPEN_VIEWER%
+{SFM_STEPS}{PROCESS_DATA}echo [5] training... OPEN_VIEWER=%OPEN_VIEWER%
 if "%OPEN_VIEWER%"=="1" goto TRAIN_VIEWER
 goto TRAIN_HEADLESS
 
@@ -153,14 +297,24 @@ exit /b %errorlevel%
         bat = bat.replace("{CONDA_ENV}", p.conda_env)
         bat = bat.replace("{OPEN_VIEWER}", "1" if p.open_viewer else "0")
         bat = bat.replace("{MAX_ITERS}", str(int(p.max_num_iterations)))
+        if native:
+            bat = bat.replace("{COLMAP_CHECK}", "")
+            bat = bat.replace("{SFM_STEPS}", NATIVE_TRANSFORMS_STEPS)
+            bat = bat.replace("{PROCESS_DATA}", "")
+        else:
+            bat = bat.replace("{COLMAP_CHECK}", "" if known_poses else COLMAP_CHECK)
+            bat = bat.replace("{SFM_STEPS}", KNOWN_POSES_STEPS if known_poses else SFM_STEPS)
+            bat = bat.replace("{PROCESS_DATA}", PROCESS_DATA_STEPS)
+        bat = bat.replace("{MATCH_STEP}", PAIRS_MATCH_STEP if p.matcher == "POSE_PAIRS" else EXHAUSTIVE_MATCH_STEP)
+        bat = bat.replace("{SINGLE_CAMERA}", "1" if single_camera(p) else "0")
 
         with open(bat_path, "w", newline="\r\n", encoding="utf-8") as f:
             f.write(bat)
             
         
-        subprocess.Popen(["cmd", "/c", "start", "", bat_path], cwd=out_root)
+        start_monitor(["cmd", "/c", bat_path], out_root, "Pipeline")
 
-        self.report({"INFO"}, f"Wrote pipeline BAT: {bat_path}")
+        self.report({"INFO"}, f"Wrote pipeline BAT: {bat_path}; staged dataset {stats.summary()}")
         return {"FINISHED"}
 
 
@@ -175,10 +329,18 @@ class NSOT_OT_write_export_bat(bpy.types.Operator):
         if not p.output_dir:
             self.report({"ERROR"}, "Output Directory is empty.")
             return {"CANCELLED"}
+        if is_running():
+            self.report({"ERROR"}, "A pipeline is already running; cancel it first.")
+            return {"CANCELLED"}
 
         out_root = bpy.path.abspath(p.output_dir)
         ensure_dir(out_root)
 
+        if p.pipeline_backend == "PYTHON":
+            launch_orchestrator(p, out_root, ("--force", "export"), label="Export")
+            self.report({"INFO"}, f"Started orchestrator export in {out_root}")
+            return {"FINISHED"}
+
         bat_path = os.path.join(out_root, "export_latest.bat")
 
         bat = r"""@echo off
@@ -264,7 +426,35 @@ exit /b %errorlevel%
             f.write(bat)
             
         
-        subprocess.Popen(["cmd", "/c", "start", "", bat_path], cwd=out_root)
+        start_monitor(["cmd", "/c", bat_path], out_root, "Export")
 
         self.report({"INFO"}, f"Wrote export BAT: {bat_path}")
         return {"FINISHED"}
+
+
+class NSOT_OT_pipeline_plan(bpy.types.Operator):
+    bl_idname = "nsot.pipeline_plan"
+    bl_label = "Show Pipeline Plan"
+    bl_description = "Dry-runs the Python orchestrator and prints which stages would run or be skipped as cached"
+    bl_options = {"REGISTER"}
+
+    def execute(self, context):
+        p = context.scene.nsot_props
+        if not p.output_dir:
+            self.report({"ERROR"}, "Output Directory is empty.")
+            return {"CANCELLED"}
+
+        out_root = bpy.path.abspath(p.output_dir)
+        ensure_dir(out_root)
+        script, config_path = write_orchestrator(p, out_root)
+        result = subprocess.run([sys.executable, script, config_path, "--dry-run"], cwd=out_root, capture_output=True, text=True)
+        print(result.stdout + result.stderr)
+        if result.returncode != 0:
+            detail = (result.stderr.strip() or f"exit code {result.returncode}").splitlines()[-1]
+            self.report({"ERROR"}, f"Dry run failed: {detail}")
+            return {"CANCELLED"}
+
+        plan = [line for line in result.stdout.splitlines() if " plan=" in line]
+        run = [line.split("stage=")[1].split()[0] for line in plan if "plan=RUN" in line]
+        self.report({"INFO"}, f"{len(run)}/{len(plan)} stages would run: {', '.join(run) or 'none (all cached)'}")
+        return {"FINISHED"}
@@ -0,0 +1,138 @@
+import bpy
+import os
+import queue
+import signal
+import subprocess
+import threading
+import time
+
+from .utils import ensure_dir, tag_panel_redraw
+from .log_parser import PipelineProgress
+
+LOG_NAME = "pipeline.log"
+POLL_INTERVAL = 0.5
+
+class PipelineMonitor:
+    # Owns the pipeline child process. A reader thread moves its output into a queue; the parser only
+    # runs on Blender's main thread, from the bpy.app.timers callback.
+    def __init__(self, cmd, cwd: str, label: str):
+        self.label = label
+        self.progress = PipelineProgress()
+        self.lines = queue.Queue()
+        self.cancelled = False
+        self.returncode = None
+
+        log_dir = os.path.join(cwd, "_pipeline")
+        ensure_dir(log_dir)
+        self.log_path = os.path.join(log_dir, LOG_NAME)
+        self.log = open(self.log_path, "w", encoding="utf-8")
+
+        kwargs = {}
+        if os.name == "nt":
+            kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.CREATE_NO_WINDOW
+        else:
+            kwargs["start_new_session"] = True  # so cancel() can signal the whole tool tree
+        self.proc = subprocess.Popen(
+            cmd,
+            cwd=cwd,
+            stdin=subprocess.DEVNULL,  # the BAT ends with `pause`
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            env=dict(os.environ, PYTHONUNBUFFERED="1"),
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+            **kwargs,
+        )
+        self.reader = threading.Thread(target=self._read, name="nsot_pipeline_reader", daemon=True)
+        self.reader.start()
+
+    def _read(self):
+        for line in self.proc.stdout:
+            self.lines.put(line)
+        self.proc.stdout.close()
+        self.lines.put(None)
+
+    def poll(self) -> bool:
+        # Feeds queued lines to the parser; returns False once the process has exited and output is drained.
+        while True:
+            try:
+                line = self.lines.get_nowait()
+            except queue.Empty:
+                return True
+            if line is None:
+                self.finish()
+                return False
+            self.log.write(line)
+            self.progress.feed(line)
+
+    def finish(self):
+        self.returncode = self.proc.wait()
+        self.log.close()
+        progress = self.progress
+        if self.cancelled:
+            progress.end_stage(time.monotonic(), "CANCELLED")
+            progress.state = "CANCELLED"
+        elif progress.state == "RUNNING":
+            # Output ended without a verdict line, e.g. the BAT failed before echoing one.
+            progress.end_stage(time.monotonic(), "DONE" if self.returncode == 0 else "FAIL")
+            progress.state = "DONE" if self.returncode == 0 else "FAILED"
+            if self.returncode:
+                progress.error = f"exit code {self.returncode}"
+        print(f"[NSOT] {self.label}: {progress.summary()} (log: {self.log_path})")
+
+    def cancel(self):
+        if self.proc.poll() is not None:
+            return
+        self.cancelled = True
+        if os.name == "nt":
+            subprocess.run(["taskkill", "/T", "/F", "/PID", str(self.proc.pid)], capture_output=True)
+        else:
+            os.killpg(self.proc.pid, signal.SIGTERM)
+
+_monitor = None
+
+def current_monitor():
+    return _monitor
+
+def is_running() -> bool:
+    return _monitor is not None and _monitor.returncode is None
+
+def _tick():
+    if _monitor is None:
+        return None
+    alive = _monitor.poll()
+    tag_panel_redraw(bpy.context)
+    return POLL_INTERVAL if alive else None
+
+def start_monitor(cmd, cwd: str, label: str):
+    global _monitor
+    _monitor = PipelineMonitor(cmd, cwd, label)
+    if not bpy.app.timers.is_registered(_tick):
+        bpy.app.timers.register(_tick, first_interval=POLL_INTERVAL)
+    return _monitor
+
+def stop_monitor():
+    # Called on unregister: the pipeline keeps running, only the UI hook goes away.
+    if bpy.app.timers.is_registered(_tick):
+        bpy.app.timers.unregister(_tick)
+
+def format_elapsed(seconds: float) -> str:
+    minutes, sec = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{sec:02d}" if hours else f"{minutes}:{sec:02d}"
+
+class NSOT_OT_pipeline_cancel(bpy.types.Operator):
+    bl_idname = "nsot.pipeline_cancel"
+    bl_label = "Cancel Pipeline"
+    bl_description = "Stops the running pipeline and every tool it started; the orchestrator resumes from the interrupted stage next time"
+    bl_options = {"REGISTER"}
+
+    def execute(self, context):
+        if not is_running():
+            self.report({"WARNING"}, "No pipeline is running.")
+            return {"CANCELLED"}
+        _monitor.cancel()
+        self.report({"INFO"}, "Pipeline cancel requested.")
+        return {"FINISHED"}
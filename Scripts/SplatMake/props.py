@@ -1,5 +1,7 @@
 import bpy
+import os
 from bpy.props import (
+    PointerProperty,
     StringProperty,
     IntProperty,
     FloatProperty,
@@ -7,9 +9,25 @@ from bpy.props import (
     EnumProperty,
 )
 
+def _poll_mesh(self, obj):
+    return obj.type == "MESH"
+
 class NSOT_Props(bpy.types.PropertyGroup):
     output_dir: StringProperty(name="Output Directory", subtype="DIR_PATH", default="")
 
+    source_object: PointerProperty(
+        name="Source Object",
+        type=bpy.types.Object,
+        poll=_poll_mesh,
+        description="The mesh being converted. Used to seed the initial point cloud from its surface.",
+    )
+    seed_point_count: IntProperty(
+        name="Seed Points",
+        default=100000,
+        min=1000,
+        description="Number of surface points sampled from the source object for splatfacto initialization.",
+    )
+
     collection_name: StringProperty(name="Camera Collection", default="SphereCams")
     name_prefix: StringProperty(name="Camera Name Prefix", default="SphereCam_")
 
@@ -19,9 +37,91 @@ class NSOT_Props(bpy.types.PropertyGroup):
         default="CYCLES",
     )
 
+    render_mode: EnumProperty(
+        name="Render Mode",
+        items=[
+            ("CAMERAS", "Camera Objects", "Render every camera object in the camera collection, one render call per view"),
+            ("VIRTUAL", "Virtual Rig", "Keyframe one camera through the rig poses and render them as a single animation"),
+        ],
+        default="CAMERAS",
+    )
+
+    use_render_manifest: BoolProperty(
+        name="Incremental Render",
+        default=True,
+        description="Keep images/render_manifest.json and only render missing or stale images.",
+    )
+    remove_orphans: BoolProperty(
+        name="Delete Orphaned Images",
+        default=False,
+        description="Incremental Render: delete images in images/ that start with the camera prefix but are no longer part of the rig.",
+    )
+
+    use_render_telemetry: BoolProperty(
+        name="Render Telemetry",
+        default=True,
+        description="Append per-image wall time, phase breakdown, file size and peak memory to render_stats.jsonl in output_dir.",
+    )
+
+    shard_count: IntProperty(
+        name="Render Workers",
+        default=4,
+        min=1,
+        max=64,
+        description="Number of background Blender processes for sharded rendering.",
+    )
+    shard_threads: IntProperty(
+        name="Threads Per Worker",
+        default=0,
+        min=0,
+        description="Render threads per worker (0 = CPU cores / workers).",
+    )
+    shard_retries: IntProperty(name="Worker Retries", default=1, min=0, max=10)
+
+    crop_mode: EnumProperty(
+        name="Auto-Crop",
+        items=[
+            ("OFF", "Off", "Render the full frame for every view"),
+            ("BBOX", "Bounding Box", "Render only the Source Object's projected bounding box"),
+            ("HULL", "Convex Hull", "Render only the projected extent of the Source Object's evaluated vertices (tighter, slower to plan)"),
+        ],
+        default="OFF",
+        description="Per-view border render around the Source Object. Images stay full-frame with transparent margins, so intrinsics are unchanged. Needs Transparent Film.",
+    )
+    crop_padding_px: IntProperty(name="Crop Padding (px)", default=16, min=0, max=1024)
+
     res_x: IntProperty(name="Resolution X", default=1920, min=16)
     res_y: IntProperty(name="Resolution Y", default=1080, min=16)
     png_compression: IntProperty(name="PNG Compression", default=15, min=0, max=100)
+    image_format: EnumProperty(
+        name="Image Format",
+        items=[
+            ("PNG", "PNG", "RGBA PNG; PNG Compression maps onto zlib levels 0-9"),
+            ("WEBP", "WebP (Lossless)", "Lossless RGBA WebP (needs Pillow)"),
+            ("JPEG", "JPEG + Mask", "RGB JPEG plus an 8-bit alpha mask PNG in masks/ (needs Pillow)"),
+        ],
+        default="PNG",
+    )
+    async_encode: BoolProperty(
+        name="Background Encoding",
+        default=False,
+        description="Render a raw intermediate and encode PNGs in a thread pool while the next view renders. Off uses Blender's own PNG writer. Always on for WebP/JPEG.",
+    )
+    image_quality: IntProperty(
+        name="Quality",
+        default=95,
+        min=1,
+        max=100,
+        description="JPEG quality, or WebP lossless compression effort.",
+    )
+    pyramid_levels: IntProperty(
+        name="Downscale Levels",
+        default=0,
+        min=0,
+        max=3,
+        description="Also write images_2/, images_4/, images_8/ (alpha-aware area downsampling) while rendering.",
+    )
+    encode_threads: IntProperty(name="Encode Threads", default=0, min=0, max=64, description="0 = half the CPU cores, up to 8.")
 
     cycles_samples: IntProperty(name="Cycles Samples", default=128, min=1)
     cycles_denoise: BoolProperty(name="Cycles Denoise", default=True)
@@ -32,6 +132,12 @@ class NSOT_Props(bpy.types.PropertyGroup):
     clip_start: FloatProperty(name="Clip Start", default=0.01, min=0.0001)
     clip_end: FloatProperty(name="Clip End", default=1000.0, min=0.1)
 
+    share_camera_data: BoolProperty(
+        name="Share Camera Data",
+        default=True,
+        description="All rig cameras with the same intrinsics share one camera data-block instead of one each. Clearing the rig removes its objects in one batch either way.",
+    )
+
     target_x: FloatProperty(name="Target X", default=0.0)
     target_y: FloatProperty(name="Target Y", default=0.0)
     target_z: FloatProperty(name="Target Z", default=0.0)
@@ -43,6 +149,40 @@ class NSOT_Props(bpy.types.PropertyGroup):
     radius: FloatProperty(name="Sphere Radius", default=5.0, min=0.001)
     max_dist: FloatProperty(name="Max Camera Spacing", default=0.6, min=0.001)
 
+    rig_sampler: EnumProperty(
+        name="Sphere Sampler",
+        items=[
+            ("RINGS", "Latitude Rings", "Latitude rings plus TOP/BOTTOM poles"),
+            ("FIBONACCI", "Fibonacci", "Fibonacci lattice: near-uniform spacing without pole clustering"),
+            ("BLUE_NOISE", "Blue Noise", "Poisson-disk samples on the sphere"),
+        ],
+        default="RINGS",
+    )
+    use_camera_count: BoolProperty(
+        name="Exact Camera Count",
+        default=False,
+        description="Fibonacci/Blue Noise: place exactly Cameras Per Layer cameras instead of deriving the count from Max Camera Spacing.",
+    )
+    cameras_per_layer: IntProperty(name="Cameras Per Layer", default=300, min=1)
+    sampler_seed: IntProperty(name="Sampler Seed", default=0, min=0)
+
+    use_coverage_optimizer: BoolProperty(
+        name="Coverage Optimizer",
+        default=False,
+        description="Pick the smallest subset of a dense candidate rig that sees the Source Object's surface from enough views (BVH ray casts).",
+    )
+    coverage_target: FloatProperty(name="Target Coverage", default=0.98, min=0.0, max=1.0, subtype="FACTOR")
+    coverage_min_views: IntProperty(name="Min Views Per Patch", default=3, min=1)
+    coverage_patches: IntProperty(name="Surface Patches", default=2000, min=10)
+    coverage_candidate_factor: FloatProperty(
+        name="Candidate Density",
+        default=2.0,
+        min=1.0,
+        description="Candidates are sampled at Max Camera Spacing divided by this factor, or with Exact Camera Count at Cameras Per Layer times its square.",
+    )
+    # JSON written by Create Cameras: the optimizer's chosen candidate indices, report and the settings they came from.
+    coverage_selection: StringProperty(default="", options={"HIDDEN"})
+
     use_radius_layers: BoolProperty(
         name="Use Radius Layers",
         default=False,
@@ -68,15 +208,67 @@ class NSOT_Props(bpy.types.PropertyGroup):
     layer_scale_09: FloatProperty(name="Layer 9 Scale", default=0.0, min=0.0, precision=3)
     layer_scale_10: FloatProperty(name="Layer 10 Scale", default=0.0, min=0.0, precision=3)
 
+    use_layer_resolution: BoolProperty(
+        name="Per-Layer Resolution",
+        default=False,
+        description="Render each radius layer at its own resolution scale (per-camera and sharded renders only).",
+    )
+    layer_res_scale_01: FloatProperty(name="Layer 1 Resolution", default=1.0, min=0.05, max=1.0, subtype="FACTOR")
+    layer_res_scale_02: FloatProperty(name="Layer 2 Resolution", default=1.0, min=0.05, max=1.0, subtype="FACTOR")
+    layer_res_scale_03: FloatProperty(name="Layer 3 Resolution", default=1.0, min=0.05, max=1.0, subtype="FACTOR")
+    layer_res_scale_04: FloatProperty(name="Layer 4 Resolution", default=1.0, min=0.05, max=1.0, subtype="FACTOR")
+    layer_res_scale_05: FloatProperty(name="Layer 5 Resolution", default=1.0, min=0.05, max=1.0, subtype="FACTOR")
+    layer_res_scale_06: FloatProperty(name="Layer 6 Resolution", default=1.0, min=0.05, max=1.0, subtype="FACTOR")
+    layer_res_scale_07: FloatProperty(name="Layer 7 Resolution", default=1.0, min=0.05, max=1.0, subtype="FACTOR")
+    layer_res_scale_08: FloatProperty(name="Layer 8 Resolution", default=1.0, min=0.05, max=1.0, subtype="FACTOR")
+    layer_res_scale_09: FloatProperty(name="Layer 9 Resolution", default=1.0, min=0.05, max=1.0, subtype="FACTOR")
+    layer_res_scale_10: FloatProperty(name="Layer 10 Resolution", default=1.0, min=0.05, max=1.0, subtype="FACTOR")
+
+    fit_fill_outer: FloatProperty(
+        name="Outer Layer Fill",
+        default=0.5,
+        min=0.05,
+        max=1.0,
+        subtype="FACTOR",
+        description="Fraction of the frame's short side the object's bounding sphere spans on the outermost layer.",
+    )
+    fit_fill_inner: FloatProperty(
+        name="Inner Layer Fill",
+        default=0.9,
+        min=0.05,
+        max=1.0,
+        subtype="FACTOR",
+        description="Fraction of the frame's short side the object's bounding sphere spans on the innermost layer.",
+    )
+    fit_clearance: FloatProperty(
+        name="Min Clearance",
+        default=1.25,
+        min=1.01,
+        description="Closest camera distance as a multiple of the bounding sphere radius; the focal length widens to respect it.",
+    )
+    fit_detail_pixels: IntProperty(
+        name="Object Detail (px)",
+        default=2048,
+        min=64,
+        description="Pixels across the object that its detail supports (e.g. texture size). Layers where it would span more render at lower resolution.",
+    )
+
     is_rendering: BoolProperty(name="Is Rendering", default=False)
     progress_current: IntProperty(name="Progress Current", default=0, min=0)
     progress_total: IntProperty(name="Progress Total", default=0, min=0)
+    render_rate: FloatProperty(name="Images / Sec", default=0.0, min=0.0)
+    render_eta: FloatProperty(name="ETA (s)", default=0.0, min=0.0)
+    render_paused: BoolProperty(name="Render Paused", default=False)
+    render_cancel: BoolProperty(name="Render Cancel Requested", default=False)
+    stats_p50: FloatProperty(name="p50 (s)", default=0.0, min=0.0)
+    stats_p95: FloatProperty(name="p95 (s)", default=0.0, min=0.0)
+    stats_images_per_hour: FloatProperty(name="Images / Hour", default=0.0, min=0.0)
 
     conda_bat: StringProperty(
         name="CONDA_BAT Path",
         subtype="FILE_PATH",
         default=r"C:\Users\admin\miniconda3\condabin\conda.bat",
-        description="Path to conda.bat (Miniconda/Anaconda condabin\\conda.bat).",
+        description="Path to conda.bat (Miniconda/Anaconda condabin\\conda.bat), or the conda executable on Linux.",
     )
 
     conda_env: StringProperty(
@@ -85,6 +277,65 @@ class NSOT_Props(bpy.types.PropertyGroup):
         description="Conda environment name that contains nerfstudio + ns-* commands.",
     )
     
+    pipeline_backend: EnumProperty(
+        name="Pipeline Backend",
+        items=[
+            ("BAT", "Windows BAT", "Write run_pipeline.bat and run it in a console window (Windows only)"),
+            ("PYTHON", "Python Orchestrator", "Run orchestrator.py with stage caching and resume; works on Linux and Windows"),
+        ],
+        default="BAT" if os.name == "nt" else "PYTHON",
+    )
+
+    staging_mode: EnumProperty(
+        name="Dataset Staging",
+        items=[
+            ("AUTO", "Auto", "Hardlink, else symlink, else copy"),
+            ("HARDLINK", "Hardlink", "Hardlink images into colmap_data (same volume only)"),
+            ("SYMLINK", "Symlink", "Symlink images into colmap_data (needs developer mode on Windows)"),
+            ("COPY", "Copy", "Copy changed images into colmap_data"),
+        ],
+        default="AUTO",
+        description="How rendered images are mirrored into colmap_data; only new or changed files are touched.",
+    )
+
+    pipeline_mode: EnumProperty(
+        name="Pipeline Mode",
+        items=[
+            ("SFM", "COLMAP SfM", "Recover poses with COLMAP feature extraction, matching and mapping"),
+            ("KNOWN_POSES", "Known Poses", "Write the COLMAP model directly from the rig and skip structure-from-motion"),
+            ("TRANSFORMS", "Native transforms.json", "Write nerfstudio's transforms.json from the rig and train directly, skipping COLMAP and ns-process-data"),
+        ],
+        default="SFM",
+    )
+
+    matcher: EnumProperty(
+        name="Matcher",
+        items=[
+            ("EXHAUSTIVE", "Exhaustive", "Match every image against every other image"),
+            ("POSE_PAIRS", "Pose-Aware Pairs", "Match only views that the rig geometry says overlap (matches_importer)"),
+        ],
+        default="EXHAUSTIVE",
+    )
+    pair_neighbors: IntProperty(
+        name="Pair Neighbors",
+        default=20,
+        min=1,
+        description="Maximum number of nearest views each image is matched against.",
+    )
+    pair_max_angle: FloatProperty(
+        name="Pair Max Angle",
+        default=45.0,
+        min=1.0,
+        max=180.0,
+        description="Maximum angle (degrees) between the view directions of a matched pair.",
+    )
+    pair_max_scale_ratio: FloatProperty(
+        name="Pair Max Scale Ratio",
+        default=3.0,
+        min=1.0,
+        description="Maximum ratio between the target distances of a matched pair (views across radius layers).",
+    )
+
     max_num_iterations: IntProperty(
         name="Max Iterations",
         default=5000,
@@ -98,3 +349,113 @@ class NSOT_Props(bpy.types.PropertyGroup):
         default=True,
         description="Open nerfstudio viewer and auto-open browser; also auto-export after training completes.",
     )
+
+    use_prune: BoolProperty(
+        name="Prune Splat",
+        default=False,
+        description="Remove near-transparent, oversized, undersized and far-away gaussians from FINAL_GSPLAT.ply.",
+    )
+    prune_min_opacity: FloatProperty(
+        name="Min Opacity",
+        default=1.0 / 255.0,
+        min=0.0,
+        max=1.0,
+        precision=4,
+        description="Drop gaussians whose sigmoid(opacity) is below this; 0 disables.",
+    )
+    prune_max_scale: FloatProperty(
+        name="Max Scale (x Radius)",
+        default=0.25,
+        min=0.0,
+        precision=4,
+        description="Drop gaussians whose largest axis exceeds this fraction of the rig radius; 0 disables.",
+    )
+    prune_min_scale: FloatProperty(
+        name="Min Scale (x Radius)",
+        default=0.0,
+        min=0.0,
+        precision=6,
+        description="Drop gaussians whose largest axis is below this fraction of the rig radius (sub-pixel); 0 disables.",
+    )
+    prune_max_distance: FloatProperty(
+        name="Max Distance (x Radius)",
+        default=1.0,
+        min=0.0,
+        description="Drop gaussians farther than this multiple of the rig radius from the target; 0 disables.",
+    )
+    prune_sh_degree: IntProperty(
+        name="Keep SH Degree",
+        default=3,
+        min=0,
+        max=3,
+        description="Spherical harmonics bands kept in the pruned splat.",
+    )
+    floater_epsilon: FloatProperty(
+        name="Surface Band",
+        default=0.02,
+        min=0.0,
+        subtype="DISTANCE",
+        description="Gaussians farther than this from the source object's surface (plus their own size) are floaters.",
+    )
+    floater_size_factor: FloatProperty(
+        name="Size Factor",
+        default=3.0,
+        min=0.0,
+        description="Widens the band by this multiple of each gaussian's largest axis, so large surface splats are kept.",
+    )
+    floater_action: EnumProperty(
+        name="Floaters",
+        items=[
+            ("DROP", "Drop", "Remove floaters from FINAL_GSPLAT.ply, keeping the original as FINAL_GSPLAT_raw.ply"),
+            ("FLAG", "Flag", "Leave the splat untouched and write a boolean mask to FINAL_GSPLAT_floaters.npy"),
+        ],
+        default="DROP",
+    )
+    preview_fraction: FloatProperty(
+        name="Preview Fraction",
+        default=1.0,
+        min=0.001,
+        max=1.0,
+        subtype="FACTOR",
+        description="Random fraction of gaussians imported by Import Splat Preview; lower it for a faster viewport on large splats.",
+    )
+    preview_proxy_scale: FloatProperty(
+        name="Proxy Scale (Sigma)",
+        default=1.0,
+        min=0.01,
+        description="Ellipsoid proxy radius in standard deviations of each gaussian; editable later on the Geometry Nodes modifier.",
+    )
+
+    export_dot_splat: BoolProperty(
+        name="Write .splat",
+        default=False,
+        description="Also write FINAL_GSPLAT.splat (32 bytes per gaussian, no view-dependent colour) for WebGL viewers.",
+    )
+    export_nspz: BoolProperty(
+        name="Write .nspz",
+        default=False,
+        description="Also write FINAL_GSPLAT.nspz: quantized, zlib-compressed columns with truncated SH.",
+    )
+    nspz_position_bits: EnumProperty(
+        name="Position Bits",
+        items=[
+            ("16", "16-bit", "Fixed point per 64k-gaussian chunk; sub-millimetre on object-sized splats"),
+            ("24", "24-bit", "Fixed point per chunk with 256x finer steps"),
+        ],
+        default="16",
+    )
+    nspz_sh_degree: IntProperty(
+        name="SH Degree",
+        default=3,
+        min=0,
+        max=3,
+        description="Spherical harmonics bands kept in .nspz; 0 keeps only the base colour.",
+    )
+    nspz_sh_mode: EnumProperty(
+        name="SH Quantization",
+        items=[
+            ("u8", "8-bit", "Each coefficient as an 8-bit value scaled to its band's largest magnitude"),
+            ("palette", "Palette", "8-bit index into a 256-entry codebook fitted to the coefficient distribution"),
+        ],
+        default="u8",
+    )
@@ -1,71 +1,604 @@
 import bpy
 import os
+import time
+import queue
+from collections import namedtuple
 
-from .utils import ensure_dir, set_render_settings
+import numpy as np
+
+from .utils import (
+    MASK_DIR,
+    ensure_dir,
+    image_filename,
+    mask_filename,
+    png_zlib_level,
+    pyramid_dir,
+    pyramid_factors,
+    set_render_settings,
+    tag_panel_redraw,
+)
+from .encoders import INTERMEDIATE_EXT, ImageEncoder, format_available
+from .crop import apply_border, border_area_fraction, clear_border_keys, keyframe_borders, rig_borders, skipped_samples_per_second
+from .telemetry import STATS_NAME, RenderTelemetry, format_summary, store_summary, summarize
+from .cameras import dataset_rig, get_shared_camera_data
+from .coverage import needs_selection
+from .rig import view_resolutions
+from .manifest import (
+    ManifestSaver,
+    dataset_keys,
+    find_orphans,
+    load_manifest,
+    plan_render,
+    remove_orphans,
+    save_manifest,
+)
+
+VIRTUAL_CAMERA_NAME = "NSOT_VirtualRigCam"
+
+def matrices_to_euler_xyz(matrices):
+    R = matrices[:, :3, :3]
+    cy = np.hypot(R[:, 0, 0], R[:, 1, 0])
+    regular = cy > 1e-6
+    x = np.where(regular, np.arctan2(R[:, 2, 1], R[:, 2, 2]), np.arctan2(-R[:, 1, 2], R[:, 1, 1]))
+    y = np.arctan2(-R[:, 2, 0], cy)
+    z = np.where(regular, np.arctan2(R[:, 1, 0], R[:, 0, 0]), 0.0)
+    return np.stack((x, y, z), axis=1)
+
+def keyframe_virtual_camera(cam_obj, matrices, frame_start: int):
+    frames = np.arange(frame_start, frame_start + len(matrices), dtype=np.float64)
+    channels = {
+        "location": matrices[:, :3, 3],
+        "rotation_euler": matrices_to_euler_xyz(matrices),
+    }
+
+    anim = cam_obj.animation_data_create()
+    if anim.action is not None:
+        bpy.data.actions.remove(anim.action)
+    action = bpy.data.actions.new(name=cam_obj.name + "_RIG")
+    anim.action = action
+    cam_obj.rotation_mode = "XYZ"
+
+    for data_path, values in channels.items():
+        for axis in range(3):
+            fc = action.fcurves.new(data_path, index=axis)
+            fc.keyframe_points.add(len(frames))
+            fc.keyframe_points.foreach_set("co", np.column_stack((frames, values[:, axis])).ravel())
+            fc.keyframe_points.foreach_set("interpolation", np.zeros(len(frames), dtype=np.int32))  # CONSTANT
+            fc.update()
+
+def get_virtual_camera(scene, cam_data):
+    cam_obj = bpy.data.objects.get(VIRTUAL_CAMERA_NAME)
+    if cam_obj is None:
+        cam_obj = bpy.data.objects.new(VIRTUAL_CAMERA_NAME, cam_data)
+    cam_obj.data = cam_data
+    if scene.collection.objects.get(cam_obj.name) is None:
+        scene.collection.objects.link(cam_obj)
+    return cam_obj
+
+# orphans: prefix-matching images no longer in the rig; only deleted when remove_orphans is set.
+RenderPlan = namedtuple("RenderPlan", ("out_root", "out_images", "rig", "filenames", "keys", "todo", "manifest", "orphans", "borders", "resolutions", "encode",
+                                       "saver", "remove_orphans"))
+
+def encode_settings(p, out_root: str):
+    # None keeps Blender's own synchronous PNG writer. The pyramid is built from the pixels
+    # the encoder already holds, so it always goes through the encoder.
+    if not p.async_encode and p.image_format == "PNG" and p.pyramid_levels == 0:
+        return None
+    return {
+        "format": p.image_format,
+        "png_level": png_zlib_level(p.png_compression),
+        "quality": int(p.image_quality),
+        "tmp_dir": os.path.join(out_root, "_encode"),
+        "masks_dir": os.path.join(out_root, MASK_DIR) if p.image_format == "JPEG" else "",
+        "pyramid": pyramid_factors(p.pyramid_levels),
+    }
+
+def format_label(p, encode) -> str:
+    if encode is None:
+        return f"PNG/blender-c{int(p.png_compression)}"
+    if encode["format"] == "PNG":
+        return f"PNG/zlib-{encode['png_level']}"
+    if encode["format"] == "WEBP":
+        return "WEBP/lossless"
+    return f"JPEG/q{encode['quality']}+mask"
+
+def prepare_render(context, p):
+    # Applies render settings and works out which views need rendering. Returns (plan, error message).
+    if not p.output_dir:
+        return None, "Output Directory is empty."
+
+    out_root = bpy.path.abspath(p.output_dir)
+    out_images = os.path.join(out_root, "images")
+    ensure_dir(out_images)
+
+    encode = encode_settings(p, out_root)
+    if encode is not None:
+        if not format_available(encode["format"]):
+            return None, f"{encode['format']} output needs Pillow in Blender's Python (python -m pip install pillow)."
+        ensure_dir(encode["tmp_dir"])
+        if encode["masks_dir"]:
+            ensure_dir(encode["masks_dir"])
+        for factor in encode["pyramid"]:
+            ensure_dir(pyramid_dir(out_root, factor))
+            if encode["masks_dir"]:
+                ensure_dir(pyramid_dir(out_root, factor, MASK_DIR))
+        # Intermediates left behind by an interrupted run.
+        for f in os.listdir(encode["tmp_dir"]):
+            if f.endswith(INTERMEDIATE_EXT):
+                os.remove(os.path.join(encode["tmp_dir"], f))
+
+    set_render_settings(
+        context.scene,
+        p.engine,
+        p.res_x,
+        p.res_y,
+        p.png_compression,
+        p.film_transparent,
+        p.cycles_samples,
+        p.cycles_denoise,
+        # Blender only writes a raw intermediate when the encoder pool produces the final file.
+        "PNG" if encode is None else "TARGA_RAW",
+    )
+    apply_border(context.scene, None)
+
+    if p.render_mode != "VIRTUAL" and bpy.data.collections.get(p.collection_name) is None:
+        return None, f"Collection '{p.collection_name}' not found. Create cameras first."
+
+    if p.render_mode == "VIRTUAL" and needs_selection(p):
+        return None, "Coverage optimizer settings changed since the rig was planned. Create cameras first."
+
+    rig = dataset_rig(p)
+    if not rig.names:
+        return None, f"No cameras with prefix '{p.name_prefix}' in '{p.collection_name}'."
+
+    filenames = [image_filename(n, p.image_format) for n in rig.names]
+    todo = list(range(len(filenames)))
+    keys = None
+    manifest = None
+    saver = None
+    orphans = []
+    if p.use_render_manifest:
+        manifest = load_manifest(out_images)
+        keys = dataset_keys(p, context, rig)
+        orphans = find_orphans(out_images, manifest, filenames, p.name_prefix)
+        if p.remove_orphans:
+            remove_orphans(out_images, manifest, orphans)
+        todo = plan_render(out_images, manifest, filenames, keys, encode["pyramid"] if encode else ())
+        save_manifest(out_images, manifest)
+        saver = ManifestSaver(out_images, manifest)
+
+    borders = rig_borders(p, context, rig)
+    resolutions = view_resolutions(p, rig.layers)
+    return RenderPlan(out_root, out_images, rig, filenames, keys, todo, manifest, orphans, borders, resolutions, encode,
+                      saver, bool(p.remove_orphans)), None
+
+def render_target(plan, i) -> str:
+    # Where Blender writes view i: the final image, or the intermediate the encoder picks up.
+    if plan.encode is None:
+        return os.path.join(plan.out_images, plan.filenames[i])
+    return os.path.join(plan.encode["tmp_dir"], plan.rig.names[i] + INTERMEDIATE_EXT)
+
+def mask_target(plan, i) -> str:
+    if plan.encode is None or not plan.encode["masks_dir"]:
+        return ""
+    return os.path.join(plan.encode["masks_dir"], mask_filename(plan.rig.names[i]))
+
+def pyramid_targets(plan, i):
+    if plan.encode is None:
+        return []
+    name = plan.rig.names[i]
+    masks = bool(plan.encode["masks_dir"])
+    return [
+        (
+            factor,
+            os.path.join(pyramid_dir(plan.out_root, factor), plan.filenames[i]),
+            os.path.join(pyramid_dir(plan.out_root, factor, MASK_DIR), mask_filename(name)) if masks else "",
+        )
+        for factor in plan.encode["pyramid"]
+    ]
+
+def make_encoder(plan, threads: int = 0):
+    if plan.encode is None:
+        return None
+    e = plan.encode
+    return ImageEncoder(e["format"], e["png_level"], e["quality"], threads)
+
+def apply_view_resolution(scene, resolution):
+    scene.render.resolution_x, scene.render.resolution_y = (int(v) for v in resolution)
+
+def record_done(plan, i):
+    if plan.saver is not None:
+        factors = plan.encode["pyramid"] if plan.encode is not None else ()
+        plan.saver.record(plan.filenames[i], plan.keys[i], factors)
+
+def flush_manifest(plan):
+    if plan.saver is not None:
+        plan.saver.flush()
+
+def orphan_note(plan) -> str:
+    if plan.remove_orphans:
+        return f"{len(plan.orphans)} orphans removed"
+    return f"{len(plan.orphans)} orphans kept" if plan.orphans else "no orphans"
+
+def update_throughput(p, active_seconds: float):
+    p.render_rate = p.progress_current / active_seconds if active_seconds > 0.0 else 0.0
+    remaining = p.progress_total - p.progress_current
+    p.render_eta = remaining / p.render_rate if p.render_rate > 0.0 else 0.0
+
+class VirtualRigRender:
+    # Keyframes the virtual camera over the pending views. Each written frame is timed with rendered(plan, i)
+    # and handed to deliver(plan, i, path, record) when given (blocking render, main thread); otherwise it is
+    # queued in self.written for the modal timer, since render_write fires on the render thread there.
+    def __init__(self, context, p, plan, rendered, deliver=None):
+        scene = context.scene
+        self.scene = scene
+        self.plan = plan
+        self.p = p
+        self.rendered = rendered
+        self.deliver = deliver
+        self.written = queue.SimpleQueue()
+        self.frame_start = 1
+        self.state = "RUNNING"
+        self.t0 = time.perf_counter()
+
+        cam_data = get_shared_camera_data(p.name_prefix, p.focal_mm, p.sensor_width_mm, p.clip_start, p.clip_end)
+        cam_obj = get_virtual_camera(scene, cam_data)
+        keyframe_virtual_camera(cam_obj, plan.rig.matrices[plan.todo], self.frame_start)
+        if plan.borders is not None:
+            keyframe_borders(scene, plan.borders[plan.todo], self.frame_start)
+
+        self.saved = (scene.camera, scene.frame_start, scene.frame_end, scene.frame_current, scene.render.filepath)
+        scene.camera = cam_obj
+        scene.frame_start = self.frame_start
+        scene.frame_end = self.frame_start + len(plan.todo) - 1
+        scene.render.filepath = os.path.join(plan.out_images if plan.encode is None else plan.encode["tmp_dir"], "frame_")
+
+        handlers = bpy.app.handlers
+        handlers.render_write.append(self.on_write)
+        handlers.render_complete.append(self.on_complete)
+        handlers.render_cancel.append(self.on_cancel)
+
+    def on_write(self, scene, *_):
+        n = scene.frame_current - self.frame_start
+        i = self.plan.todo[n]
+        path = scene.render.frame_path(frame=scene.frame_current)
+        record = self.rendered(self.plan, i)
+        if self.deliver is None:
+            self.written.put((i, path, record))
+            return
+        self.deliver(self.plan, i, path, record)
+        self.p.progress_current = n + 1
+        update_throughput(self.p, time.perf_counter() - self.t0)
+
+    def on_complete(self, *_):
+        self.state = "DONE"
+
+    def on_cancel(self, *_):
+        self.state = "CANCELLED"
+
+    def restore(self):
+        handlers = bpy.app.handlers
+        for handler_list, fn in (
+            (handlers.render_write, self.on_write),
+            (handlers.render_complete, self.on_complete),
+            (handlers.render_cancel, self.on_cancel),
+        ):
+            if fn in handler_list:
+                handler_list.remove(fn)
+
+        scene = self.scene
+        clear_border_keys(scene)
+        scene.camera, scene.frame_start, scene.frame_end, frame, scene.render.filepath = self.saved
+        scene.frame_set(frame)
+
+def setup_view(scene, plan, coll, i) -> str:
+    path = render_target(plan, i)
+    scene.camera = coll.objects[plan.rig.names[i]]
+    scene.render.filepath = path
+    apply_border(scene, None if plan.borders is None else plan.borders[i])
+    apply_view_resolution(scene, plan.resolutions[i])
+    return path
+
+class StillRender:
+    # Renders one view as a Blender render job, so the UI (and Pause/Cancel) keeps running while it renders.
+    def __init__(self, scene, plan, coll, i):
+        self.i = i
+        self.path = setup_view(scene, plan, coll, i)
+        self.state = "RUNNING"
+        self.t0 = time.perf_counter()
+        handlers = bpy.app.handlers
+        handlers.render_complete.append(self.on_complete)
+        handlers.render_cancel.append(self.on_cancel)
+        if "RUNNING_MODAL" not in bpy.ops.render.render("INVOKE_DEFAULT", write_still=True):
+            self.state = "REFUSED"  # another render job still holds the render; the caller retries
+
+    def on_complete(self, *_):
+        self.state = "DONE"
+
+    def on_cancel(self, *_):
+        self.state = "CANCELLED"
+
+    def restore(self):
+        handlers = bpy.app.handlers
+        for handler_list, fn in ((handlers.render_complete, self.on_complete), (handlers.render_cancel, self.on_cancel)):
+            if fn in handler_list:
+                handler_list.remove(fn)
 
 class NSOT_OT_export_dataset(bpy.types.Operator):
     bl_idname = "nsot.export_dataset"
     bl_label = "Render + Export (Images Only)"
     bl_options = {"REGISTER"}
 
-    def execute(self, context):
+    _timer = None
+
+    def start(self, context):
+        # (plan, None) when there is work to do, else (None, the operator result to return).
         p = context.scene.nsot_props
+        plan, error = prepare_render(context, p)
+        if plan is None:
+            self.report({"ERROR"}, error)
+            return None, {"CANCELLED"}
+        if not plan.todo:
+            self.report({"INFO"}, f"All {len(plan.filenames)} images up to date in {plan.out_images} ({orphan_note(plan)})")
+            return None, {"FINISHED"}
 
-        if not p.output_dir:
-            self.report({"ERROR"}, "Output Directory is empty.")
-            return {"CANCELLED"}
+        p.progress_total = len(plan.todo)
+        p.progress_current = 0
+        p.render_rate = 0.0
+        p.render_eta = 0.0
+        p.render_paused = False
+        p.render_cancel = False
+        p.is_rendering = True
+        self.telemetry = RenderTelemetry(plan.out_root, format_label(p, plan.encode)) if p.use_render_telemetry else None
+        if self.telemetry is not None:
+            self.telemetry.start()
+        self.encoder = make_encoder(plan, int(p.encode_threads))
+        self.encode_errors = []
+        self.t_start = time.perf_counter()
+        return plan, None
 
-        out_root = bpy.path.abspath(p.output_dir)
-        out_images = os.path.join(out_root, "images")
-        ensure_dir(out_images)
+    def render_view(self, scene, plan, coll, i):
+        path = setup_view(scene, plan, coll, i)
+        bpy.ops.render.render(write_still=True)
+        self.deliver(plan, i, path, self.rendered(plan, i))
 
-        scene = context.scene
-        set_render_settings(
-            scene,
-            p.engine,
-            p.res_x,
-            p.res_y,
-            p.png_compression,
-            p.film_transparent,
-            p.cycles_samples,
-            p.cycles_denoise,
-        )
+    def rendered(self, plan, i):
+        # Closes the telemetry timing of the render that just finished. Plain Python, safe on the render thread.
+        if self.telemetry is None:
+            return None
+        return self.telemetry.image_rendered(plan.rig.names[i], plan.rig.layers[i])
 
-        coll = bpy.data.collections.get(p.collection_name)
-        if coll is None:
-            self.report({"ERROR"}, f"Collection '{p.collection_name}' not found. Create cameras first.")
-            return {"CANCELLED"}
+    def deliver(self, plan, i, src: str, record):
+        # A view finished rendering into src: move it into place, or queue it for the encoder pool.
+        # Main thread only: this writes the manifest.
+        dst = os.path.join(plan.out_images, plan.filenames[i])
+        if self.encoder is None:
+            if src != dst:
+                os.replace(src, dst)
+            self.image_finished(plan, i, record, dst)
+        else:
+            self.encoder.submit((i, record), src, dst, mask_target(plan, i), pyramid_targets(plan, i))
+            self.collect(plan)
 
-        cams = sorted(
-            [obj for obj in coll.objects if obj.type == "CAMERA" and obj.name.startswith(p.name_prefix)],
-            key=lambda o: o.name,
-        )
-        if not cams:
-            self.report({"ERROR"}, f"No cameras with prefix '{p.name_prefix}' in '{p.collection_name}'.")
-            return {"CANCELLED"}
+    def collect(self, plan, block: bool = False):
+        # Main thread only. Encoder results come back here, so the manifest is only ever written from here.
+        if self.encoder is None:
+            return
+        for (i, record), stats in self.encoder.drain(block):
+            if "error" in stats:
+                self.encode_errors.append(f"{plan.filenames[i]}: {stats['error']}")
+                continue
+            self.image_finished(plan, i, record, os.path.join(plan.out_images, plan.filenames[i]), stats)
 
-        wm = context.window_manager
-        p.progress_total = len(cams)
-        p.progress_current = 0
-        p.is_rendering = True
+    def image_finished(self, plan, i, record, path: str, stats=None):
+        record_done(plan, i)
+        if self.telemetry is not None:
+            self.telemetry.image_written(record, path, stats)
 
-        wm.progress_begin(0, len(cams))
-        try:
-            for i, cam in enumerate(cams, start=1):
-                filename = f"{cam.name}.png"
-                img_abs = os.path.join(out_images, filename)
+    def close_encoder(self, plan):
+        if self.encoder is not None:
+            self.collect(plan, block=True)
+            self.encoder.close()
+            self.encoder = None
 
-                scene.camera = cam
-                scene.render.filepath = img_abs
+    def report_done(self, p, plan, rendered: int, cancelled: bool = False):
+        skipped = len(plan.filenames) - len(plan.todo)
+        if self.encode_errors:
+            print("Encode failures:\n" + "\n".join(self.encode_errors))
+            more = f" (+{len(self.encode_errors) - 1} more, listed in the console)" if len(self.encode_errors) > 1 else ""
+            self.report(
+                {"WARNING"},
+                f"{len(self.encode_errors)} images failed to encode and will re-render next run: {self.encode_errors[0]}{more}",
+            )
+        if self.telemetry is not None:
+            self.telemetry.stop()
+            summary = summarize(self.telemetry.records)
+            if summary is not None:
+                store_summary(p, summary)
+                print(format_summary(summary))
+                self.report(
+                    {"INFO"},
+                    f"Render stats: p50 {summary['p50_s']:.2f}s, p95 {summary['p95_s']:.2f}s, "
+                    f"{summary['images_per_hour']:.0f} img/h (breakdown in the console and {STATS_NAME})",
+                )
+        if plan.borders is not None and rendered:
+            views = plan.todo[:rendered]
+            line = f"Auto-crop: rendered {border_area_fraction(plan.borders[views]):.1%} of full-frame pixels per view"
+            if p.engine == "CYCLES":
+                saved = skipped_samples_per_second(plan.borders[views], plan.resolutions[views], p.cycles_samples,
+                                                   time.perf_counter() - self.t_start)
+                line += f", {saved / 1e6:.1f} M samples/s not traced"
+            self.report({"INFO"}, line)
+        if cancelled:
+            self.report({"WARNING"}, f"Render cancelled: {rendered}/{len(plan.todo)} new images kept in {plan.out_images}")
+            return
+        self.report(
+            {"INFO"},
+            f"Exported {rendered} images to {plan.out_images} ({skipped} up to date, {orphan_note(plan)})",
+        )
 
-                p.progress_current = i
-                wm.progress_update(i)
-                bpy.ops.wm.redraw_timer(type="DRAW_WIN_SWAP", iterations=1)
+    # Blocking path for scripts and background mode.
+    def execute(self, context):
+        p = context.scene.nsot_props
+        plan, result = self.start(context)
+        if plan is None:
+            return result
 
-                bpy.ops.render.render(write_still=True)
+        try:
+            if p.render_mode == "VIRTUAL":
+                job = VirtualRigRender(context, p, plan, self.rendered, self.deliver)
+                try:
+                    bpy.ops.render.render(animation=True)
+                finally:
+                    job.restore()
+            else:
+                scene = context.scene
+                coll = bpy.data.collections.get(p.collection_name)
+                t0 = time.perf_counter()
+                for n, i in enumerate(plan.todo, start=1):
+                    self.render_view(scene, plan, coll, i)
+                    p.progress_current = n
+                    update_throughput(p, time.perf_counter() - t0)
         finally:
-            wm.progress_end()
+            self.close_encoder(plan)
+            flush_manifest(plan)
             p.is_rendering = False
+            apply_border(context.scene, None)
+            apply_view_resolution(context.scene, (p.res_x, p.res_y))
+            self.report_done(p, plan, p.progress_current)
 
-        self.report({"INFO"}, f"Exported {len(cams)} images to {out_images}")
+        return {"FINISHED"}
+
+    # Interactive path: each view is a non-blocking render job polled from a timer, so the UI stays responsive.
+    def invoke(self, context, event):
+        p = context.scene.nsot_props
+        plan, result = self.start(context)
+        if plan is None:
+            return result
+
+        self.plan = plan
+        self.job = None
+        self.view = None
+        self.pos = 0
+        self.active = 0.0
+        self.saved_camera = context.scene.camera
+        if p.render_mode == "VIRTUAL":
+            # One animation render job keeps scene sync between frames; Blender runs it without blocking.
+            # Written frames are queued by the render thread and delivered from the timer below.
+            self.job = VirtualRigRender(context, p, plan, self.rendered)
+            if "RUNNING_MODAL" not in bpy.ops.render.render("INVOKE_DEFAULT", animation=True):
+                # No render_complete/render_cancel will ever fire for a refused job.
+                self.report({"ERROR"}, "Blender refused the render job; wait for the running render to finish.")
+                return self.finish(context, cancelled=True)
+
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.05, window=context.window)
+        wm.modal_handler_add(self)
+        return {"RUNNING_MODAL"}
+
+    def modal(self, context, event):
+        p = context.scene.nsot_props
+        if event.type == "ESC" and event.value == "PRESS" and self.job is None:
+            p.render_cancel = True
+        if event.type != "TIMER":
+            return {"PASS_THROUGH"}
+
+        tag_panel_redraw(context)
+        if self.job is not None:
+            # Read the state before draining, so frames written just before completion are still delivered.
+            state = self.job.state
+            self.drain_written(p)
+            self.collect(self.plan)
+            if state == "RUNNING":
+                return {"PASS_THROUGH"}
+            return self.finish(context, cancelled=state == "CANCELLED")
+
+        self.collect(self.plan)
+        if self.view is not None:
+            if self.view.state == "RUNNING":
+                return {"PASS_THROUGH"}
+            view, self.view = self.view, None
+            view.restore()
+            if view.state == "REFUSED":
+                return {"PASS_THROUGH"}  # start it again on the next tick
+            if view.state != "DONE":
+                return self.finish(context, cancelled=True)
+            self.deliver(self.plan, view.i, view.path, self.rendered(self.plan, view.i))
+            self.pos += 1
+            self.active += time.perf_counter() - view.t0
+            p.progress_current = self.pos
+            update_throughput(p, self.active)
+
+        # Pause and Cancel apply between views; Esc in the render window aborts the view in progress.
+        if p.render_cancel:
+            return self.finish(context, cancelled=True)
+        if p.render_paused:
+            return {"PASS_THROUGH"}
+        if self.pos >= len(self.plan.todo):
+            return self.finish(context)
+        if bpy.app.is_job_running("RENDER"):
+            return {"PASS_THROUGH"}  # the previous view's render job is still shutting down
+
+        self.view = StillRender(context.scene, self.plan, bpy.data.collections[p.collection_name], self.plan.todo[self.pos])
+        return {"RUNNING_MODAL"}
+
+    def drain_written(self, p):
+        # Delivers the frames the virtual rig's render thread has queued and updates progress from here.
+        while True:
+            try:
+                i, path, record = self.job.written.get_nowait()
+            except queue.Empty:
+                return
+            self.deliver(self.plan, i, path, record)
+            p.progress_current += 1
+            update_throughput(p, time.perf_counter() - self.job.t0)
+
+    def finish(self, context, cancelled: bool = False):
+        p = context.scene.nsot_props
+        if self._timer is not None:
+            context.window_manager.event_timer_remove(self._timer)
+            self._timer = None
+        self.close_encoder(self.plan)
+        flush_manifest(self.plan)
+        if self.view is not None:
+            self.view.restore()
+        if self.job is not None:
+            self.job.restore()
+        else:
+            context.scene.camera = self.saved_camera
+            apply_border(context.scene, None)
+            apply_view_resolution(context.scene, (p.res_x, p.res_y))
+
+        p.is_rendering = False
+        p.render_paused = False
+        p.render_cancel = False
+        tag_panel_redraw(context)
+
+        self.report_done(p, self.plan, p.progress_current, cancelled)
+        return {"CANCELLED"} if cancelled else {"FINISHED"}
+
+class NSOT_OT_render_control(bpy.types.Operator):
+    bl_idname = "nsot.render_control"
+    bl_label = "Render Control"
+    bl_description = "Pause, resume or cancel the running render. Images already written stay in the dataset"
+    bl_options = {"REGISTER"}
+
+    action: bpy.props.EnumProperty(
+        items=[
+            ("PAUSE", "Pause", ""),
+            ("RESUME", "Resume", ""),
+            ("CANCEL", "Cancel", ""),
+        ],
+    )
+
+    def execute(self, context):
+        p = context.scene.nsot_props
+        if p.render_mode == "VIRTUAL":
+            # The virtual rig is one animation job that Python cannot stop or hold between frames.
+            self.report({"WARNING"}, "Virtual rig renders are cancelled with Esc in the render window.")
+            return {"CANCELLED"}
+        if self.action == "CANCEL":
+            p.render_cancel = True
+        else:
+            p.render_paused = self.action == "PAUSE"
         return {"FINISHED"}
@@ -0,0 +1,194 @@
+import bpy
+import os
+import json
+import subprocess
+
+from .utils import ensure_dir, tag_panel_redraw
+from .cameras import get_shared_camera_data
+from .render_images import flush_manifest, mask_target, prepare_render, pyramid_targets, record_done, render_target
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "render_worker.py")
+
+class Shard:
+    def __init__(self, index: int, views):
+        self.index = index
+        self.views = views  # plan indices
+        self.done = set()
+        self.attempts = 0
+        self.proc = None
+        self.log = None
+        self.progress_path = ""
+        self.progress_offset = 0
+        self.failed = False
+
+def split_shards(todo, count: int):
+    # Interleave so every shard gets a mix of layers (inner layers render slower than outer ones).
+    count = max(1, min(count, len(todo)))
+    return [Shard(k, todo[k::count]) for k in range(count)]
+
+class NSOT_OT_render_sharded(bpy.types.Operator):
+    bl_idname = "nsot.render_sharded"
+    bl_label = "Render Sharded (Headless Workers)"
+    bl_description = "Splits the views into shards rendered by parallel background Blender processes, merging into the same images/ folder"
+    bl_options = {"REGISTER"}
+
+    _timer = None
+
+    def execute(self, context):
+        p = context.scene.nsot_props
+        plan, error = prepare_render(context, p)
+        if plan is None:
+            self.report({"ERROR"}, error)
+            return {"CANCELLED"}
+        if not plan.todo:
+            self.report({"INFO"}, f"All {len(plan.filenames)} images up to date in {plan.out_images}")
+            return {"FINISHED"}
+
+        self.plan = plan
+        self.shard_dir = os.path.join(plan.out_root, "_shards")
+        ensure_dir(self.shard_dir)
+
+        # Workers need the camera data for virtual rigs and the current render settings, so snapshot the file.
+        self.virtual = p.render_mode == "VIRTUAL"
+        self.cam_data = get_shared_camera_data(p.name_prefix, p.focal_mm, p.sensor_width_mm, p.clip_start, p.clip_end)
+        fake_user = self.cam_data.use_fake_user
+        self.cam_data.use_fake_user = True
+        self.blend_path = os.path.join(self.shard_dir, "scene.blend")
+        bpy.ops.wm.save_as_mainfile(filepath=self.blend_path, copy=True)
+        self.cam_data.use_fake_user = fake_user
+
+        shard_count = int(p.shard_count)
+        threads = int(p.shard_threads) or max(1, (os.cpu_count() or 1) // max(1, shard_count))
+        self.threads = threads
+        self.shards = split_shards(plan.todo, shard_count)
+        for shard in self.shards:
+            self.launch(shard)
+
+        p.progress_total = len(plan.todo)
+        p.progress_current = 0
+        p.is_rendering = True
+
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.5, window=context.window)
+        wm.modal_handler_add(self)
+        return {"RUNNING_MODAL"}
+
+    def launch(self, shard):
+        plan = self.plan
+        views = [
+            {
+                "file": plan.filenames[i],
+                "camera": "" if self.virtual else plan.rig.names[i],
+                "matrix": plan.rig.matrices[i].ravel().tolist(),
+                "border": None if plan.borders is None else plan.borders[i].tolist(),
+                "resolution": plan.resolutions[i].tolist(),
+                "render_path": render_target(plan, i),
+                "mask_path": mask_target(plan, i),
+                "pyramid": pyramid_targets(plan, i),
+            }
+            for i in shard.views
+            if i not in shard.done
+        ]
+
+        shard.attempts += 1
+        stem = os.path.join(self.shard_dir, f"shard_{shard.index:02d}")
+        shard.progress_path = stem + ".progress"
+        shard.progress_offset = 0
+        open(shard.progress_path, "w").close()
+
+        job_path = stem + ".json"
+        with open(job_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "out_images": plan.out_images,
+                    "progress_path": shard.progress_path,
+                    "threads": self.threads,
+                    "camera_data": self.cam_data.name,
+                    "encode": self.plan.encode,
+                    "views": views,
+                },
+                f,
+            )
+
+        if shard.log is not None:
+            shard.log.close()
+        shard.log = open(stem + ".log", "a", encoding="utf-8")
+        shard.proc = subprocess.Popen(
+            [bpy.app.binary_path, "-b", self.blend_path, "--python-exit-code", "1", "--python", WORKER_SCRIPT, "--", job_path],
+            stdout=shard.log,
+            stderr=subprocess.STDOUT,
+        )
+
+    def poll_progress(self, shard):
+        with open(shard.progress_path, "rb") as f:
+            f.seek(shard.progress_offset)
+            data = f.read()
+        # Only consume complete lines; a worker may be mid-write.
+        end = data.rfind(b"\n") + 1
+        shard.progress_offset += end
+        by_file = {self.plan.filenames[i]: i for i in shard.views}
+        for line in data[:end].decode("utf-8").splitlines():
+            i = by_file.get(line.strip())
+            if i is not None and i not in shard.done:
+                shard.done.add(i)
+                record_done(self.plan, i)
+
+    def modal(self, context, event):
+        p = context.scene.nsot_props
+        if event.type == "ESC":
+            return self.finish(context, cancelled=True)
+        if event.type != "TIMER":
+            return {"PASS_THROUGH"}
+
+        running = False
+        for shard in self.shards:
+            if shard.proc is None:
+                continue
+            self.poll_progress(shard)
+            code = shard.proc.poll()
+            if code is None:
+                running = True
+                continue
+
+            self.poll_progress(shard)
+            shard.proc = None
+            if len(shard.done) == len(shard.views):
+                continue
+            # Only the failed shard is retried, and only for the views it has not finished.
+            if shard.attempts <= int(p.shard_retries):
+                self.launch(shard)
+                running = True
+            else:
+                shard.failed = True
+
+        p.progress_current = sum(len(s.done) for s in self.shards)
+        tag_panel_redraw(context)
+
+        if running:
+            return {"PASS_THROUGH"}
+        return self.finish(context)
+
+    def finish(self, context, cancelled: bool = False):
+        p = context.scene.nsot_props
+        for shard in self.shards:
+            if shard.proc is not None and shard.proc.poll() is None:
+                shard.proc.terminate()
+                shard.proc.wait()
+            if shard.log is not None:
+                shard.log.close()
+
+        context.window_manager.event_timer_remove(self._timer)
+        flush_manifest(self.plan)
+        p.is_rendering = False
+
+        done = sum(len(s.done) for s in self.shards)
+        failed = [s.index for s in self.shards if s.failed]
+        if cancelled:
+            self.report({"WARNING"}, f"Sharded render cancelled after {done}/{len(self.plan.todo)} images")
+            return {"CANCELLED"}
+        if failed:
+            self.report({"ERROR"}, f"Shards {failed} failed after retries; {done}/{len(self.plan.todo)} images rendered. See {self.shard_dir}")
+            return {"CANCELLED"}
+
+        self.report({"INFO"}, f"Rendered {done} images with {len(self.shards)} workers to {self.plan.out_images}")
+        return {"FINISHED"}
@@ -0,0 +1,78 @@
+# Headless shard renderer, run as: blender -b <file> --python-exit-code 1 --python render_worker.py -- <job.json>
+# Standalone on purpose: the add-on package is not importable inside a plain background Blender.
+import bpy
+import os
+import sys
+import json
+
+from mathutils import Matrix
+
+# encoders.py has no package-relative imports, so it loads straight from the add-on folder.
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from encoders import ImageEncoder
+
+def load_job():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    with open(argv[0], "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def worker_camera(scene, cam_data_name: str):
+    cam_obj = bpy.data.objects.new("NSOT_ShardCam", bpy.data.cameras[cam_data_name])
+    scene.collection.objects.link(cam_obj)
+    return cam_obj
+
+def main():
+    job = load_job()
+    scene = bpy.context.scene
+    if job.get("threads", 0) > 0:
+        scene.render.threads_mode = "FIXED"
+        scene.render.threads = int(job["threads"])
+
+    encode = job.get("encode")
+    encoder = None
+    if encode:
+        # Share the shard's CPU budget between render and encode threads.
+        encoder = ImageEncoder(encode["format"], encode["png_level"], encode["quality"], max(1, int(job.get("threads", 0)) // 2))
+
+    def report(progress, block=False):
+        for name, stats in encoder.drain(block):
+            if "error" in stats:
+                print(f"Encode failed for {name}: {stats['error']}", flush=True)
+                continue
+            progress.write(name + "\n")
+        progress.flush()
+
+    shard_cam = None
+    with open(job["progress_path"], "a", encoding="utf-8") as progress:
+        for view in job["views"]:
+            cam = bpy.data.objects.get(view["camera"]) if view.get("camera") else None
+            if cam is None:
+                if shard_cam is None:
+                    shard_cam = worker_camera(scene, job["camera_data"])
+                shard_cam.matrix_world = Matrix([view["matrix"][r * 4:r * 4 + 4] for r in range(4)])
+                cam = shard_cam
+
+            scene.camera = cam
+            final = os.path.join(job["out_images"], view["file"])
+            scene.render.filepath = view.get("render_path") or final
+            if view.get("resolution"):
+                scene.render.resolution_x, scene.render.resolution_y = view["resolution"]
+            border = view.get("border")
+            scene.render.use_border = border is not None
+            if border is not None:
+                scene.render.use_crop_to_border = False
+                scene.render.border_min_x, scene.render.border_max_x, scene.render.border_min_y, scene.render.border_max_y = border
+            bpy.ops.render.render(write_still=True)
+
+            if encoder is None:
+                progress.write(view["file"] + "\n")
+                progress.flush()
+            else:
+                encoder.submit(view["file"], scene.render.filepath, final, view.get("mask_path", ""), view.get("pyramid", ()))
+                report(progress)
+
+        if encoder is not None:
+            report(progress, block=True)
+            encoder.close()
+
+main()
@@ -0,0 +1,280 @@
+import math
+import re
+from collections import namedtuple
+
+import numpy as np
+
+# names: list[str], layers: (N,) int, positions: (N,3) world space, matrices: (N,4,4) camera-to-world
+Rig = namedtuple("Rig", ("names", "layers", "positions", "matrices"))
+
+TAG_NONE = 0
+TAG_BOTTOM = 1
+TAG_TOP = 2
+
+# Rig camera names look like "<prefix>L00_012[_TOP|_BOTTOM]".
+_LAYER_RE = re.compile(r"L(\d+)_\d+(?:_TOP|_BOTTOM)?$")
+
+def get_layer_scales(p):
+    if not p.use_radius_layers:
+        return [1.0]
+
+    scales = []
+    for i in range(1, int(p.layer_count) + 1):
+        v = float(getattr(p, f"layer_scale_{i:02d}", 0.0))
+        if v > 0.0:
+            scales.append(v)
+
+    return scales if scales else [1.0]
+
+def spherical_points_by_spacing(max_dist: float, sphere_radius: float):
+    R = max(1e-6, float(sphere_radius))
+    s = max(1e-6, float(max_dist))
+
+    dphi = s / R
+    dphi = max(1e-4, min(dphi, math.pi / 4.0))
+
+    # Accumulate phi exactly like the scalar `phi += dphi` loop so ring placement is bit-identical.
+    ring_count = int(math.ceil(math.pi / dphi)) + 2
+    steps = np.full(ring_count, dphi)
+    steps[0] = -math.pi / 2.0 + dphi
+    phi = np.add.accumulate(steps)
+    phi = phi[phi < (math.pi / 2.0 - dphi * 0.5)]
+
+    z = R * np.sin(phi)
+    r_xy = np.maximum(0.0, R * np.cos(phi))
+    keep = r_xy >= 1e-9
+    z = z[keep]
+    r_xy = r_xy[keep]
+
+    counts = np.maximum(1, np.ceil((2.0 * math.pi * r_xy) / s).astype(np.int64))
+    ring = np.repeat(np.arange(len(counts)), counts)
+    starts = np.cumsum(counts) - counts
+    i = np.arange(len(ring)) - starts[ring]
+    theta = (2.0 * math.pi * i) / counts[ring]
+
+    pts = np.empty((len(ring) + 2, 3))
+    pts[0] = (0.0, 0.0, -R)
+    pts[1] = (0.0, 0.0, R)
+    pts[2:, 0] = np.cos(theta) * r_xy[ring]
+    pts[2:, 1] = np.sin(theta) * r_xy[ring]
+    pts[2:, 2] = z[ring]
+
+    tags = np.full(len(pts), TAG_NONE, dtype=np.int8)
+    tags[0] = TAG_BOTTOM
+    tags[1] = TAG_TOP
+    return pts, tags
+
+def camera_count_for_spacing(max_dist: float, sphere_radius: float) -> int:
+    # Hexagonal packing whose covering radius matches a square grid of spacing max_dist (max_dist / sqrt(2)).
+    R = max(1e-6, float(sphere_radius))
+    s = max(1e-6, float(max_dist))
+    cell_area = (3.0 * math.sqrt(3.0) / 4.0) * s * s
+    return max(1, int(math.ceil(4.0 * math.pi * R * R / cell_area)))
+
+def fibonacci_sphere_points(count: int, sphere_radius: float):
+    R = max(1e-6, float(sphere_radius))
+    i = np.arange(count, dtype=np.float64)
+    z = 1.0 - (2.0 * i + 1.0) / count
+    r_xy = np.sqrt(np.maximum(0.0, 1.0 - z * z))
+    theta = i * (math.pi * (3.0 - math.sqrt(5.0)))
+    pts = np.stack((np.cos(theta) * r_xy, np.sin(theta) * r_xy, z), axis=1) * R
+    return pts, np.full(count, TAG_NONE, dtype=np.int8)
+
+def blue_noise_sphere_points(count: int, sphere_radius: float, seed: int = 0, batch: int = 256):
+    # Poisson-disk dart throwing on the unit sphere. The disk radius starts near the
+    # maximal random packing for `count` points and shrinks whenever throws stall,
+    # so exactly `count` points come back.
+    R = max(1e-6, float(sphere_radius))
+    rng = np.random.default_rng(seed)
+    min_angle = 0.8 * math.sqrt(8.0 * math.pi / (math.sqrt(3.0) * count))
+    cos_min = math.cos(min_angle)
+
+    pts = np.empty((count, 3))
+    n = 0
+    stalls = 0
+    while n < count:
+        cand = rng.normal(size=(batch, 3))
+        cand /= np.linalg.norm(cand, axis=1, keepdims=True)
+        if n:
+            cand = cand[(cand @ pts[:n].T).max(axis=1) < cos_min]
+
+        start = n
+        for c in cand:
+            if n > start and (pts[start:n] @ c).max() >= cos_min:
+                continue
+            pts[n] = c
+            n += 1
+            if n == count:
+                break
+
+        if n == start:
+            stalls += 1
+            if stalls >= 4:
+                min_angle *= 0.95
+                cos_min = math.cos(min_angle)
+                stalls = 0
+        else:
+            stalls = 0
+
+    return pts * R, np.full(count, TAG_NONE, dtype=np.int8)
+
+def sphere_points(sampler: str, max_dist: float, sphere_radius: float, count: int = 0, seed: int = 0):
+    if sampler == "RINGS":
+        return spherical_points_by_spacing(max_dist, sphere_radius)
+    if count <= 0:
+        count = camera_count_for_spacing(max_dist, sphere_radius)
+    if sampler == "FIBONACCI":
+        return fibonacci_sphere_points(count, sphere_radius)
+    if sampler == "BLUE_NOISE":
+        return blue_noise_sphere_points(count, sphere_radius, seed)
+    raise ValueError(f"Unknown sphere sampler: {sampler}")
+
+def nearest_neighbor_angles(directions, chunk: int = 1024):
+    d = _normalized(np.asarray(directions, dtype=np.float64).reshape(-1, 3))
+    out = np.full(len(d), math.pi)
+    if len(d) < 2:
+        return out
+    for s in range(0, len(d), chunk):
+        dots = d[s:s + chunk] @ d.T
+        dots[np.arange(len(dots)), np.arange(s, s + len(dots))] = -1.0
+        out[s:s + chunk] = np.arccos(np.clip(dots.max(axis=1), -1.0, 1.0))
+    return out
+
+def coverage_uniformity(rig, target):
+    # Per-layer nearest-neighbour angle between camera directions, in degrees.
+    dirs = rig.positions - np.asarray(target, dtype=np.float64)
+    nn = np.concatenate([nearest_neighbor_angles(dirs[rig.layers == layer]) for layer in np.unique(rig.layers)]) if len(dirs) else np.zeros(0)
+    if len(nn) == 0:
+        return 0.0, 0.0
+    return math.degrees(float(nn.min())), math.degrees(float(nn.mean()))
+
+def _normalized(v):
+    n = np.linalg.norm(v, axis=-1, keepdims=True)
+    return np.divide(v, n, out=np.zeros_like(v), where=n > 0.0)
+
+def _orthogonal(v):
+    # Vectorized mathutils.Vector.orthogonal(): rotate around the dominant axis.
+    ax = np.abs(v)
+    axis = np.where(ax[:, 0] > ax[:, 1], np.where(ax[:, 0] > ax[:, 2], 0, 2), np.where(ax[:, 1] > ax[:, 2], 1, 2))
+    x, y, z = v[:, 0], v[:, 1], v[:, 2]
+    out = np.empty_like(v)
+    out[:, 0] = np.select([axis == 0, axis == 1], [-y - z, y], z)
+    out[:, 1] = np.select([axis == 0, axis == 1], [x, -x - z], z)
+    out[:, 2] = np.select([axis == 0, axis == 1], [x, y], -x - y)
+    return out
+
+def look_at_matrices(cam_pos, target, up):
+    cam_pos = np.asarray(cam_pos, dtype=np.float64).reshape(-1, 3)
+    target = np.asarray(target, dtype=np.float64)
+    up = np.asarray(up, dtype=np.float64)
+
+    forward = _normalized(target - cam_pos)
+    right = np.cross(forward, up)
+    degenerate = np.linalg.norm(right, axis=1) < 1e-8
+    if degenerate.any():
+        right[degenerate] = _orthogonal(forward[degenerate])
+    right = _normalized(right)
+    true_up = _normalized(np.cross(right, forward))
+
+    mats = np.zeros((len(cam_pos), 4, 4))
+    mats[:, :3, 0] = right
+    mats[:, :3, 1] = true_up
+    mats[:, :3, 2] = -forward
+    mats[:, :3, 3] = cam_pos
+    mats[:, 3, 3] = 1.0
+    return mats
+
+def build_rig(prefix: str, radii, max_dist: float, target, up, sampler: str = "RINGS", count: int = 0, seed: int = 0) -> Rig:
+    target = np.asarray(target, dtype=np.float64)
+    up = np.asarray(up, dtype=np.float64)
+    if np.linalg.norm(up) < 1e-8:
+        up = np.array((0.0, 0.0, 1.0))
+    up = up / np.linalg.norm(up)
+
+    names = []
+    layers = []
+    positions = []
+    for layer_idx, layer_radius in enumerate(radii):
+        pts, tags = sphere_points(sampler, max_dist, layer_radius, count, seed + layer_idx)
+        for idx, tag in enumerate(tags):
+            base = f"{prefix}L{layer_idx:02d}_{idx:03d}"
+            if tag == TAG_BOTTOM:
+                base += "_BOTTOM"
+            elif tag == TAG_TOP:
+                base += "_TOP"
+            names.append(base)
+        layers.append(np.full(len(pts), layer_idx, dtype=np.int32))
+        positions.append(target + pts)
+
+    if positions:
+        positions = np.concatenate(positions)
+        layers = np.concatenate(layers)
+    else:
+        positions = np.zeros((0, 3))
+        layers = np.zeros(0, dtype=np.int32)
+
+    return Rig(names, layers, positions, look_at_matrices(positions, target, up))
+
+def rig_from_props(p) -> Rig:
+    radii = [p.radius * scale for scale in get_layer_scales(p)]
+    return build_rig(
+        p.name_prefix,
+        radii,
+        p.max_dist,
+        (p.target_x, p.target_y, p.target_z),
+        (p.up_x, p.up_y, p.up_z),
+        sampler=p.rig_sampler,
+        count=int(p.cameras_per_layer) if p.use_camera_count else 0,
+        seed=int(p.sampler_seed),
+    )
+
+def rotmat_to_qvec(R):
+    # (N, 3, 3) rotations -> (N, 4) wxyz quaternions with w >= 0 (COLMAP's convention).
+    R = np.asarray(R, dtype=np.float64).reshape(-1, 3, 3)
+    m00, m01, m02 = R[:, 0, 0], R[:, 0, 1], R[:, 0, 2]
+    m10, m11, m12 = R[:, 1, 0], R[:, 1, 1], R[:, 1, 2]
+    m20, m21, m22 = R[:, 2, 0], R[:, 2, 1], R[:, 2, 2]
+    trace = m00 + m11 + m22
+
+    # Pick the numerically largest of w, x, y, z per rotation and derive the rest from it.
+    cands = np.stack(
+        (
+            np.stack((1.0 + trace, m21 - m12, m02 - m20, m10 - m01), axis=1),
+            np.stack((m21 - m12, 1.0 + m00 - m11 - m22, m01 + m10, m02 + m20), axis=1),
+            np.stack((m02 - m20, m01 + m10, 1.0 - m00 + m11 - m22, m12 + m21), axis=1),
+            np.stack((m10 - m01, m02 + m20, m12 + m21, 1.0 - m00 - m11 + m22), axis=1),
+        ),
+        axis=1,
+    )
+    diag = np.stack((trace, m00, m11, m22), axis=1)
+    best = np.argmax(diag, axis=1)
+    q = cands[np.arange(len(R)), best]
+    q /= np.linalg.norm(q, axis=1, keepdims=True)
+    q[q[:, 0] < 0.0] *= -1.0
+    return q
+
+def pixel_intrinsics(focal_mm: float, sensor_width_mm: float, res_x: int, res_y: int):
+    # Blender's default AUTO sensor fit applies the sensor width to the larger image dimension.
+    f_px = float(focal_mm) / float(sensor_width_mm) * max(res_x, res_y)
+    return f_px, f_px, res_x / 2.0, res_y / 2.0
+
+def view_resolutions(p, layers):
+    # (N, 2) render resolution per view. Layer scales only apply per camera; the virtual rig
+    # renders one animation and cannot change resolution between frames.
+    layers = np.asarray(layers, dtype=np.int64)
+    res = np.tile(np.array((int(p.res_x), int(p.res_y)), dtype=np.int64), (len(layers), 1))
+    if not p.use_layer_resolution or p.render_mode == "VIRTUAL":
+        return res
+    scales = np.array([float(getattr(p, f"layer_res_scale_{i:02d}", 1.0)) for i in range(1, 11)])
+    scale = scales[np.clip(layers, 0, len(scales) - 1)]
+    return np.maximum(16, np.round(res * scale[:, None])).astype(np.int64)
+
+def rig_from_objects(objects) -> Rig:
+    names = [obj.name for obj in objects]
+    matrices = np.array([[list(row) for row in obj.matrix_world] for obj in objects], dtype=np.float64).reshape(-1, 4, 4)
+    layers = np.array([_layer_from_name(name) for name in names], dtype=np.int32)
+    return Rig(names, layers, matrices[:, :3, 3].copy(), matrices)
+
+def _layer_from_name(name: str) -> int:
+    m = _LAYER_RE.search(name)
+    return int(m.group(1)) if m else 0
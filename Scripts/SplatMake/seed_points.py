@@ -0,0 +1,196 @@
+import bpy
+import os
+
+import numpy as np
+
+from .utils import ensure_dir, foreach_array
+
+PLY_POINT_DTYPE = np.dtype(
+    [
+        ("x", "<f4"),
+        ("y", "<f4"),
+        ("z", "<f4"),
+        ("red", "u1"),
+        ("green", "u1"),
+        ("blue", "u1"),
+    ]
+)
+
+def linear_to_srgb(c):
+    c = np.clip(c, 0.0, 1.0)
+    return np.where(c <= 0.0031308, c * 12.92, 1.055 * np.power(c, 1.0 / 2.4) - 0.055)
+
+def _material_image(mat):
+    if mat is None or not mat.use_nodes or mat.node_tree is None:
+        return None
+    for node in mat.node_tree.nodes:
+        if node.type != "BSDF_PRINCIPLED":
+            continue
+        base = node.inputs.get("Base Color")
+        if base is None or not base.is_linked:
+            continue
+        src = base.links[0].from_node
+        if src.type == "TEX_IMAGE" and src.image is not None and src.image.size[0] > 0:
+            return src.image
+    return None
+
+def _material_flat_color(mat):
+    if mat is None:
+        return np.array((0.5, 0.5, 0.5))
+    if mat.use_nodes and mat.node_tree is not None:
+        for node in mat.node_tree.nodes:
+            if node.type == "BSDF_PRINCIPLED":
+                return linear_to_srgb(np.array(node.inputs["Base Color"].default_value[:3]))
+    return linear_to_srgb(np.array(mat.diffuse_color[:3]))
+
+def _sample_image(image, uv):
+    w, h = image.size
+    pixels = np.empty(w * h * image.channels, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    pixels = pixels.reshape(h, w, image.channels)
+
+    # Nearest texel with repeat wrapping; byte images come back in their stored (sRGB) space.
+    px = np.floor(np.mod(uv[:, 0], 1.0) * w).astype(np.int64) % w
+    py = np.floor(np.mod(uv[:, 1], 1.0) * h).astype(np.int64) % h
+    rgb = pixels[py, px, :3]
+    if image.is_float:
+        rgb = linear_to_srgb(rgb)
+    return rgb
+
+def _sample_triangles(co, tri_verts, count: int, seed: int):
+    a = co[tri_verts[:, 0]]
+    e1 = co[tri_verts[:, 1]] - a
+    e2 = co[tri_verts[:, 2]] - a
+    cross = np.cross(e1, e2)
+    areas = 0.5 * np.linalg.norm(cross, axis=1)
+    cdf = np.cumsum(areas, dtype=np.float64)
+    if len(cdf) == 0 or cdf[-1] <= 0.0:
+        return None
+
+    rng = np.random.default_rng(seed)
+    tri = np.minimum(np.searchsorted(cdf, rng.random(count) * cdf[-1], side="right"), len(areas) - 1)
+    r1 = np.sqrt(rng.random(count))
+    r2 = rng.random(count)
+    bary = np.stack((1.0 - r1, r1 * (1.0 - r2), r1 * r2), axis=1)
+    xyz = a[tri] + e1[tri] * bary[:, 1:2] + e2[tri] * bary[:, 2:3]
+    normals = cross[tri] / np.maximum(2.0 * areas[tri], 1e-20)[:, None]
+    return tri, bary, xyz.astype(np.float64), normals.astype(np.float64)
+
+def _world_triangles(eval_obj, mesh):
+    mesh.calc_loop_triangles()
+    co = foreach_array(mesh.vertices, "co", 3, np.float32)
+    tri_verts = foreach_array(mesh.loop_triangles, "vertices", 3, np.int32)
+    mw = np.array(eval_obj.matrix_world, dtype=np.float32)
+    return co @ mw[:3, :3].T + mw[:3, 3], tri_verts
+
+def sample_mesh_surface(obj, depsgraph, count: int, seed: int = 0):
+    eval_obj = obj.evaluated_get(depsgraph)
+    mesh = eval_obj.to_mesh()
+    try:
+        co, tri_verts = _world_triangles(eval_obj, mesh)
+        samples = _sample_triangles(co, tri_verts, count, seed)
+        if samples is None:
+            return np.zeros((0, 3)), np.zeros((0, 3), dtype=np.uint8)
+
+        tri, bary, xyz, _ = samples
+        rgb = _sample_colors(mesh, mesh.loop_triangles, tri, bary)
+        return xyz, np.round(rgb * 255.0).astype(np.uint8)
+    finally:
+        eval_obj.to_mesh_clear()
+
+def sample_surface_patches(obj, depsgraph, count: int, seed: int = 0):
+    # Area-weighted surface points with their face normals, each standing in for a surface patch.
+    eval_obj = obj.evaluated_get(depsgraph)
+    mesh = eval_obj.to_mesh()
+    try:
+        samples = _sample_triangles(*_world_triangles(eval_obj, mesh), count, seed)
+        if samples is None:
+            return np.zeros((0, 3)), np.zeros((0, 3))
+        return samples[2], samples[3]
+    finally:
+        eval_obj.to_mesh_clear()
+
+def _sample_colors(mesh, tris, tri, bary):
+    count = len(tri)
+    color_attr = mesh.color_attributes.active_color if hasattr(mesh, "color_attributes") else None
+    if color_attr is not None and color_attr.domain in {"POINT", "CORNER"}:
+        colors = foreach_array(color_attr.data, "color_srgb", 4, np.float32)[:, :3]
+        index_attr = "vertices" if color_attr.domain == "POINT" else "loops"
+        idx = foreach_array(tris, index_attr, 3, np.int32)[tri]
+        return np.einsum("nk,nkc->nc", bary, colors[idx])
+
+    materials = list(mesh.materials) or [None]
+    # Blender draws faces whose index is past the last slot (left behind by deleted slots) with the last one.
+    mat_index = np.clip(foreach_array(tris, "material_index", 1, np.int32)[tri], 0, len(materials) - 1)
+    uv_layer = mesh.uv_layers.active
+    loop_uv = None
+    rgb = np.full((count, 3), 0.5)
+    for mi, mat in enumerate(materials):
+        sel = mat_index == mi if len(materials) > 1 else np.ones(count, dtype=bool)
+        if not sel.any():
+            continue
+        image = _material_image(mat)
+        if image is not None and uv_layer is not None:
+            if loop_uv is None:
+                loop_uv = foreach_array(uv_layer.data, "uv", 2, np.float32)
+                tri_loops = foreach_array(tris, "loops", 3, np.int32)
+            uv = np.einsum("nk,nkc->nc", bary[sel], loop_uv[tri_loops[tri[sel]]])
+            rgb[sel] = _sample_image(image, uv)
+        else:
+            rgb[sel] = _material_flat_color(mat)
+    return rgb
+
+def write_points_ply(path: str, xyz, rgb):
+    pts = np.empty(len(xyz), dtype=PLY_POINT_DTYPE)
+    pts["x"], pts["y"], pts["z"] = np.asarray(xyz, dtype=np.float32).T
+    pts["red"], pts["green"], pts["blue"] = np.asarray(rgb, dtype=np.uint8).T
+    header = (
+        "ply\n"
+        "format binary_little_endian 1.0\n"
+        f"element vertex {len(pts)}\n"
+        "property float x\n"
+        "property float y\n"
+        "property float z\n"
+        "property uchar red\n"
+        "property uchar green\n"
+        "property uchar blue\n"
+        "end_header\n"
+    )
+    with open(path, "wb") as f:
+        f.write(header.encode("ascii"))
+        pts.tofile(f)
+
+def source_mesh(p):
+    obj = p.source_object
+    return obj if obj is not None and obj.type == "MESH" else None
+
+def mesh_seed_points(p, context):
+    obj = source_mesh(p)
+    if obj is None:
+        return None
+    return sample_mesh_surface(obj, context.evaluated_depsgraph_get(), int(p.seed_point_count))
+
+class NSOT_OT_write_seed_points(bpy.types.Operator):
+    bl_idname = "nsot.write_seed_points"
+    bl_label = "Write Seed Point Cloud"
+    bl_description = "Samples the source object's surface and writes sparse_pc.ply into output_dir for splatfacto initialization"
+    bl_options = {"REGISTER"}
+
+    def execute(self, context):
+        p = context.scene.nsot_props
+        if not p.output_dir:
+            self.report({"ERROR"}, "Output Directory is empty.")
+            return {"CANCELLED"}
+
+        seed = mesh_seed_points(p, context)
+        if seed is None:
+            self.report({"ERROR"}, "Source Object must be a mesh.")
+            return {"CANCELLED"}
+
+        out_root = bpy.path.abspath(p.output_dir)
+        ensure_dir(out_root)
+        path = os.path.join(out_root, "sparse_pc.ply")
+        write_points_ply(path, *seed)
+
+        self.report({"INFO"}, f"Wrote {len(seed[0])} seed points: {path}")
+        return {"FINISHED"}
@@ -0,0 +1,339 @@
+# Quantized splat formats for web delivery. No bpy imports.
+#   .splat : the 32-byte-per-gaussian layout read by most WebGL viewers (float xyz/scale, u8 RGBA, u8 quaternion).
+#   .nspz  : SPZ-style columnar container: Morton-sorted chunks with 16/24-bit fixed-point positions per
+#            chunk, 8-bit log-scales/opacity/colour/quaternions, and SH truncated to a chosen degree and stored
+#            as 8-bit values scaled per band or 8-bit indices into a 256-entry palette. Each column is its own
+#            zlib stream.
+# CLI: python splat_compress.py FINAL_GSPLAT.ply [--formats splat,nspz] [--pos-bits 16|24] [--sh-degree N] [--sh-mode u8|palette]
+import os
+import sys
+import time
+import zlib
+import struct
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+try:
+    from .splat_io import open_splat
+except ImportError:
+    from splat_io import open_splat
+
+SH_C0 = 0.28209479177387814
+NSPZ_MAGIC = b"NSPZ"
+NSPZ_VERSION = 2  # v2: per-band SH scales in u8 mode, palette spans the full coefficient range
+NSPZ_HEADER = struct.Struct("<4sIIIBBBB")  # magic, version, count, chunk, pos bits, SH coeffs kept, SH mode, streams
+CHUNK = 65536
+SH_MODES = {"u8": 0, "palette": 1}
+COLOR_SCALE = 0.15  # SPZ's DC scaling: f_dc in about [-3.3, 3.3] maps onto 0..255.
+SCALE_OFFSET, SCALE_STEP = 10.0, 16.0  # log-scale in [-10, 6) at 1/16 resolution.
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+def _logit(p):
+    p = np.clip(p, 1e-6, 1.0 - 1e-6)
+    return np.log(p / (1.0 - p))
+
+def _u8(x):
+    return np.clip(np.rint(x), 0, 255).astype(np.uint8)
+
+def load_attributes(splat, sh_degree: int = 3):
+    # Float32 working copies of every attribute, with f_rest reshaped to (N, 3, coeffs) and truncated.
+    rest = np.asarray(splat.f_rest, dtype=np.float32)
+    per_channel = rest.shape[1] // 3
+    keep = min(per_channel, (sh_degree + 1) ** 2 - 1)
+    rest = rest.reshape(len(splat), 3, per_channel)[:, :, :keep]
+    rot = np.asarray(splat.rotations, dtype=np.float32)
+    rot = rot / np.maximum(np.linalg.norm(rot, axis=1, keepdims=True), 1e-12)
+    return {
+        "positions": np.asarray(splat.positions, dtype=np.float32),
+        "scales": np.asarray(splat.scales, dtype=np.float32),
+        "rotations": rot,
+        "opacity": np.asarray(splat.opacity, dtype=np.float32),
+        "f_dc": np.asarray(splat.f_dc, dtype=np.float32),
+        "f_rest": np.ascontiguousarray(rest),
+    }
+
+def morton_order(positions, bits: int = 10):
+    # Z-order sort so each chunk covers a compact box and fixed-point positions keep their precision.
+    lo, hi = positions.min(axis=0), positions.max(axis=0)
+    q = ((positions - lo) / np.maximum(hi - lo, 1e-12) * ((1 << bits) - 1)).astype(np.uint64)
+    code = np.zeros(len(positions), dtype=np.uint64)
+    for b in range(bits):
+        for axis in range(3):
+            code |= ((q[:, axis] >> np.uint64(b)) & np.uint64(1)) << np.uint64(3 * b + axis)
+    return np.argsort(code, kind="stable")
+
+# ----------------------------------------------------------------------------- .splat
+
+def encode_splat(attrs):
+    pos, scales, rot, opacity, dc = attrs["positions"], attrs["scales"], attrs["rotations"], attrs["opacity"], attrs["f_dc"]
+    alpha = _sigmoid(opacity)
+    # Viewers draw in file order before their own sort; big, opaque gaussians first looks best while loading.
+    order = np.argsort(-(np.exp(scales.sum(axis=1)) * alpha), kind="stable")
+    out = np.empty(len(pos), dtype=[("pos", "<f4", 3), ("scale", "<f4", 3), ("rgba", "u1", 4), ("rot", "u1", 4)])
+    out["pos"] = pos[order]
+    out["scale"] = np.exp(scales[order])
+    out["rgba"][:, :3] = _u8((0.5 + SH_C0 * dc[order]) * 255.0)
+    out["rgba"][:, 3] = _u8(alpha[order] * 255.0)
+    out["rot"] = _u8(rot[order] * 128.0 + 128.0)
+    return out.tobytes(), order
+
+def decode_splat(payload: bytes):
+    data = np.frombuffer(payload, dtype=[("pos", "<f4", 3), ("scale", "<f4", 3), ("rgba", "u1", 4), ("rot", "u1", 4)])
+    rot = (data["rot"].astype(np.float32) - 128.0) / 128.0
+    return {
+        "positions": data["pos"].copy(),
+        "scales": np.log(np.maximum(data["scale"], 1e-30)),
+        "rotations": rot / np.maximum(np.linalg.norm(rot, axis=1, keepdims=True), 1e-12),
+        "opacity": _logit(data["rgba"][:, 3] / 255.0).astype(np.float32),
+        "f_dc": ((data["rgba"][:, :3] / 255.0 - 0.5) / SH_C0).astype(np.float32),
+    }
+
+# ----------------------------------------------------------------------------- .nspz
+
+def _chunk_bounds(pos, chunk: int):
+    n_chunks = (len(pos) + chunk - 1) // chunk
+    starts = np.arange(n_chunks) * chunk
+    lo = np.minimum.reduceat(pos, starts, axis=0)
+    hi = np.maximum.reduceat(pos, starts, axis=0)
+    return lo.astype(np.float32), hi.astype(np.float32)
+
+def _chunk_index(n: int, chunk: int):
+    return np.arange(n) // chunk
+
+def encode_positions(pos, chunk: int, bits: int):
+    lo, hi = _chunk_bounds(pos, chunk)
+    idx = _chunk_index(len(pos), chunk)
+    levels = (1 << bits) - 1
+    span = np.maximum(hi - lo, 1e-12)[idx]
+    q = np.clip(np.rint((pos - lo[idx]) / span * levels), 0, levels).astype(np.uint32)
+    if bits == 16:
+        body = q.astype("<u2").tobytes()
+    else:
+        body = q.astype("<u4").view(np.uint8).reshape(len(pos), 3, 4)[:, :, :3].tobytes()
+    return np.concatenate((lo, hi), axis=1).tobytes() + body
+
+def decode_positions(buf, offset: int, n: int, chunk: int, bits: int):
+    n_chunks = (n + chunk - 1) // chunk
+    bounds = np.frombuffer(buf, dtype="<f4", count=n_chunks * 6, offset=offset).reshape(n_chunks, 6)
+    offset += bounds.nbytes
+    if bits == 16:
+        q = np.frombuffer(buf, dtype="<u2", count=n * 3, offset=offset).reshape(n, 3).astype(np.float32)
+        offset += n * 6
+    else:
+        raw = np.frombuffer(buf, dtype=np.uint8, count=n * 9, offset=offset).reshape(n, 3, 3).astype(np.uint32)
+        q = (raw[..., 0] | (raw[..., 1] << 8) | (raw[..., 2] << 16)).astype(np.float32)
+        offset += n * 9
+    idx = _chunk_index(n, chunk)
+    lo, hi = bounds[idx, :3], bounds[idx, 3:]
+    return lo + q / ((1 << bits) - 1) * (hi - lo), offset
+
+def encode_quaternions(rot):
+    # Smallest-three is overkill at 8 bits; like SPZ, flip to w >= 0 and store xyz, rebuilding w on decode.
+    rot = np.where(rot[:, :1] < 0.0, -rot, rot)
+    return _u8(rot[:, 1:] * 127.5 + 127.5)
+
+def decode_quaternions(q8):
+    xyz = q8.astype(np.float32) / 127.5 - 1.0
+    w = np.sqrt(np.maximum(0.0, 1.0 - (xyz * xyz).sum(axis=1, keepdims=True)))
+    rot = np.concatenate((w, xyz), axis=1)
+    return rot / np.maximum(np.linalg.norm(rot, axis=1, keepdims=True), 1e-12)
+
+def sh_palette(values, size: int = 256, sample: int = 1 << 20, seed: int = 0):
+    # 1-D codebook: three quarters at evenly spaced quantiles, dense where SH values cluster near zero, and
+    # a quarter evenly spaced from the minimum to the maximum, so outliers keep a coarse value instead of
+    # collapsing onto the last quantile.
+    flat = values.ravel()
+    if len(flat) > sample:
+        flat = flat[np.random.default_rng(seed).integers(0, len(flat), sample)]
+    spread = size // 4
+    inner = np.quantile(flat, (np.arange(size - spread) + 0.5) / (size - spread))
+    return np.unique(np.concatenate((inner, np.linspace(values.min(), values.max(), spread))).astype(np.float32))
+
+def sh_band_scales(rest):
+    # Largest magnitude per coefficient band of (coeffs, N, 3) SH, so u8 mode covers each band without clipping.
+    return np.maximum(np.abs(rest).max(axis=(1, 2)), 1e-12).astype(np.float32)
+
+def palette_encode(values, palette):
+    mids = 0.5 * (palette[1:] + palette[:-1])
+    return np.searchsorted(mids, values).astype(np.uint8)
+
+def encode_nspz(attrs, pos_bits: int = 16, sh_degree: int = 3, sh_mode: str = "u8", chunk: int = CHUNK, level: int = 6):
+    # Returns (payload, order); order maps file rows back to input rows for error reporting.
+    order = morton_order(attrs["positions"])
+    pos = attrs["positions"][order]
+    n = len(pos)
+    rest = attrs["f_rest"][order]
+    keep = min(rest.shape[2], (sh_degree + 1) ** 2 - 1)
+    rest = rest[:, :, :keep]
+
+    columns = [
+        encode_positions(pos, chunk, pos_bits),
+        _u8(_sigmoid(attrs["opacity"][order]) * 255.0).tobytes(),
+        _u8((attrs["scales"][order] + SCALE_OFFSET) * SCALE_STEP).tobytes(),
+        encode_quaternions(attrs["rotations"][order]).tobytes(),
+        _u8((attrs["f_dc"][order] * COLOR_SCALE + 0.5) * 255.0).tobytes(),
+    ]
+    if keep:
+        # Coefficient-major so each SH band compresses as one run.
+        rest = np.ascontiguousarray(rest.transpose(2, 0, 1))
+        if sh_mode == "palette":
+            palette = sh_palette(rest)
+            columns.append(struct.pack("<I", len(palette)) + palette.tobytes())
+            columns += [palette_encode(band, palette).tobytes() for band in rest]
+        else:
+            band_scales = sh_band_scales(rest)
+            columns.append(band_scales.astype("<f4").tobytes())
+            columns += [_u8(band / s * 127.5 + 127.5).tobytes() for band, s in zip(rest, band_scales)]
+
+    # One zlib stream per column: zlib releases the GIL, so columns compress and decompress in parallel.
+    with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as pool:
+        streams = list(pool.map(lambda c: zlib.compress(c, level), columns))
+    header = NSPZ_HEADER.pack(NSPZ_MAGIC, NSPZ_VERSION, n, chunk, pos_bits, keep, SH_MODES[sh_mode], len(streams))
+    sizes = struct.pack(f"<{len(streams)}I", *(len(s) for s in streams))
+    return header + sizes + b"".join(streams), order
+
+def decode_nspz(payload: bytes):
+    magic, version, n, chunk, pos_bits, keep, sh_mode, n_streams = NSPZ_HEADER.unpack_from(payload)
+    if magic != NSPZ_MAGIC or version != NSPZ_VERSION:
+        raise ValueError(f"not an NSPZ v{NSPZ_VERSION} payload")
+    sizes = struct.unpack_from(f"<{n_streams}I", payload, NSPZ_HEADER.size)
+    ends = np.cumsum((NSPZ_HEADER.size + 4 * n_streams,) + sizes)
+    view = memoryview(payload)
+    with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as pool:
+        buf = b"".join(pool.map(lambda k: zlib.decompress(view[ends[k]:ends[k + 1]]), range(n_streams)))
+    pos, o = decode_positions(buf, 0, n, chunk, pos_bits)
+
+    def take(count, dtype=np.uint8):
+        nonlocal o
+        arr = np.frombuffer(buf, dtype=dtype, count=count, offset=o)
+        o += arr.nbytes
+        return arr
+
+    opacity = _logit(take(n) / 255.0).astype(np.float32)
+    scales = take(n * 3).reshape(n, 3).astype(np.float32) / SCALE_STEP - SCALE_OFFSET
+    rotations = decode_quaternions(take(n * 3).reshape(n, 3))
+    f_dc = ((take(n * 3).reshape(n, 3) / 255.0 - 0.5) / COLOR_SCALE).astype(np.float32)
+    f_rest = np.zeros((n, 3, keep), dtype=np.float32)
+    sh_range = np.zeros((2, keep), dtype=np.float32)
+    if keep:
+        if sh_mode == SH_MODES["palette"]:
+            size = struct.unpack_from("<I", buf, o)[0]
+            o += 4
+            palette = take(size, "<f4")
+            coeffs = palette[take(keep * n * 3)]
+            sh_range[0], sh_range[1] = palette[0], palette[-1]
+        else:
+            band_scales = take(keep, "<f4")
+            coeffs = (take(keep * n * 3).reshape(keep, n * 3).astype(np.float32) / 127.5 - 1.0) * band_scales[:, None]
+            sh_range[0], sh_range[1] = -band_scales, band_scales
+        f_rest = np.ascontiguousarray(coeffs.reshape(keep, n, 3).transpose(1, 2, 0))
+    # sh_range: the lowest and highest value each SH band can decode to, for clipping reports.
+    return {"positions": pos, "scales": scales, "rotations": rotations, "opacity": opacity, "f_dc": f_dc, "f_rest": f_rest,
+            "sh_range": sh_range}
+
+# ----------------------------------------------------------------------------- reporting
+
+def attribute_errors(original, decoded, order):
+    # RMS and max absolute error per attribute, comparing rows in file order. Quaternions use the
+    # angle between orientations (q and -q are the same rotation). "f_rest_clipped" is the fraction of SH
+    # coefficients outside the range their band can decode to, overall and for the worst band.
+    errors = {}
+    decoded = dict(decoded)
+    sh_range = decoded.pop("sh_range", None)
+    for key, dec in decoded.items():
+        ref = original[key][order]
+        if key == "f_rest":
+            ref = ref[:, :, :dec.shape[2]]
+        if key == "rotations":
+            dot = np.clip(np.abs((ref * dec).sum(axis=1)), 0.0, 1.0)
+            diff = np.degrees(2.0 * np.arccos(dot))
+            errors[key] = (float(np.sqrt(np.mean(diff ** 2))), float(diff.max()), "deg")
+            continue
+        if key == "opacity":
+            ref, dec = _sigmoid(ref), _sigmoid(dec)
+        diff = np.abs(ref.astype(np.float64) - dec)
+        if diff.size == 0:
+            continue
+        errors[key] = (float(np.sqrt(np.mean(diff ** 2))), float(diff.max()), "m" if key == "positions" else "")
+        if key == "f_rest" and sh_range is not None:
+            errors["f_rest_clipped"] = sh_clipped_fraction(ref, *sh_range)
+    return errors
+
+def sh_clipped_fraction(ref, lo, hi):
+    # Values beyond a band's representable range (plus float slack) were clipped by the quantizer.
+    slack = 1e-5 * np.maximum(np.abs(lo), np.abs(hi)) + 1e-7
+    clipped = ((ref < lo - slack) | (ref > hi + slack)).mean(axis=(0, 1))
+    return (float(clipped.mean()), float(clipped.max()), "")
+
+def compress_splat(ply_path: str, formats=("splat", "nspz"), pos_bits: int = 16, sh_degree: int = 3, sh_mode: str = "u8", log=print):
+    # Writes <stem>.splat / <stem>.nspz next to ply_path and returns a report per format.
+    splat = open_splat(ply_path)
+    n = len(splat)
+    if n == 0:
+        raise ValueError(f"{ply_path} contains no gaussians")
+    attrs = load_attributes(splat, sh_degree=3)
+    source_mb = os.path.getsize(ply_path) / 1e6
+    stem = os.path.splitext(ply_path)[0]
+    reports = []
+    for fmt in formats:
+        t0 = time.perf_counter()
+        if fmt == "splat":
+            payload, order = encode_splat(attrs)
+        else:
+            payload, order = encode_nspz(attrs, pos_bits, sh_degree, sh_mode)
+        encode_s = time.perf_counter() - t0
+
+        path = f"{stem}.{fmt}"
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, path)
+
+        t0 = time.perf_counter()
+        decoded = decode_splat(payload) if fmt == "splat" else decode_nspz(payload)
+        decode_s = time.perf_counter() - t0
+
+        report = {
+            "format": fmt,
+            "path": path,
+            "count": n,
+            "mb": len(payload) / 1e6,
+            "ratio": source_mb / max(1e-9, len(payload) / 1e6),
+            "encode_mgs": n / max(encode_s, 1e-9) / 1e6,
+            "decode_mgs": n / max(decode_s, 1e-9) / 1e6,
+            "errors": attribute_errors(attrs, decoded, order),
+        }
+        reports.append(report)
+        if log is not None:
+            log(format_report(report, source_mb))
+    return reports
+
+def format_report(report, source_mb: float) -> str:
+    lines = [
+        f"{os.path.basename(report['path'])}: {report['mb']:.2f} MB (from {source_mb:.2f} MB, {report['ratio']:.1f}x), "
+        f"encode {report['encode_mgs']:.2f} M/s, decode {report['decode_mgs']:.2f} M/s"
+    ]
+    for key, (rms, worst, unit) in report["errors"].items():
+        if key == "f_rest_clipped":
+            lines.append(f"  SH clipped {100.0 * rms:.3g}%  worst band {100.0 * worst:.3g}%")
+            continue
+        lines.append(f"  {key:<10} rms {rms:.3g}{unit}  max {worst:.3g}{unit}")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write quantized .splat / .nspz versions of a Gaussian splat PLY.")
+    parser.add_argument("ply")
+    parser.add_argument("--formats", default="splat,nspz")
+    parser.add_argument("--pos-bits", type=int, choices=(16, 24), default=16)
+    parser.add_argument("--sh-degree", type=int, choices=(0, 1, 2, 3), default=3)
+    parser.add_argument("--sh-mode", choices=tuple(SH_MODES), default="u8")
+    args = parser.parse_args(argv)
+    compress_splat(args.ply, [f.strip() for f in args.formats.split(",") if f.strip()], args.pos_bits, args.sh_degree, args.sh_mode)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+# Maps exported splats back into Blender world space. No bpy imports.
+# ns-export writes gaussians in nerfstudio's dataparser frame: p_dp = s * (T @ p_ns), where T and s come
+# from the run's dataparser_transforms.json. ns-process-data additionally records an applied_transform
+# (COLMAP -> nerfstudio axes) in the dataset's transforms.json. Known-pose and native transforms datasets are
+# written from Blender world coordinates, so undoing both lands the splat on the source object. COLMAP SfM
+# datasets have an arbitrary frame that cannot be recovered this way.
+import os
+import json
+
+import numpy as np
+
+try:
+    from .rig import rotmat_to_qvec
+except ImportError:
+    from rig import rotmat_to_qvec
+
+DATAPARSER_NAME = "dataparser_transforms.json"
+
+def _homogeneous(m):
+    out = np.eye(4)
+    m = np.asarray(m, dtype=np.float64)
+    out[:m.shape[0], :m.shape[1]] = m
+    return out
+
+def latest_run_dir(out_root: str, dataset: str = "colmap_data", method: str = "splatfacto"):
+    base = os.path.join(out_root, "outputs", dataset, method)
+    if not os.path.isdir(base):
+        return None
+    runs = [os.path.join(base, d) for d in os.listdir(base) if os.path.isfile(os.path.join(base, d, DATAPARSER_NAME))]
+    return max(runs, key=os.path.getmtime) if runs else None
+
+def splat_to_world(run_dir, dataset_dir: str = ""):
+    # Returns (4x4 similarity matrix, uniform scale factor). Without the run's dataparser transform the splat is
+    # still in nerfstudio's normalized frame, so world-space distances cannot be measured; that raises.
+    if not run_dir or not os.path.isfile(os.path.join(run_dir, DATAPARSER_NAME)):
+        raise FileNotFoundError(f"No {DATAPARSER_NAME} for the trained run ({run_dir or 'no run found'}); "
+                                "cannot map the splat to Blender world space")
+    with open(os.path.join(run_dir, DATAPARSER_NAME), "r", encoding="utf-8") as f:
+        dp = json.load(f)
+    scale = float(dp.get("scale", 1.0))
+    matrix = np.linalg.inv(_homogeneous(dp["transform"])) @ np.diag((1.0 / scale, 1.0 / scale, 1.0 / scale, 1.0))
+
+    transforms = os.path.join(dataset_dir, "transforms.json") if dataset_dir else ""
+    if transforms and os.path.isfile(transforms):
+        with open(transforms, "r", encoding="utf-8") as f:
+            applied = json.load(f).get("applied_transform")
+        if applied is not None:
+            matrix = np.linalg.inv(_homogeneous(applied)) @ matrix
+    return matrix, 1.0 / scale
+
+def transform_points(points, matrix):
+    return points @ matrix[:3, :3].T + matrix[:3, 3]
+
+def matrix_quaternion(matrix):
+    # (w, x, y, z) of the rotation part of a similarity matrix.
+    r = np.asarray(matrix, dtype=np.float64)[:3, :3]
+    return rotmat_to_qvec(r / np.cbrt(np.linalg.det(r)))[0]
+
+def rotate_quaternions(q, quats):
+    # q * quats for (N, 4) wxyz rows (the ply's rot_0..3), normalised on the way.
+    quats = quats / np.maximum(np.linalg.norm(quats, axis=1, keepdims=True), 1e-12)
+    w0, x0, y0, z0 = q
+    w, x, y, z = quats.T
+    return np.stack((
+        w0 * w - x0 * x - y0 * y - z0 * z,
+        w0 * x + x0 * w + y0 * z - z0 * y,
+        w0 * y - x0 * z + y0 * w + z0 * x,
+        w0 * z + x0 * y - y0 * x + z0 * w,
+    ), axis=1)
+
+def quaternion_euler(quats):
+    # (N, 4) wxyz -> (N, 3) Blender XYZ Euler angles.
+    w, x, y, z = quats.T
+    ex = np.arctan2(2.0 * (w * x + y * z), 1.0 - 2.0 * (x * x + y * y))
+    ey = np.arcsin(np.clip(2.0 * (w * y - z * x), -1.0, 1.0))
+    ez = np.arctan2(2.0 * (w * z + x * y), 1.0 - 2.0 * (y * y + z * z))
+    return np.stack((ex, ey, ez), axis=1)
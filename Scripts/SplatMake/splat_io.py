@@ -0,0 +1,268 @@
+# Gaussian splat PLY I/O as produced by `ns-export gaussian-splat`: binary little-endian, one vertex
+# element with x/y/z, nx/ny/nz, f_dc_*, f_rest_*, opacity, scale_*, rot_*. The vertex block is exposed
+# as a read-only memory-mapped structured array, so opening is independent of file size.
+# No bpy imports. Benchmark: python splat_io.py --bench 5000000
+import os
+import re
+import sys
+import time
+import tempfile
+
+import numpy as np
+
+PLY_TYPES = {
+    "char": "i1", "int8": "i1",
+    "uchar": "u1", "uint8": "u1",
+    "short": "<i2", "int16": "<i2",
+    "ushort": "<u2", "uint16": "<u2",
+    "int": "<i4", "int32": "<i4",
+    "uint": "<u4", "uint32": "<u4",
+    "float": "<f4", "float32": "<f4",
+    "double": "<f8", "float64": "<f8",
+}
+PLY_NAMES = {"i1": "char", "u1": "uchar", "i2": "short", "u2": "ushort", "i4": "int", "u4": "uint", "f4": "float", "f8": "double"}
+
+# Width reserved for the vertex count so a streaming writer can patch it in place on close.
+COUNT_WIDTH = 12
+PAD_COMMENT = "comment pad"
+
+def read_header(f):
+    # Returns (data_offset, [(element, count, dtype)], comments). Only fixed-size properties are supported.
+    if f.readline().strip() != b"ply":
+        raise ValueError("not a PLY file")
+    elements, comments, fmt = [], [], None
+    while True:
+        line = f.readline()
+        if not line:
+            raise ValueError("PLY header has no end_header")
+        parts = line.decode("ascii", errors="replace").split()
+        if not parts:
+            continue
+        key = parts[0]
+        if key == "end_header":
+            break
+        if key == "format":
+            fmt = parts[1]
+        elif key == "comment":
+            if parts[1:2] != ["pad"]:
+                comments.append(line.decode("ascii", errors="replace")[len("comment "):].rstrip("\r\n"))
+        elif key == "element":
+            elements.append([parts[1], int(parts[2]), []])
+        elif key == "property":
+            if parts[1] == "list":
+                raise ValueError(f"list property '{parts[-1]}' is not supported")
+            elements[-1][2].append((parts[2], PLY_TYPES[parts[1]]))
+    if fmt != "binary_little_endian":
+        raise ValueError(f"unsupported PLY format '{fmt}', expected binary_little_endian")
+    return f.tell(), [(name, count, np.dtype(props)) for name, count, props in elements], comments
+
+class Splat:
+    # A memory-mapped splat. Attribute groups are zero-copy strided views into the same buffer.
+    def __init__(self, path: str, data, comments=()):
+        self.path = path
+        self.data = data
+        self.comments = list(comments)
+
+    def __len__(self):
+        return len(self.data)
+
+    @property
+    def names(self):
+        return self.data.dtype.names
+
+    def group(self, names):
+        # (N, len(names)) view over consecutive same-typed fields; falls back to a copy only if the
+        # fields are not laid out contiguously.
+        names = list(names)
+        if not names:
+            return np.zeros((len(self.data), 0), dtype=np.float32)
+        fields = self.data.dtype.fields
+        base_dtype, first = fields[names[0]][0], fields[names[0]][1]
+        contiguous = all(
+            fields[n][0] == base_dtype and fields[n][1] == first + k * base_dtype.itemsize for k, n in enumerate(names)
+        )
+        if not contiguous:
+            return np.stack([self.data[n] for n in names], axis=1)
+        return np.ndarray(
+            shape=(len(self.data), len(names)),
+            dtype=base_dtype,
+            buffer=self.data,
+            offset=first,
+            strides=(self.data.dtype.itemsize, base_dtype.itemsize),
+        )
+
+    def _numbered(self, prefix: str):
+        pattern = re.compile(re.escape(prefix) + r"(\d+)$")
+        found = [(int(m.group(1)), n) for n in self.names for m in [pattern.match(n)] if m]
+        return [n for _, n in sorted(found)]
+
+    @property
+    def positions(self):
+        return self.group(("x", "y", "z"))
+
+    @property
+    def f_dc(self):
+        return self.group(self._numbered("f_dc_"))
+
+    @property
+    def f_rest(self):
+        return self.group(self._numbered("f_rest_"))
+
+    @property
+    def opacity(self):
+        return self.data["opacity"]
+
+    @property
+    def scales(self):
+        return self.group(self._numbered("scale_"))
+
+    @property
+    def rotations(self):
+        return self.group(self._numbered("rot_"))
+
+    @property
+    def sh_degree(self) -> int:
+        # f_rest holds 3 * ((d + 1)^2 - 1) coefficients.
+        rest = len(self._numbered("f_rest_")) // 3
+        return int(round((rest + 1) ** 0.5)) - 1
+
+def open_splat(path: str, mode: str = "r") -> Splat:
+    # mode "r" is read-only, "r+" writes changes straight back to the file, "c" is copy-on-write.
+    with open(path, "rb") as f:
+        offset, elements, comments = read_header(f)
+    if not elements or elements[0][0] != "vertex":
+        raise ValueError(f"{path}: first PLY element is not 'vertex'")
+    _, count, dtype = elements[0]
+    if count == 0:
+        return Splat(path, np.zeros(0, dtype=dtype), comments)
+    data = np.memmap(path, dtype=dtype, mode=mode, offset=offset, shape=(count,))
+    return Splat(path, data, comments)
+
+def _header(dtype, count: int, comments=(), pad: int = 0) -> bytes:
+    lines = ["ply", "format binary_little_endian 1.0"]
+    lines += [f"comment {c}" for c in comments]
+    if pad:
+        lines.append(PAD_COMMENT + " " * pad)
+    lines.append(f"element vertex {count}")
+    for name in dtype.names:
+        lines.append(f"property {PLY_NAMES[dtype.fields[name][0].str.lstrip('<>|=')]} {name}")
+    lines.append("end_header")
+    return ("\n".join(lines) + "\n").encode("ascii")
+
+class SplatWriter:
+    # Streams vertex chunks to disk without knowing the final count up front. The header reserves
+    # COUNT_WIDTH digits; close() rewrites it at the same length, absorbing the slack in a pad comment.
+    def __init__(self, path: str, dtype, comments=()):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.comments = list(comments)
+        self.count = 0
+        self.tmp = path + ".tmp"
+        self.f = open(self.tmp, "wb")
+        self.header_len = len(_header(self.dtype, 0, self.comments, pad=COUNT_WIDTH))
+        self.f.write(_header(self.dtype, 0, self.comments, pad=COUNT_WIDTH))
+
+    def write(self, chunk):
+        chunk = np.asarray(chunk)
+        if chunk.dtype != self.dtype:
+            out = np.empty(len(chunk), dtype=self.dtype)
+            for name in self.dtype.names:
+                out[name] = chunk[name]
+            chunk = out
+        self.f.write(np.ascontiguousarray(chunk).tobytes())
+        self.count += len(chunk)
+
+    def close(self):
+        digits = len(str(self.count))
+        header = _header(self.dtype, self.count, self.comments, pad=COUNT_WIDTH + 1 - digits)
+        assert len(header) == self.header_len
+        self.f.seek(0)
+        self.f.write(header)
+        self.f.close()
+        os.replace(self.tmp, self.path)
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.f.close()
+            os.remove(self.tmp)
+
+def write_splat(path: str, data, mask=None, comments=(), chunk: int = 1 << 20, dtype=None) -> int:
+    # Writes data (optionally data[mask]) in chunks, so subsets of memory-mapped files never load whole.
+    # dtype may drop fields (e.g. higher SH bands); kept fields are copied by name.
+    with SplatWriter(path, dtype or data.dtype, comments) as writer:
+        for s in range(0, len(data), chunk):
+            block = data[s:s + chunk]
+            writer.write(block if mask is None else block[mask[s:s + chunk]])
+    return writer.count
+
+def splat_dtype(sh_degree: int = 3, normals: bool = True):
+    fields = ["x", "y", "z"] + (["nx", "ny", "nz"] if normals else [])
+    fields += [f"f_dc_{i}" for i in range(3)]
+    fields += [f"f_rest_{i}" for i in range(3 * ((sh_degree + 1) ** 2 - 1))]
+    fields += ["opacity"] + [f"scale_{i}" for i in range(3)] + [f"rot_{i}" for i in range(4)]
+    return np.dtype([(name, "<f4") for name in fields])
+
+def random_splat(count: int, sh_degree: int = 3, seed: int = 0, chunk: int = 1 << 20):
+    # Synthetic splat with plausible value ranges, generated in chunks (for benchmarks and round trips).
+    rng = np.random.default_rng(seed)
+    dtype = splat_dtype(sh_degree)
+    for s in range(0, count, chunk):
+        n = min(chunk, count - s)
+        block = np.zeros(n, dtype=dtype)
+        flat = block.view(np.float32).reshape(n, -1)
+        flat[:] = rng.standard_normal(flat.shape, dtype=np.float32) * 0.3
+        for name in ("x", "y", "z"):
+            block[name] = rng.standard_normal(n, dtype=np.float32)
+        block["opacity"] = rng.standard_normal(n, dtype=np.float32) * 3.0
+        for i in range(3):
+            block[f"scale_{i}"] = rng.normal(-4.5, 1.0, n).astype(np.float32)
+        yield block
+
+def benchmark(count: int, directory: str = ""):
+    directory = directory or tempfile.gettempdir()
+    src = os.path.join(directory, "nsot_bench_src.ply")
+    dst = os.path.join(directory, "nsot_bench_dst.ply")
+    try:
+        t0 = time.perf_counter()
+        with SplatWriter(src, splat_dtype()) as writer:
+            for block in random_splat(count):
+                writer.write(block)
+        write_s = time.perf_counter() - t0
+        size_mb = os.path.getsize(src) / 1e6
+
+        t0 = time.perf_counter()
+        splat = open_splat(src)
+        open_ms = (time.perf_counter() - t0) * 1000.0
+
+        t0 = time.perf_counter()
+        center = splat.positions.mean(axis=0)
+        column_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        keep = splat.opacity > 0.0
+        kept = write_splat(dst, splat.data, keep)
+        subset_s = time.perf_counter() - t0
+
+        print(f"{count} gaussians, {size_mb:.0f} MB, SH degree {splat.sh_degree}")
+        print(f"  stream write : {write_s:.2f}s ({size_mb / write_s:.0f} MB/s)")
+        print(f"  open (mmap)  : {open_ms:.2f} ms")
+        print(f"  xyz mean     : {column_s:.2f}s, centre {np.round(center, 3)}")
+        print(f"  subset write : {subset_s:.2f}s ({kept} kept, {size_mb / subset_s:.0f} MB/s scanned)")
+        del splat
+    finally:
+        for path in (src, dst):
+            if os.path.exists(path):
+                os.remove(path)
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "--bench":
+        benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 5_000_000)
+    else:
+        s = open_splat(sys.argv[1])
+        print(f"{s.path}: {len(s)} gaussians, SH degree {s.sh_degree}, fields {', '.join(s.names)}")
@@ -0,0 +1,91 @@
+import bpy
+import os
+import shutil
+
+from .pipeline import DATASET_NAME, compress_options, prune_settings
+from .splat_compress import compress_splat
+from .splat_frame import latest_run_dir, splat_to_world
+from .splat_prune import WORLD_SETTINGS, format_prune_report, is_derived, prune_splat
+
+FINAL_SPLAT_NAME = "FINAL_GSPLAT.ply"
+RAW_SPLAT_NAME = "FINAL_GSPLAT_raw.ply"
+
+def final_splat_path(p) -> str:
+    return os.path.join(bpy.path.abspath(p.output_dir), FINAL_SPLAT_NAME)
+
+def splat_world(p):
+    # (matrix, scale) taking the latest trained run's splat frame to Blender world space.
+    # Raises FileNotFoundError when there is no trained run with a dataparser transform.
+    out_root = bpy.path.abspath(p.output_dir)
+    return splat_to_world(latest_run_dir(out_root, DATASET_NAME), os.path.join(out_root, DATASET_NAME))
+
+def backup_raw(path: str):
+    # Keeps the untouched export as FINAL_GSPLAT_raw.ply before the first rewrite; returns its path,
+    # or None when FINAL was already rewritten and the backup is gone.
+    raw = os.path.join(os.path.dirname(path), RAW_SPLAT_NAME)
+    if not is_derived(path):
+        shutil.copy2(path, raw)
+    elif not os.path.isfile(raw):
+        return None
+    return raw
+
+class NSOT_OT_compress_splat(bpy.types.Operator):
+    bl_idname = "nsot.compress_splat"
+    bl_label = "Compress Splat"
+    bl_description = "Writes quantized .splat / .nspz versions of FINAL_GSPLAT.ply and prints size, throughput and per-attribute error"
+    bl_options = {"REGISTER"}
+
+    def execute(self, context):
+        p = context.scene.nsot_props
+        path = final_splat_path(p)
+        if not os.path.isfile(path):
+            self.report({"ERROR"}, f"No splat found: {path}")
+            return {"CANCELLED"}
+
+        options = compress_options(p)
+        if not options["formats"]:
+            self.report({"ERROR"}, "Enable .splat and/or .nspz output.")
+            return {"CANCELLED"}
+
+        reports = compress_splat(path, options["formats"], options["pos_bits"], options["sh_degree"], options["sh_mode"],
+                                 log=lambda msg: print(f"[NSOT] {msg}"))
+        sizes = ", ".join(f"{os.path.basename(r['path'])} {r['mb']:.1f} MB ({r['ratio']:.1f}x)" for r in reports)
+        self.report({"INFO"}, f"Wrote {sizes}; errors in the console")
+        return {"FINISHED"}
+
+class NSOT_OT_prune_splat(bpy.types.Operator):
+    bl_idname = "nsot.prune_splat"
+    bl_label = "Prune Splat"
+    bl_description = "Removes near-transparent, oversized, undersized and far-away gaussians from FINAL_GSPLAT.ply, keeping the unpruned file as FINAL_GSPLAT_raw.ply"
+    bl_options = {"REGISTER"}
+
+    def execute(self, context):
+        p = context.scene.nsot_props
+        path = final_splat_path(p)
+        if not os.path.isfile(path):
+            self.report({"ERROR"}, f"No splat found: {path}")
+            return {"CANCELLED"}
+
+        o = prune_settings(p)
+        if p.pipeline_mode == "SFM" and (p.prune_max_scale or p.prune_min_scale or p.prune_max_distance):
+            self.report({"WARNING"}, "COLMAP SfM splats are not in Blender world space; pruning by opacity and SH only.")
+        to_world = None
+        if any(o[k] for k in WORLD_SETTINGS):
+            try:
+                to_world = splat_world(p)
+            except FileNotFoundError as exc:
+                self.report({"ERROR"}, f"{exc}. Disable the scale and distance criteria to prune by opacity and SH only.")
+                return {"CANCELLED"}
+
+        # Prune from the raw export every time, so changing thresholds never compounds.
+        raw = backup_raw(path)
+        if raw is None:
+            self.report({"ERROR"}, f"{FINAL_SPLAT_NAME} was already rewritten and {RAW_SPLAT_NAME} is missing.")
+            return {"CANCELLED"}
+
+        report = prune_splat(raw, path, o["target"], o["radius"], o["min_opacity"], o["max_scale_ratio"], o["min_scale_ratio"],
+                             o["max_distance_ratio"], o["sh_degree"], to_world=to_world)
+        print(f"[NSOT] prune {format_prune_report(report)}")
+        n0, n1 = report["count_before"], report["count_after"]
+        self.report({"INFO"}, f"Pruned {n0 - n1} of {n0} gaussians; {report['bytes_before'] / 1e6:.1f} -> {report['bytes_after'] / 1e6:.1f} MB")
+        return {"FINISHED"}
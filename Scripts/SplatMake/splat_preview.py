@@ -0,0 +1,201 @@
+import bpy
+import os
+import time
+
+import numpy as np
+
+from .splat_compress import SH_C0
+from .splat_frame import matrix_quaternion, quaternion_euler, rotate_quaternions, transform_points
+from .splat_io import open_splat
+from .splat_ops import final_splat_path, splat_world
+
+# Imports FINAL_GSPLAT.ply as a vertex-only mesh for previewing in Blender. Every attribute is computed
+# in NumPy and goes in with a single foreach_set; a Geometry Nodes modifier instances an icosphere per
+# point, rotated and scaled into the gaussian's ellipsoid, and a material reads colour and opacity
+# from the instancer.
+PREVIEW_NAME = "FINAL_GSPLAT_preview"
+NODE_GROUP_NAME = "NSOT Splat Proxies"
+# Above this many points the proxies drop from an 80-triangle icosphere to a 20-triangle icosahedron.
+# The Ico Sphere node's Subdivisions starts at 1, which is already the plain icosahedron.
+PROXY_DETAIL_LIMIT = 500_000
+
+def ico_triangles(subdivisions: int) -> int:
+    return 20 * 4 ** (int(subdivisions) - 1)
+
+def srgb_to_linear(c):
+    c = np.clip(c, 0.0, 1.0)
+    return np.where(c <= 0.04045, c / 12.92, np.power((c + 0.055) / 1.055, 2.4))
+
+def preview_arrays(splat, to_world, fraction: float = 1.0, seed: int = 0):
+    # World-space float32 arrays for a random subset of the splat (all of it at fraction 1).
+    n = len(splat)
+    if fraction < 1.0:
+        rows = np.sort(np.random.default_rng(seed).choice(n, max(1, int(n * fraction)), replace=False))
+        data = splat.data[rows]
+    else:
+        data = splat.data
+    matrix, world_per_unit = to_world
+    xyz = np.stack((data["x"], data["y"], data["z"]), axis=1).astype(np.float64)
+    scales = np.stack((data["scale_0"], data["scale_1"], data["scale_2"]), axis=1).astype(np.float64)
+    quats = np.stack((data["rot_0"], data["rot_1"], data["rot_2"], data["rot_3"]), axis=1).astype(np.float64)
+    dc = np.stack((data["f_dc_0"], data["f_dc_1"], data["f_dc_2"]), axis=1)
+
+    opacity = 1.0 / (1.0 + np.exp(-data["opacity"].astype(np.float64)))
+    color = np.empty((len(data), 4), dtype=np.float32)
+    color[:, :3] = srgb_to_linear(0.5 + SH_C0 * dc)
+    color[:, 3] = opacity
+    return {
+        "co": transform_points(xyz, matrix).astype(np.float32),
+        "color": color,
+        "opacity": opacity.astype(np.float32),
+        "scale": (np.exp(np.minimum(scales, 20.0)) * world_per_unit).astype(np.float32),
+        "rotation": quaternion_euler(rotate_quaternions(matrix_quaternion(matrix), quats)).astype(np.float32),
+    }
+
+def _attribute(mesh, name: str, kind: str, prop: str, values):
+    attr = mesh.attributes.get(name) or mesh.attributes.new(name, kind, "POINT")
+    attr.data.foreach_set(prop, values.ravel())
+
+def build_preview_mesh(name: str, arrays):
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(arrays["co"]))
+    mesh.vertices.foreach_set("co", arrays["co"].ravel())
+    _attribute(mesh, "Col", "FLOAT_COLOR", "color", arrays["color"])
+    _attribute(mesh, "opacity", "FLOAT", "value", arrays["opacity"])
+    _attribute(mesh, "scale", "FLOAT_VECTOR", "vector", arrays["scale"])
+    _attribute(mesh, "rotation", "FLOAT_VECTOR", "vector", arrays["rotation"])
+    mesh.update()
+    return mesh
+
+def _group_socket(tree, name: str, in_out: str, socket_type: str):
+    if hasattr(tree, "interface"):  # Blender 4.0+
+        return tree.interface.new_socket(name, in_out=in_out, socket_type=socket_type)
+    return (tree.inputs if in_out == "INPUT" else tree.outputs).new(socket_type, name)
+
+def _named_attribute(nodes, name: str, data_type: str, location):
+    node = nodes.new("GeometryNodeInputNamedAttribute")
+    node.data_type = data_type
+    node.inputs["Name"].default_value = name
+    node.location = location
+    # Before 4.0 there is one output per data type; only the selected one is enabled.
+    return next(s for s in node.outputs if s.enabled)
+
+def proxy_material():
+    mat = bpy.data.materials.get(NODE_GROUP_NAME) or bpy.data.materials.new(NODE_GROUP_NAME)
+    mat.use_nodes = True
+    if hasattr(mat, "blend_method"):
+        mat.blend_method = "HASHED"
+    nodes, links = mat.node_tree.nodes, mat.node_tree.links
+    nodes.clear()
+    color = nodes.new("ShaderNodeAttribute")
+    color.attribute_type = "INSTANCER"
+    color.attribute_name = "Col"
+    color.location = (-600, 100)
+    alpha = nodes.new("ShaderNodeAttribute")
+    alpha.attribute_type = "INSTANCER"
+    alpha.attribute_name = "opacity"
+    alpha.location = (-600, -150)
+    emission = nodes.new("ShaderNodeEmission")
+    emission.location = (-300, 0)
+    transparent = nodes.new("ShaderNodeBsdfTransparent")
+    transparent.location = (-300, -150)
+    mix = nodes.new("ShaderNodeMixShader")
+    mix.location = (-50, 0)
+    out = nodes.new("ShaderNodeOutputMaterial")
+    out.location = (200, 0)
+    links.new(color.outputs["Color"], emission.inputs["Color"])
+    links.new(alpha.outputs["Fac"], mix.inputs["Fac"])
+    links.new(transparent.outputs["BSDF"], mix.inputs[1])
+    links.new(emission.outputs["Emission"], mix.inputs[2])
+    links.new(mix.outputs["Shader"], out.inputs["Surface"])
+    return mat
+
+def proxy_node_group(material, proxy_scale: float = 1.0, subdivisions: int = 2):
+    # Points -> icosphere instances with per-point rotation (Euler) and scale (world-space sigma).
+    tree = bpy.data.node_groups.get(NODE_GROUP_NAME)
+    if tree is not None:
+        bpy.data.node_groups.remove(tree)
+    tree = bpy.data.node_groups.new(NODE_GROUP_NAME, "GeometryNodeTree")
+    _group_socket(tree, "Geometry", "INPUT", "NodeSocketGeometry")
+    _group_socket(tree, "Proxy Scale", "INPUT", "NodeSocketFloat").default_value = proxy_scale
+    _group_socket(tree, "Geometry", "OUTPUT", "NodeSocketGeometry")
+    nodes, links = tree.nodes, tree.links
+
+    group_in = nodes.new("NodeGroupInput")
+    group_in.location = (-800, 0)
+    ico = nodes.new("GeometryNodeMeshIcoSphere")
+    ico.inputs["Radius"].default_value = 1.0
+    ico.inputs["Subdivisions"].default_value = subdivisions
+    ico.location = (-500, 200)
+    rotation = _named_attribute(nodes, "rotation", "FLOAT_VECTOR", (-500, -100))
+    scale = _named_attribute(nodes, "scale", "FLOAT_VECTOR", (-500, -300))
+    sigma = nodes.new("ShaderNodeVectorMath")
+    sigma.operation = "SCALE"
+    sigma.location = (-300, -300)
+    instance = nodes.new("GeometryNodeInstanceOnPoints")
+    instance.location = (-100, 0)
+    set_material = nodes.new("GeometryNodeSetMaterial")
+    set_material.inputs["Material"].default_value = material
+    set_material.location = (150, 0)
+    group_out = nodes.new("NodeGroupOutput")
+    group_out.location = (400, 0)
+
+    links.new(group_in.outputs[0], instance.inputs["Points"])
+    links.new(ico.outputs["Mesh"], instance.inputs["Instance"])
+    links.new(rotation, instance.inputs["Rotation"])
+    links.new(scale, sigma.inputs[0])
+    links.new(group_in.outputs[1], sigma.inputs["Scale"])
+    links.new(sigma.outputs["Vector"], instance.inputs["Scale"])
+    links.new(instance.outputs["Instances"], set_material.inputs["Geometry"])
+    links.new(set_material.outputs["Geometry"], group_out.inputs[0])
+    return tree
+
+class NSOT_OT_import_splat_preview(bpy.types.Operator):
+    bl_idname = "nsot.import_splat_preview"
+    bl_label = "Import Splat Preview"
+    bl_description = "Loads FINAL_GSPLAT.ply into the scene as points with colour, opacity, scale and rotation attributes, drawn as ellipsoid proxies"
+    bl_options = {"REGISTER", "UNDO"}
+
+    def execute(self, context):
+        p = context.scene.nsot_props
+        path = final_splat_path(p)
+        if not os.path.isfile(path):
+            self.report({"ERROR"}, f"No splat found: {path}")
+            return {"CANCELLED"}
+
+        t0 = time.perf_counter()
+        splat = open_splat(path)
+        n = len(splat)
+        try:
+            to_world = splat_world(p)
+        except FileNotFoundError as exc:
+            # A preview is still useful in the splat's own frame.
+            self.report({"WARNING"}, f"{exc}; previewing in the splat's own frame.")
+            to_world = (np.eye(4), 1.0)
+        arrays = preview_arrays(splat, to_world, float(p.preview_fraction))
+        del splat
+        t1 = time.perf_counter()
+
+        old = bpy.data.objects.get(PREVIEW_NAME)
+        if old is not None:
+            old_mesh = old.data
+            bpy.data.objects.remove(old)
+            if old_mesh is not None and old_mesh.users == 0:
+                bpy.data.meshes.remove(old_mesh)
+        mesh = build_preview_mesh(PREVIEW_NAME, arrays)
+        obj = bpy.data.objects.new(PREVIEW_NAME, mesh)
+        context.collection.objects.link(obj)
+        count = len(arrays["co"])
+        subdivisions = 2 if count <= PROXY_DETAIL_LIMIT else 1
+        mod = obj.modifiers.new("Splat Proxies", "NODES")
+        mod.node_group = proxy_node_group(proxy_material(), float(p.preview_proxy_scale), subdivisions)
+        t2 = time.perf_counter()
+        # Evaluates the modifier, so the instancing cost is part of the reported time (viewport drawing is not).
+        context.evaluated_depsgraph_get()
+        t3 = time.perf_counter()
+
+        triangles = count * ico_triangles(subdivisions)
+        print(f"[NSOT] splat preview {count} of {n} gaussians, {triangles / 1e6:.1f}M proxy triangles: "
+              f"read {t1 - t0:.2f}s, mesh {t2 - t1:.2f}s, geometry nodes {t3 - t2:.2f}s, total {t3 - t0:.2f}s")
+        self.report({"INFO"}, f"Imported {count} of {n} gaussians ({triangles / 1e6:.1f}M triangles) in {t3 - t0:.1f}s")
+        return {"FINISHED"}
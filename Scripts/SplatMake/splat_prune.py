@@ -0,0 +1,134 @@
+# Vectorized pruning of exported splats. No bpy imports.
+# Each criterion is a boolean mask evaluated chunk by chunk over the memory-mapped vertex block, so memory
+# stays bounded however large the file is. Optionally drops the higher SH bands while writing.
+# filter_splat is the shared chunked rewrite; floaters.py feeds it BVH-based masks.
+import os
+import time
+
+import numpy as np
+
+try:
+    from .splat_io import SplatWriter, open_splat
+except ImportError:
+    from splat_io import SplatWriter, open_splat
+
+CHUNK = 1 << 20
+CRITERIA = ("opacity", "max_scale", "min_scale", "distance")
+# Header comments marking files the add-on rewrote; anything else is treated as a raw export.
+DERIVED_PREFIX = "nsot "
+PRUNED_COMMENT = DERIVED_PREFIX + "pruned"
+# Settings measured against the rig's target and radius. COLMAP SfM splats live in an arbitrary frame,
+# so there they would remove arbitrary gaussians.
+WORLD_SETTINGS = ("max_scale_ratio", "min_scale_ratio", "max_distance_ratio")
+
+def without_world_criteria(settings):
+    # Keeps only the frame-independent opacity and SH reduction.
+    return dict(settings, **dict.fromkeys(WORLD_SETTINGS, 0.0))
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+def criterion_masks(block, target, radius: float, min_opacity: float, max_scale_ratio: float, min_scale_ratio: float, max_distance_ratio: float):
+    # {criterion: rows it would remove}. A ratio of 0 disables that criterion.
+    n = len(block)
+    masks = {}
+    masks["opacity"] = _sigmoid(block["opacity"]) < min_opacity if min_opacity > 0.0 else np.zeros(n, bool)
+    log_max = np.maximum(np.maximum(block["scale_0"], block["scale_1"]), block["scale_2"])
+    # Compare in log space: exp() of large trained log-scales overflows float32.
+    masks["max_scale"] = log_max > np.log(max_scale_ratio * radius) if max_scale_ratio > 0.0 else np.zeros(n, bool)
+    masks["min_scale"] = log_max < np.log(min_scale_ratio * radius) if min_scale_ratio > 0.0 else np.zeros(n, bool)
+    if max_distance_ratio > 0.0:
+        d2 = (block["x"] - target[0]) ** 2 + (block["y"] - target[1]) ** 2 + (block["z"] - target[2]) ** 2
+        masks["distance"] = d2 > (max_distance_ratio * radius) ** 2
+    else:
+        masks["distance"] = np.zeros(n, bool)
+    return masks
+
+def sh_field_map(names, sh_degree: int):
+    # [(new, old)] field pairs keeping the first bands of each colour channel. f_rest is channel-major
+    # (all red coefficients, then green, then blue), so the kept fields are renumbered contiguously.
+    per_channel = sum(n.startswith("f_rest_") for n in names) // 3
+    keep = min(per_channel, (sh_degree + 1) ** 2 - 1)
+    mapping = []
+    for name in names:
+        if not name.startswith("f_rest_"):
+            mapping.append((name, name))
+        elif name == "f_rest_0":
+            for c in range(3):
+                for k in range(keep):
+                    mapping.append((f"f_rest_{c * keep + k}", f"f_rest_{c * per_channel + k}"))
+    return mapping
+
+def _write_filtered(splat, path: str, mapping, out_dtype, chunk: int, masks_fn, keys, comment: str):
+    # Kept in its own function so no chunk still references the map when the caller replaces the file.
+    removed = dict.fromkeys(keys, 0)
+    kept = 0
+    comments = [c for c in splat.comments if c != comment] + [comment]
+    with SplatWriter(path, out_dtype, comments) as writer:
+        for s in range(0, len(splat), chunk):
+            block = np.asarray(splat.data[s:s + chunk])
+            drop = np.zeros(len(block), bool)
+            for key, mask in masks_fn(block).items():
+                removed[key] += int(mask.sum())
+                drop |= mask
+            rows = block[~drop]
+            out = np.empty(len(rows), dtype=out_dtype)
+            for new, old in mapping:
+                out[new] = rows[old]
+            writer.write(out)
+            kept += len(rows)
+    return kept, removed
+
+def is_derived(path: str) -> bool:
+    return any(c.startswith(DERIVED_PREFIX) for c in open_splat(path).comments)
+
+def filter_splat(src: str, dst: str, masks_fn, keys, comment: str, sh_degree: int = 3, chunk: int = CHUNK):
+    # Writes the rows of src that no mask in masks_fn(block) -> {key: drop mask} selects to dst (may be
+    # the same path) and returns a report dict.
+    t0 = time.perf_counter()
+    splat = open_splat(src)
+    n = len(splat)
+    src_bytes = os.path.getsize(src)
+    row_bytes = splat.data.dtype.itemsize
+    rest_before = sum(name.startswith("f_rest_") for name in splat.names)
+    mapping = sh_field_map(splat.names, sh_degree)
+    out_dtype = np.dtype([(new, splat.data.dtype.fields[old][0]) for new, old in mapping])
+
+    tmp = dst + ".filter"
+    kept, removed = _write_filtered(splat, tmp, mapping, out_dtype, chunk, masks_fn, keys, comment)
+    del splat  # Windows can't replace a file that is still mapped.
+    os.replace(tmp, dst)
+
+    return {
+        "count_before": n,
+        "count_after": kept,
+        "bytes_before": src_bytes,
+        "bytes_after": os.path.getsize(dst),
+        "row_bytes": row_bytes,
+        "removed": removed,  # per criterion; a gaussian can fail several
+        "sh_fields": (rest_before, sum(new.startswith("f_rest_") for new, _ in mapping)),
+        "seconds": time.perf_counter() - t0,
+    }
+
+def prune_splat(src: str, dst: str, target, radius: float, min_opacity: float = 1.0 / 255.0, max_scale_ratio: float = 0.25,
+                min_scale_ratio: float = 0.0, max_distance_ratio: float = 1.0, sh_degree: int = 3, chunk: int = CHUNK, to_world=None):
+    # target/radius are in Blender world units; to_world (from splat_frame.splat_to_world) maps the splat's
+    # frame into world space, so they are moved into the splat frame instead of transforming every gaussian.
+    if to_world is not None:
+        matrix, world_per_unit = to_world
+        target = (np.linalg.inv(matrix) @ np.append(np.asarray(target, dtype=np.float64), 1.0))[:3]
+        radius = radius / world_per_unit
+    criteria = (target, radius, min_opacity, max_scale_ratio, min_scale_ratio, max_distance_ratio)
+    return filter_splat(src, dst, lambda block: criterion_masks(block, *criteria), CRITERIA, PRUNED_COMMENT, sh_degree, chunk)
+
+def format_prune_report(report) -> str:
+    n0, n1 = report["count_before"], report["count_after"]
+    mb0, mb1 = report["bytes_before"] / 1e6, report["bytes_after"] / 1e6
+    lines = [f"{n0} -> {n1} gaussians ({100.0 * (n0 - n1) / max(1, n0):.1f}% removed), {mb0:.1f} -> {mb1:.1f} MB in {report['seconds']:.2f}s"]
+    before, after = report["sh_fields"]
+    if after < before:
+        lines.append(f"  SH coefficients {before} -> {after} per gaussian")
+    for key, count in report["removed"].items():
+        if count:
+            lines.append(f"  {key:<10} {count} ({100.0 * count / max(1, n0):.1f}%, {count * report['row_bytes'] / 1e6:.1f} MB)")
+    return "\n".join(lines)
@@ -0,0 +1,119 @@
+# Dataset staging: mirrors images/ (and pyramid/mask folders) into colmap_data/ with hardlinks or
+# symlinks where the filesystem allows, copying only as a last resort. No bpy imports: the orchestrator
+# loads this module directly from the output folder. Only dataset images are staged; render_manifest.json
+# and partially written *.tmp files stay behind, so COLMAP and nerfstudio never see them.
+import os
+import shutil
+
+STAGING_MODES = ("AUTO", "HARDLINK", "SYMLINK", "COPY")
+PARTIAL_EXT = ".tmp"
+
+class StagingStats:
+    def __init__(self):
+        self.linked = 0
+        self.symlinked = 0
+        self.copied = 0
+        self.unchanged = 0
+        self.removed = 0
+        self.bytes_linked = 0
+        self.bytes_copied = 0
+
+    def add(self, other):
+        for key, value in vars(other).items():
+            setattr(self, key, getattr(self, key) + value)
+
+    def summary(self) -> str:
+        mb = 1024 * 1024
+        return (
+            f"linked={self.linked + self.symlinked} ({self.bytes_linked / mb:.1f} MB) "
+            f"copied={self.copied} ({self.bytes_copied / mb:.1f} MB) "
+            f"unchanged={self.unchanged} removed={self.removed}"
+        )
+
+def _up_to_date(src: str, dst: str, src_stat) -> bool:
+    try:
+        if os.path.islink(dst):
+            return os.path.realpath(dst) == os.path.realpath(src)
+        dst_stat = os.stat(dst)
+    except OSError:
+        return False
+    if (dst_stat.st_dev, dst_stat.st_ino) == (src_stat.st_dev, src_stat.st_ino):
+        return True  # Hardlink to the current file; a re-render replaces src with a new inode.
+    return dst_stat.st_size == src_stat.st_size and dst_stat.st_mtime_ns == src_stat.st_mtime_ns
+
+def _remove(path: str):
+    if os.path.lexists(path):
+        os.remove(path)
+
+def stage_file(src: str, dst: str, mode: str = "AUTO") -> str:
+    # Returns how the file was staged: "hardlink", "symlink" or "copy".
+    _remove(dst)
+    if mode in ("AUTO", "HARDLINK"):
+        try:
+            os.link(src, dst)
+            return "hardlink"
+        except OSError:
+            if mode == "HARDLINK":
+                raise
+    if mode in ("AUTO", "SYMLINK"):
+        try:
+            os.symlink(os.path.abspath(src), dst)
+            return "symlink"
+        except OSError:  # Windows without developer mode, or FAT/exFAT volumes.
+            if mode == "SYMLINK":
+                raise
+    tmp = dst + ".tmp"
+    shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+    return "copy"
+
+def is_staged(name: str, extensions=None) -> bool:
+    # extensions: lower-case suffixes such as ".png"; None stages every finished file.
+    ext = os.path.splitext(name)[1].lower()
+    if ext == PARTIAL_EXT:
+        return False
+    return extensions is None or ext in extensions
+
+def stage_dir(src: str, dst: str, mode: str = "AUTO", extensions=None) -> StagingStats:
+    # Incremental mirror: only new or changed files are (re)linked, and files missing from src
+    # (or no longer matching extensions) are removed.
+    stats = StagingStats()
+    os.makedirs(dst, exist_ok=True)
+    wanted = set()
+    with os.scandir(src) as it:
+        for entry in it:
+            if not entry.is_file() or not is_staged(entry.name, extensions):
+                continue
+            wanted.add(entry.name)
+            target = os.path.join(dst, entry.name)
+            st = entry.stat()
+            if _up_to_date(entry.path, target, st):
+                stats.unchanged += 1
+                continue
+            how = stage_file(entry.path, target, mode)
+            if how == "copy":
+                stats.copied += 1
+                stats.bytes_copied += st.st_size
+            else:
+                stats.linked += how == "hardlink"
+                stats.symlinked += how == "symlink"
+                stats.bytes_linked += st.st_size
+    with os.scandir(dst) as it:
+        for entry in it:
+            if entry.name not in wanted and (entry.is_file(follow_symlinks=False) or entry.is_symlink()):
+                os.remove(entry.path)
+                stats.removed += 1
+    return stats
+
+def stage_dataset(out_root: str, dataset: str, dirs, mode: str = "AUTO", log=None, extensions=None) -> StagingStats:
+    # Stages every existing folder in dirs from out_root into out_root/dataset.
+    total = StagingStats()
+    for name in dirs:
+        src = os.path.join(out_root, name)
+        if not os.path.isdir(src):
+            continue
+        stats = stage_dir(src, os.path.join(out_root, dataset, name), mode, extensions)
+        if log is not None:
+            log(f"{name}: {stats.summary()}")
+        total.add(stats)
+    return total
@@ -0,0 +1,243 @@
+import bpy
+import os
+import re
+import json
+import time
+
+import numpy as np
+
+STATS_NAME = "render_stats.jsonl"
+
+PHASES = ("sync", "trace", "denoise", "composite", "encode", "pyramid", "other")
+
+_PEAK_RE = re.compile(r"Peak:?\s*([\d.]+)\s*([KMG])", re.IGNORECASE)
+_MEM_RE = re.compile(r"Mem:?\s*([\d.]+)\s*([KMG])", re.IGNORECASE)
+_SAMPLE_RE = re.compile(r"Sample\s+(\d+)\s*/\s*(\d+)")
+_UNIT_MB = {"K": 1.0 / 1024.0, "M": 1.0, "G": 1024.0}
+
+def classify_phase(stats: str) -> str:
+    # Engine status segments ("Synchronizing object | Cube", "Sample 12/128", "Denoising") name the current phase.
+    status = stats.lower()
+    if "denois" in status:
+        return "denoise"
+    if "composit" in status:
+        return "composite"
+    if "sample" in status or "path tracing" in status:
+        return "trace"
+    if "sync" in status or "updating" in status or "loading" in status or "building" in status:
+        return "sync"
+    if "rendering" in status:
+        return "trace"
+    return "other"
+
+def parse_memory_mb(stats: str) -> float:
+    m = _PEAK_RE.search(stats) or _MEM_RE.search(stats)
+    if m is None:
+        return 0.0
+    return float(m.group(1)) * _UNIT_MB[m.group(2).upper()]
+
+class RenderTelemetry:
+    # Times each render through the render_pre/stats/post/write handlers and appends one JSON line per image.
+    def __init__(self, out_root: str, image_format: str = "PNG"):
+        self.path = os.path.join(out_root, STATS_NAME)
+        self.image_format = image_format
+        self.records = []
+        self._reset()
+
+    def _reset(self):
+        self.t_pre = None
+        self.t_post = None
+        self.t_write = None
+        self.phase = None
+        self.t_phase = None
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.peak_mb = 0.0
+        self.samples = 0
+
+    def start(self):
+        handlers = bpy.app.handlers
+        handlers.render_pre.append(self.on_pre)
+        handlers.render_stats.append(self.on_stats)
+        handlers.render_post.append(self.on_post)
+        handlers.render_write.append(self.on_write)
+
+    def stop(self):
+        handlers = bpy.app.handlers
+        for handler_list, fn in (
+            (handlers.render_pre, self.on_pre),
+            (handlers.render_stats, self.on_stats),
+            (handlers.render_post, self.on_post),
+            (handlers.render_write, self.on_write),
+        ):
+            if fn in handler_list:
+                handler_list.remove(fn)
+
+    def _close_phase(self, now: float):
+        if self.phase is not None:
+            self.phases[self.phase] += now - self.t_phase
+        self.t_phase = now
+
+    def on_pre(self, *_):
+        self._reset()
+        self.t_pre = time.perf_counter()
+        self.phase = "sync"
+        self.t_phase = self.t_pre
+
+    def on_stats(self, stats, *_):
+        if self.t_pre is None:
+            return
+        phase = classify_phase(stats)
+        if phase != self.phase:
+            self._close_phase(time.perf_counter())
+            self.phase = phase
+        self.peak_mb = max(self.peak_mb, parse_memory_mb(stats))
+        m = _SAMPLE_RE.search(stats)
+        if m:
+            self.samples = max(self.samples, int(m.group(1)))
+
+    def on_post(self, *_):
+        if self.t_pre is None:
+            return
+        self.t_post = time.perf_counter()
+        self._close_phase(self.t_post)
+        self.phase = None
+
+    def on_write(self, *_):
+        if self.t_post is not None:
+            self.t_write = time.perf_counter()
+
+    def image_rendered(self, camera: str, layer: int):
+        # Closes the timing of the render that just finished; the record is completed by image_written().
+        if self.t_pre is None:
+            return None
+        now = time.perf_counter()
+        if self.t_post is None:
+            self.t_post = now
+            self._close_phase(now)
+        self.phases["encode"] += (self.t_write or now) - self.t_post
+
+        record = {
+            "camera": camera,
+            "layer": int(layer),
+            "format": self.image_format,
+            "wall_s": round((self.t_write or now) - self.t_pre, 4),
+            "phases_s": {k: round(v, 4) for k, v in self.phases.items() if v > 0.0},
+            "peak_mem_mb": round(self.peak_mb, 2),
+            "samples": self.samples,
+            "time": time.time(),
+        }
+        self._reset()
+        return record
+
+    def image_written(self, record, image_path: str, encode_stats=None):
+        # encode_stats comes from the background encoder: its time replaces the (intermediate) write time.
+        if record is None:
+            return None
+        record["file"] = os.path.basename(image_path)
+        if encode_stats is not None:
+            record["phases_s"]["encode"] = round(encode_stats["encode_s"], 4)
+            record["bytes"] = encode_stats["bytes"] + encode_stats["mask_bytes"]
+            if encode_stats.get("pyramid_s"):
+                record["phases_s"]["pyramid"] = round(encode_stats["pyramid_s"], 4)
+                record["pyramid_bytes"] = encode_stats["pyramid_bytes"]
+        else:
+            record["bytes"] = os.path.getsize(image_path) if os.path.isfile(image_path) else 0
+        self.records.append(record)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+        return record
+
+def load_stats(out_root: str):
+    path = os.path.join(out_root, STATS_NAME)
+    if not os.path.isfile(path):
+        return []
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue  # Partial last line from an interrupted render.
+    return records
+
+def summarize(records, slowest: int = 3):
+    if not records:
+        return None
+    wall = np.array([r["wall_s"] for r in records], dtype=np.float64)
+    phase_totals = {k: float(sum(r["phases_s"].get(k, 0.0) for r in records)) for k in PHASES}
+    total_phase = sum(phase_totals.values())
+
+    by_layer = {}
+    for r in records:
+        by_layer.setdefault(r["layer"], []).append(r)
+    slowest_by_layer = {
+        layer: [(r["camera"], r["wall_s"]) for r in sorted(rs, key=lambda r: r["wall_s"], reverse=True)[:slowest]]
+        for layer, rs in sorted(by_layer.items())
+    }
+
+    by_format = {}
+    for r in records:
+        by_format.setdefault(r.get("format", "PNG"), []).append(r)
+    formats = {
+        fmt: {
+            "images": len(rs),
+            "mean_bytes": float(np.mean([r["bytes"] for r in rs])),
+            "mean_encode_s": float(np.mean([r["phases_s"].get("encode", 0.0) for r in rs])),
+        }
+        for fmt, rs in sorted(by_format.items())
+    }
+
+    return {
+        "images": len(records),
+        "p50_s": float(np.percentile(wall, 50)),
+        "p95_s": float(np.percentile(wall, 95)),
+        "mean_s": float(wall.mean()),
+        "images_per_hour": 3600.0 / float(wall.mean()) if wall.mean() > 0.0 else 0.0,
+        "mean_bytes": float(np.mean([r["bytes"] for r in records])),
+        "peak_mem_mb": float(max(r["peak_mem_mb"] for r in records)),
+        "phase_share": {k: v / total_phase for k, v in phase_totals.items() if v > 0.0} if total_phase > 0.0 else {},
+        "slowest_by_layer": slowest_by_layer,
+        "formats": formats,
+    }
+
+def format_summary(summary) -> str:
+    lines = [
+        f"{summary['images']} images: p50 {summary['p50_s']:.2f}s, p95 {summary['p95_s']:.2f}s, "
+        f"{summary['images_per_hour']:.0f} img/h, {summary['mean_bytes'] / 1e6:.2f} MB avg, peak mem {summary['peak_mem_mb']:.0f} MB",
+        "Phases: " + ", ".join(f"{k} {v:.0%}" for k, v in summary["phase_share"].items()),
+    ]
+    for fmt, stats in summary.get("formats", {}).items():
+        lines.append(f"Format {fmt}: {stats['images']} images, {stats['mean_bytes'] / 1e6:.2f} MB avg, encode {stats['mean_encode_s']:.3f}s avg")
+    for layer, cams in summary["slowest_by_layer"].items():
+        lines.append(f"Layer {layer} slowest: " + ", ".join(f"{name} {t:.2f}s" for name, t in cams))
+    return "\n".join(lines)
+
+def store_summary(p, summary):
+    p.stats_p50 = summary["p50_s"]
+    p.stats_p95 = summary["p95_s"]
+    p.stats_images_per_hour = summary["images_per_hour"]
+
+class NSOT_OT_render_stats(bpy.types.Operator):
+    bl_idname = "nsot.render_stats"
+    bl_label = "Render Stats Summary"
+    bl_description = "Summarizes render_stats.jsonl in output_dir: p50/p95 per image, images/hour, phase breakdown and slowest cameras by layer"
+    bl_options = {"REGISTER"}
+
+    def execute(self, context):
+        p = context.scene.nsot_props
+        if not p.output_dir:
+            self.report({"ERROR"}, "Output Directory is empty.")
+            return {"CANCELLED"}
+
+        summary = summarize(load_stats(bpy.path.abspath(p.output_dir)))
+        if summary is None:
+            self.report({"WARNING"}, f"No {STATS_NAME} records in output_dir. Render with telemetry enabled first.")
+            return {"CANCELLED"}
+
+        store_summary(p, summary)
+        text = format_summary(summary)
+        print(text)
+        self.report({"INFO"}, text.splitlines()[0])
+        return {"FINISHED"}
@@ -0,0 +1,56 @@
+import bpy
+import os
+
+from .utils import ensure_dir, pyramid_factors
+from .rig import view_resolutions
+from .transforms_json import build_transforms, write_transforms
+from .cameras import dataset_rig
+from .seed_points import mesh_seed_points, write_points_ply
+
+def write_dataset_transforms(p, out_root: str, context):
+    rig = dataset_rig(p)
+    if not rig.names:
+        return None
+
+    ensure_dir(out_root)
+    ply_file_path = ""
+    seed = mesh_seed_points(p, context)
+    if seed is not None:
+        ply_file_path = "sparse_pc.ply"
+        write_points_ply(os.path.join(out_root, ply_file_path), *seed)
+
+    path = os.path.join(out_root, "transforms.json")
+    data = build_transforms(
+        rig,
+        p.res_x,
+        p.res_y,
+        p.focal_mm,
+        p.sensor_width_mm,
+        ply_file_path=ply_file_path,
+        resolutions=view_resolutions(p, rig.layers),
+        image_format=p.image_format,
+        downscale_factors=pyramid_factors(p.pyramid_levels),
+    )
+    write_transforms(path, data)
+    return path, len(rig.names)
+
+class NSOT_OT_write_transforms(bpy.types.Operator):
+    bl_idname = "nsot.write_transforms"
+    bl_label = "Write transforms.json"
+    bl_description = "Writes a nerfstudio transforms.json into output_dir directly from the rig poses and render settings"
+    bl_options = {"REGISTER"}
+
+    def execute(self, context):
+        p = context.scene.nsot_props
+        if not p.output_dir:
+            self.report({"ERROR"}, "Output Directory is empty.")
+            return {"CANCELLED"}
+
+        result = write_dataset_transforms(p, bpy.path.abspath(p.output_dir), context)
+        if result is None:
+            self.report({"ERROR"}, f"No rig cameras found for prefix '{p.name_prefix}'.")
+            return {"CANCELLED"}
+
+        path, count = result
+        self.report({"INFO"}, f"Wrote transforms.json with {count} frames: {path}")
+        return {"FINISHED"}
@@ -0,0 +1,70 @@
+# nerfstudio transforms.json building and reading. No bpy imports, so the format can be checked outside Blender.
+import os
+import json
+
+import numpy as np
+
+try:
+    from .utils import MASK_DIR, image_filename, mask_filename
+    from .rig import Rig, pixel_intrinsics
+except ImportError:
+    from utils import MASK_DIR, image_filename, mask_filename
+    from rig import Rig, pixel_intrinsics
+
+INTRINSIC_KEYS = ("camera_model", "w", "h", "fl_x", "fl_y", "cx", "cy", "k1", "k2", "p1", "p2")
+
+def build_transforms(rig, res_x: int, res_y: int, focal_mm: float, sensor_width_mm: float, image_dir: str = "images", ply_file_path: str = "", resolutions=None, image_format: str = "PNG", downscale_factors=()):
+    fx, fy, cx, cy = pixel_intrinsics(focal_mm, sensor_width_mm, res_x, res_y)
+    # nerfstudio's transform_matrix is camera-to-world in the OpenGL convention, which is Blender's camera convention.
+    frames = [
+        {"file_path": f"{image_dir}/{image_filename(name, image_format)}", "transform_matrix": mw.tolist()}
+        for name, mw in zip(rig.names, rig.matrices)
+    ]
+    if image_format == "JPEG":
+        # JPEG has no alpha; the encoder writes it as a separate 8-bit mask that nerfstudio honours per frame.
+        for frame, name in zip(frames, rig.names):
+            frame["mask_path"] = f"{MASK_DIR}/{mask_filename(name)}"
+    if resolutions is not None:
+        # Per-frame intrinsics override the shared ones for views rendered at a different resolution.
+        for frame, (w, h) in zip(frames, np.asarray(resolutions).tolist()):
+            if (w, h) != (res_x, res_y):
+                ffx, ffy, fcx, fcy = pixel_intrinsics(focal_mm, sensor_width_mm, w, h)
+                frame.update({"w": int(w), "h": int(h), "fl_x": ffx, "fl_y": ffy, "cx": fcx, "cy": fcy})
+    data = {
+        "camera_model": "OPENCV",
+        "w": int(res_x),
+        "h": int(res_y),
+        "fl_x": fx,
+        "fl_y": fy,
+        "cx": cx,
+        "cy": cy,
+        "k1": 0.0,
+        "k2": 0.0,
+        "p1": 0.0,
+        "p2": 0.0,
+        "frames": frames,
+    }
+    if ply_file_path:
+        data["ply_file_path"] = ply_file_path
+    if downscale_factors:
+        # Informational: images_N/ (and masks_N/) were written at render time, so --downscale-factor N needs no resize pass.
+        data["downscale_factors"] = [int(f) for f in downscale_factors]
+    return data
+
+def write_transforms(path: str, data: dict):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+def read_transforms(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    names = [os.path.splitext(os.path.basename(fr["file_path"]))[0] for fr in data["frames"]]
+    matrices = np.array([fr["transform_matrix"] for fr in data["frames"]], dtype=np.float64).reshape(-1, 4, 4)
+    rig = Rig(names, np.zeros(len(names), dtype=np.int32), matrices[:, :3, 3].copy(), matrices)
+    intrinsics = {k: data[k] for k in INTRINSIC_KEYS}
+    # Per frame: the keys that override the shared intrinsics, plus mask_path when present.
+    overrides = [{k: fr[k] for k in INTRINSIC_KEYS + ("mask_path",) if k in fr} for fr in data["frames"]]
+    return rig, intrinsics, overrides
@@ -1,4 +1,7 @@
 import bpy
+import time
+
+from .pipeline_monitor import current_monitor, format_elapsed
 
 class NSOT_PT_panel(bpy.types.Panel):
     bl_label = "Nerfstudio Export"
@@ -12,6 +15,7 @@ class NSOT_PT_panel(bpy.types.Panel):
         p = context.scene.nsot_props
 
         layout.prop(p, "output_dir")
+        layout.prop(p, "source_object")
         layout.prop(p, "collection_name")
         layout.prop(p, "name_prefix")
 
@@ -19,6 +23,20 @@ class NSOT_PT_panel(bpy.types.Panel):
         layout.label(text="Spherical Rig")
         layout.prop(p, "radius")
         layout.prop(p, "max_dist")
+        layout.prop(p, "rig_sampler")
+        if p.rig_sampler != "RINGS":
+            layout.prop(p, "use_camera_count")
+            if p.use_camera_count:
+                layout.prop(p, "cameras_per_layer")
+            if p.rig_sampler == "BLUE_NOISE":
+                layout.prop(p, "sampler_seed")
+        layout.prop(p, "use_coverage_optimizer")
+        if p.use_coverage_optimizer:
+            col = layout.column(align=True)
+            col.prop(p, "coverage_target")
+            col.prop(p, "coverage_min_views")
+            col.prop(p, "coverage_patches")
+            col.prop(p, "coverage_candidate_factor")
 
         layout.separator()
         layout.label(text="Radius Layers")
@@ -28,7 +46,24 @@ class NSOT_PT_panel(bpy.types.Panel):
             layout.prop(p, "layer_count")
             layer_count = int(p.layer_count)
             for i in range(1, layer_count + 1):
-                layout.prop(p, f"layer_scale_{i:02d}")
+                if p.use_layer_resolution:
+                    row = layout.row(align=True)
+                    row.prop(p, f"layer_scale_{i:02d}")
+                    row.prop(p, f"layer_res_scale_{i:02d}", text="Res")
+                else:
+                    layout.prop(p, f"layer_scale_{i:02d}")
+        layout.prop(p, "use_layer_resolution")
+
+        layout.separator()
+        layout.label(text="Auto-Framing")
+        col = layout.column(align=True)
+        col.prop(p, "fit_fill_outer")
+        if p.use_radius_layers:
+            col.prop(p, "fit_fill_inner")
+        col.prop(p, "fit_clearance")
+        if p.use_layer_resolution:
+            col.prop(p, "fit_detail_pixels")
+        layout.operator("nsot.fit_to_selection", text="Fit Rig to Selection", icon="VIEW_ZOOM")
 
         layout.separator()
         layout.label(text="Look At Target")
@@ -50,34 +85,144 @@ class NSOT_PT_panel(bpy.types.Panel):
         layout.prop(p, "sensor_width_mm")
         layout.prop(p, "clip_start")
         layout.prop(p, "clip_end")
+        layout.prop(p, "share_camera_data")
 
         layout.separator()
         layout.label(text="Render")
         layout.prop(p, "engine")
+        layout.prop(p, "render_mode")
+        layout.prop(p, "use_render_manifest")
+        if p.use_render_manifest:
+            layout.prop(p, "remove_orphans")
+        layout.prop(p, "use_render_telemetry")
         layout.prop(p, "res_x")
         layout.prop(p, "res_y")
-        layout.prop(p, "png_compression")
+        layout.prop(p, "image_format")
+        if p.image_format == "PNG":
+            layout.prop(p, "png_compression")
+            layout.prop(p, "async_encode")
+        else:
+            layout.prop(p, "image_quality")
+        layout.prop(p, "pyramid_levels")
+        if p.async_encode or p.image_format != "PNG" or p.pyramid_levels > 0:
+            layout.prop(p, "encode_threads")
         if p.engine == "CYCLES":
             layout.prop(p, "cycles_samples")
             layout.prop(p, "cycles_denoise")
         layout.prop(p, "film_transparent")
+        layout.prop(p, "crop_mode")
+        if p.crop_mode != "OFF":
+            layout.prop(p, "crop_padding_px")
+            if not p.film_transparent or p.source_object is None:
+                layout.label(text="Auto-crop needs Transparent Film and a Source Object", icon="ERROR")
 
         layout.separator()
         layout.label(text="Progress")
         if p.is_rendering:
             layout.label(text=f"Rendering: {p.progress_current} / {p.progress_total}")
+            if p.render_rate > 0.0:
+                eta_min, eta_sec = divmod(int(p.render_eta), 60)
+                layout.label(text=f"{p.render_rate:.2f} img/s, ETA {eta_min}m {eta_sec:02d}s")
+            if p.render_mode == "VIRTUAL":
+                layout.label(text="Press Esc in the render window to cancel")
+            else:
+                row = layout.row(align=True)
+                if p.render_paused:
+                    row.operator("nsot.render_control", text="Resume", icon="PLAY").action = "RESUME"
+                else:
+                    row.operator("nsot.render_control", text="Pause", icon="PAUSE").action = "PAUSE"
+                row.operator("nsot.render_control", text="Cancel", icon="CANCEL").action = "CANCEL"
         elif p.progress_total > 0:
             layout.label(text=f"Last Render: {p.progress_total} images")
+        if not p.is_rendering and p.stats_images_per_hour > 0.0:
+            layout.label(text=f"p50 {p.stats_p50:.2f}s, p95 {p.stats_p95:.2f}s, {p.stats_images_per_hour:.0f} img/h")
 
         layout.separator()
         layout.operator("nsot.create_cameras", text="Create Cameras", icon="CAMERA_DATA")
         layout.operator("nsot.export_dataset", text="Render Images", icon="RENDER_STILL")
+        layout.operator("nsot.verify_dataset", text="Verify Dataset", icon="CHECKMARK")
+        layout.operator("nsot.render_stats", text="Render Stats Summary", icon="SORTTIME")
+
+        layout.separator()
+        layout.label(text="Sharded Render")
+        col = layout.column(align=True)
+        col.prop(p, "shard_count")
+        col.prop(p, "shard_threads")
+        col.prop(p, "shard_retries")
+        layout.operator("nsot.render_sharded", text="Render Sharded", icon="RENDERLAYERS")
 
         layout.separator()
         layout.label(text="Pipeline (External)")
+        layout.prop(p, "pipeline_backend")
         layout.prop(p, "conda_bat")
         layout.prop(p, "conda_env")
+        layout.prop(p, "staging_mode")
+        layout.prop(p, "pipeline_mode")
+        if p.pipeline_mode != "SFM":
+            layout.prop(p, "seed_point_count")
+        else:
+            layout.prop(p, "matcher")
+            if p.matcher == "POSE_PAIRS":
+                layout.prop(p, "pair_neighbors")
+                layout.prop(p, "pair_max_angle")
+                layout.prop(p, "pair_max_scale_ratio")
         layout.prop(p, "max_num_iterations")
         layout.prop(p, "open_viewer")
         layout.operator("nsot.write_pipeline_bat", text="Get Splat(COLMAP + Splat + Export)", icon="FILE_SCRIPT")
         layout.operator("nsot.write_export_bat", text="Export Latest", icon="EXPORT")
+        if p.pipeline_backend == "PYTHON":
+            layout.operator("nsot.pipeline_plan", text="Show Pipeline Plan", icon="VIEWZOOM")
+
+        monitor = current_monitor()
+        if monitor is not None:
+            progress = monitor.progress
+            now = time.monotonic()
+            box = layout.box()
+            box.label(text=f"{monitor.label}: {progress.state.title()}", icon="ERROR" if progress.state == "FAILED" else "TIME")
+            for stage in progress.stages:
+                box.label(text=f"{stage.name}: {format_elapsed(stage.elapsed(now))} {'' if stage.status == 'RUN' else stage.status.lower()}")
+            if progress.current is not None and progress.detail:
+                box.label(text=progress.detail)
+                rate = progress.throughput(now)
+                if progress.total and rate > 0.0:
+                    box.label(text=f"{progress.fraction():.0%}, {rate:.2f} {progress.unit}/s")
+            if progress.error:
+                box.label(text=progress.error)
+            if monitor.returncode is None:
+                box.operator("nsot.pipeline_cancel", text="Cancel Pipeline", icon="CANCEL")
+
+        layout.operator("nsot.write_colmap_model", text="Write COLMAP Model (Known Poses)", icon="OUTLINER_OB_CAMERA")
+        layout.operator("nsot.write_transforms", text="Write transforms.json", icon="FILE_TEXT")
+        layout.operator("nsot.write_seed_points", text="Write Seed Point Cloud", icon="OUTLINER_OB_POINTCLOUD")
+        layout.operator("nsot.write_pairs", text="Write Pair List", icon="LINKED")
+
+        layout.separator()
+        layout.label(text="Splat Post-Processing")
+        layout.prop(p, "use_prune")
+        col = layout.column(align=True)
+        col.prop(p, "prune_min_opacity")
+        sub = col.column(align=True)
+        sub.active = p.pipeline_mode != "SFM"  # not in world space, so ignored
+        sub.prop(p, "prune_max_scale")
+        sub.prop(p, "prune_min_scale")
+        sub.prop(p, "prune_max_distance")
+        col.prop(p, "prune_sh_degree")
+        layout.operator("nsot.prune_splat", text="Prune Splat", icon="BRUSH_DATA")
+        col = layout.column(align=True)
+        col.prop(p, "floater_epsilon")
+        col.prop(p, "floater_size_factor")
+        layout.prop(p, "floater_action")
+        layout.operator("nsot.remove_floaters", text="Remove Floaters", icon="MOD_SHRINKWRAP")
+        row = layout.row(align=True)
+        row.prop(p, "export_dot_splat")
+        row.prop(p, "export_nspz")
+        if p.export_nspz:
+            col = layout.column(align=True)
+            col.prop(p, "nspz_position_bits")
+            col.prop(p, "nspz_sh_degree")
+            col.prop(p, "nspz_sh_mode")
+        layout.operator("nsot.compress_splat", text="Compress Splat", icon="PACKAGE")
+        col = layout.column(align=True)
+        col.prop(p, "preview_fraction")
+        col.prop(p, "preview_proxy_scale")
+        layout.operator("nsot.import_splat_preview", text="Import Splat Preview", icon="IMPORT")
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The bpy-free add-on modules are imported directly, as the orchestrator does, since the package
+# __init__ needs Blender.
+ADDON_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Scripts", "SplatMake")
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+sys.path.insert(0, ADDON_DIR)
@@ -0,0 +1,94 @@
+import os
+
+from conftest import FIXTURES
+from log_parser import PipelineProgress
+
+def replay(name, progress=None):
+    # One second per line, like log_parser.main.
+    progress = progress or PipelineProgress()
+    with open(os.path.join(FIXTURES, "logs", name), "r", encoding="utf-8") as f:
+        for t, line in enumerate(f):
+            progress.feed(line, now=float(t))
+    return progress
+
+def stage_names(progress):
+    return [(s.name, s.status) for s in progress.stages]
+
+def test_colmap_stages_and_counts():
+    seen = []
+    progress = PipelineProgress()
+    with open(os.path.join(FIXTURES, "logs", "synthetic_colmap_sfm.log"), "r", encoding="utf-8") as f:
+        for t, line in enumerate(f):
+            progress.feed(line, now=float(t))
+            if progress.current is not None and progress.detail and (not seen or seen[-1] != (progress.current.name, progress.detail)):
+                seen.append((progress.current.name, progress.detail))
+
+    assert stage_names(progress) == [("stage_images", "DONE"), ("feature_extraction", "DONE"), ("matching", "DONE"), ("mapping", "DONE")]
+    assert progress.image_count == 4
+    assert [d for s, d in seen if s == "feature_extraction"] == [f"features {i}/4 images" for i in range(1, 5)]
+    # Exhaustive matching reports [block i/n, j/k]; the parser flattens it to n*k blocks.
+    assert [d for s, d in seen if s == "matching"] == [f"matching block {i}/4" for i in range(1, 5)]
+    # The initial pair is not announced as "Registering", so counting starts at image 3.
+    assert [d for s, d in seen if s == "mapping"] == ["registered 3/4 images", "registered 4/4 images"]
+    assert (progress.done, progress.total) == (4, 4)
+    assert progress.state == "RUNNING"
+
+def test_ns_process_data_output_is_not_mistaken_for_steps():
+    progress = replay("synthetic_ns_process_data.log")
+    # Rich's "[10:01:07]" timestamps must not look like BAT "[N]" step headers.
+    assert stage_names(progress) == [("process_data", "DONE")]
+    assert progress.detail == ""
+    assert not progress.exported
+
+def test_ns_train_step_eta_and_export():
+    progress = PipelineProgress()
+    rows = []
+    with open(os.path.join(FIXTURES, "logs", "synthetic_ns_train.log"), "r", encoding="utf-8") as f:
+        for t, line in enumerate(f):
+            progress.feed(line, now=float(t))
+            if progress.train_step and (not rows or rows[-1][0] != progress.train_step):
+                rows.append((progress.train_step, progress.train_eta, progress.train_rate))
+
+    assert rows == [
+        (100, "26 m, 3 s", "80.56 M"),
+        (200, "24 m, 45 s", "81.02 M"),
+        (300, "23 m, 41 s", "82.49 M"),
+        (29999, "0 ms", "96.12 M"),
+    ]
+    assert stage_names(progress) == [("train", "DONE"), ("export", "DONE"), ("copy_final", "DONE")]
+    assert progress.exported
+    assert progress.state == "DONE"
+
+def test_train_fraction_mid_run():
+    progress = PipelineProgress()
+    progress.feed("[nsot] stage=train status=RUN", now=0.0)
+    progress.feed("300 (1.00%)         48.907 ms            23 m, 41 s           82.49 M", now=10.0)
+    assert progress.fraction() == 0.01
+    assert progress.unit == "steps"
+    assert progress.throughput(now=10.0) == 30.0  # 300 steps in 10 s
+
+def test_orchestrator_fake_tools_capture():
+    seen = []
+    progress = PipelineProgress()
+    with open(os.path.join(FIXTURES, "logs", "orchestrator_fake_tools.log"), "r", encoding="utf-8") as f:
+        for t, line in enumerate(f):
+            progress.feed(line, now=float(t))
+            if progress.train_step and (not seen or seen[-1] != progress.train_step):
+                seen.append(progress.train_step)
+
+    # The plan lines ("plan=RUN") are not status transitions.
+    assert stage_names(progress) == [(name, "DONE") for name in (
+        "stage_images", "feature_extraction", "matching", "mapping", "process_data", "train", "export", "copy_final")]
+    assert seen == [7500, 15000, 22500]
+    assert progress.exported
+    assert progress.state == "DONE"
+
+def test_failure_and_full_replay():
+    progress = replay("synthetic_colmap_sfm.log")
+    replay("synthetic_ns_process_data.log", progress)
+    progress.feed("[nsot] stage=train status=RUN", now=200.0)
+    progress.feed("[nsot] stage=train status=FAIL error=CUDA out of memory", now=230.0)
+    assert progress.state == "FAILED"
+    assert progress.error == "CUDA out of memory"
+    assert stage_names(progress)[-1] == ("train", "FAIL")
+    assert progress.stages[-1].elapsed(now=999.0) == 30.0
@@ -0,0 +1,113 @@
+import json
+import os
+import re
+
+import pytest
+
+import orchestrator
+
+SFM_STAGES = ["stage_images", "feature_extraction", "matching", "mapping", "process_data", "train", "export", "copy_final", "prune"]
+PRUNE = {"target": [0.0, 0.0, 0.0], "radius": 1.0, "min_opacity": 0.004, "max_scale_ratio": 0.25, "min_scale_ratio": 0.0,
+         "max_distance_ratio": 1.0, "sh_degree": 0}
+
+def write_image(root, name: str, payload: bytes = b"png"):
+    with open(os.path.join(root, "images", name), "wb") as f:
+        f.write(payload)
+
+@pytest.fixture
+def dataset(tmp_path):
+    root = str(tmp_path)
+    os.makedirs(os.path.join(root, "images"))
+    for k in range(3):
+        write_image(root, f"CAM_L00_{k:03d}.png")
+    with open(os.path.join(root, "images", "render_manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({"images": {}}, f)
+    with open(os.path.join(root, "pairs.txt"), "w", encoding="utf-8") as f:
+        f.write("CAM_L00_000.png CAM_L00_001.png\n")
+    config = {
+        "dataset": "colmap_data",
+        "mode": "SFM",
+        "matcher": "POSE_PAIRS",
+        "max_iters": 100,
+        "stage_dirs": ["images"],
+        "stage_extensions": [".jpg", ".png", ".webp"],
+        "prune": PRUNE,
+        "compress": {"formats": []},
+    }
+    config_path = os.path.join(root, "pipeline.json")
+    with open(config_path, "w", encoding="utf-8") as f:
+        json.dump(config, f)
+    return root, config_path
+
+def run(capsys, config_path, *args):
+    # Returns (exit code, {stage: "RUN" | "SKIP"}) from the plan lines.
+    code = orchestrator.main([config_path, "--fake-tools", *args])
+    out = capsys.readouterr().out
+    return code, dict(re.findall(r"stage=(\w+) plan=(RUN|SKIP)", out))
+
+def load_state(root):
+    with open(os.path.join(root, orchestrator.STATE_DIR, orchestrator.STATE_NAME), "r", encoding="utf-8") as f:
+        return json.load(f)["stages"]
+
+def test_first_run_runs_every_stage(dataset, capsys):
+    root, config_path = dataset
+    code, plan = run(capsys, config_path)
+    assert code == 0
+    assert plan == dict.fromkeys(SFM_STAGES, "RUN")
+    assert all(entry["status"] == "done" for entry in load_state(root).values())
+    assert os.path.isfile(os.path.join(root, "FINAL_GSPLAT.ply"))
+    # Only dataset images are staged for COLMAP.
+    assert sorted(os.listdir(os.path.join(root, "colmap_data", "images"))) == ["CAM_L00_000.png", "CAM_L00_001.png", "CAM_L00_002.png"]
+
+def test_unchanged_rerun_skips_every_stage(dataset, capsys):
+    _, config_path = dataset
+    run(capsys, config_path)
+    code, plan = run(capsys, config_path)
+    assert code == 0
+    assert plan == dict.fromkeys(SFM_STAGES, "SKIP")
+
+def test_changed_inputs_rerun_only_downstream(dataset, capsys):
+    root, config_path = dataset
+    run(capsys, config_path)
+
+    # pairs.txt only feeds matching, so extraction and staging stay cached.
+    with open(os.path.join(root, "pairs.txt"), "a", encoding="utf-8") as f:
+        f.write("CAM_L00_001.png CAM_L00_002.png\n")
+    _, plan = run(capsys, config_path)
+    assert [s for s in SFM_STAGES if plan[s] == "SKIP"] == ["stage_images", "feature_extraction"]
+
+    # Every stage is downstream of the images.
+    write_image(root, "CAM_L00_003.png")
+    _, plan = run(capsys, config_path)
+    assert plan == dict.fromkeys(SFM_STAGES, "RUN")
+
+    write_image(root, "CAM_L00_000.png", b"re-rendered")
+    _, plan = run(capsys, config_path)
+    assert plan == dict.fromkeys(SFM_STAGES, "RUN")
+
+def test_failed_stage_resumes(dataset, capsys, monkeypatch):
+    root, config_path = dataset
+
+    def fail(ctx):
+        raise RuntimeError("ns-process-data exited with code 1")
+
+    monkeypatch.setattr(orchestrator, "_process_data", fail)
+    code, _ = run(capsys, config_path)
+    assert code == 1
+    state = load_state(root)
+    assert [state[s]["status"] for s in SFM_STAGES[:5]] == ["done", "done", "done", "done", "failed"]
+    assert "exited with code 1" in state["process_data"]["error"]
+    assert not any(s in state for s in SFM_STAGES[5:])
+
+    monkeypatch.undo()
+    code, plan = run(capsys, config_path)
+    assert code == 0
+    assert plan == {s: "SKIP" if k < 4 else "RUN" for k, s in enumerate(SFM_STAGES)}
+    assert all(entry["status"] == "done" for entry in load_state(root).values())
+
+def test_force_reruns_everything(dataset, capsys):
+    _, config_path = dataset
+    run(capsys, config_path)
+    code, plan = run(capsys, config_path, "--force", "stage_images")
+    assert code == 0
+    assert plan == dict.fromkeys(SFM_STAGES, "RUN")
@@ -0,0 +1,34 @@
+import numpy as np
+
+from rig import build_rig
+from pair_select import select_pairs, view_directions
+
+def layered_rig(count=300):
+    return build_rig("Cam_", [5.0, 7.5, 15.0], 1.0, (0.0, 0.0, 0.0), (0.0, 0.0, 1.0), sampler="FIBONACCI", count=count // 3)
+
+def test_pairs_respect_thresholds():
+    rig = layered_rig()
+    pairs = select_pairs(rig, (0.0, 0.0, 0.0), 20, 45.0, 2.5)
+    n = len(rig.names)
+    assert 0 < len(pairs) < n * (n - 1) // 2
+    assert all(i < j for i, j in pairs) and len(set(pairs)) == len(pairs)
+
+    dirs = view_directions(rig)
+    dist = np.linalg.norm(rig.positions, axis=1)
+    i, j = np.array(pairs).T
+    angles = np.degrees(np.arccos(np.clip(np.einsum("ij,ij->i", dirs[i], dirs[j]), -1.0, 1.0)))
+    assert angles.max() <= 45.0 + 1e-6
+    ratio = dist[i] / dist[j]
+    assert np.maximum(ratio, 1.0 / ratio).max() <= 2.5
+    # The 15.0 layer is 3x the 5.0 layer, so those two are never paired.
+    assert not np.any((rig.layers[i] - rig.layers[j] == 2) | (rig.layers[j] - rig.layers[i] == 2))
+
+def test_each_view_keeps_neighbours():
+    rig = layered_rig()
+    pairs = select_pairs(rig, (0.0, 0.0, 0.0), 5, 60.0, 3.0)
+    degree = np.bincount(np.array(pairs).ravel(), minlength=len(rig.names))
+    assert degree.min() >= 5
+
+def test_tiny_rigs():
+    rig = build_rig("Cam_", [5.0], 1.0, (0.0, 0.0, 0.0), (0.0, 0.0, 1.0), sampler="FIBONACCI", count=1)
+    assert select_pairs(rig, (0.0, 0.0, 0.0), 20, 45.0, 3.0) == []
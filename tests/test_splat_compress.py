@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from splat_io import open_splat, random_splat, write_splat
+from splat_compress import (
+    SH_C0,
+    attribute_errors,
+    decode_nspz,
+    decode_splat,
+    encode_nspz,
+    encode_splat,
+    load_attributes,
+)
+
+@pytest.fixture
+def attrs(tmp_path):
+    path = str(tmp_path / "s.ply")
+    write_splat(path, next(random_splat(5000, seed=3)))
+    attrs = load_attributes(open_splat(path))
+    # Trained SH coefficients are not bounded by 1; a few outliers must survive quantization.
+    attrs["f_rest"][:10, :, 0] = np.linspace(-4.0, 4.0, 30).reshape(10, 3)
+    return attrs
+
+def test_splat_round_trip(attrs):
+    payload, order = encode_splat(attrs)
+    assert len(payload) == 32 * len(order)
+    assert sorted(order) == list(range(len(order)))
+    dec = decode_splat(payload)
+    np.testing.assert_array_equal(dec["positions"], attrs["positions"][order])
+    np.testing.assert_allclose(dec["scales"], attrs["scales"][order], atol=1e-5)
+    # Colour and alpha are 8-bit: within half a step plus rounding.
+    colour = 0.5 + SH_C0 * attrs["f_dc"][order]
+    inside = (colour > 0.0) & (colour < 1.0)
+    assert np.abs(dec["f_dc"] - attrs["f_dc"][order])[inside].max() <= 0.51 / 255.0 / SH_C0
+    errors = attribute_errors(attrs, dec, order)
+    assert errors["opacity"][1] <= 0.51 / 255.0
+    assert errors["rotations"][0] < 2.0
+    assert "f_rest" not in errors
+
+@pytest.mark.parametrize("pos_bits", [16, 24])
+@pytest.mark.parametrize("sh_mode", ["u8", "palette"])
+def test_nspz_round_trip(attrs, pos_bits, sh_mode):
+    payload, order = encode_nspz(attrs, pos_bits=pos_bits, sh_degree=3, sh_mode=sh_mode, chunk=1024)
+    assert sorted(order) == list(range(len(order)))
+    dec = decode_nspz(payload)
+    errors = attribute_errors(attrs, dec, order)
+
+    # Fixed point per chunk: the error is at most half a step of the chunk's extent.
+    pos = attrs["positions"][order]
+    step = (pos.max(axis=0) - pos.min(axis=0)) / ((1 << pos_bits) - 1)
+    assert np.all(np.abs(dec["positions"] - pos) <= 0.5 * step + 1e-6)
+
+    assert errors["scales"][1] <= 0.51 / 16.0
+    assert errors["opacity"][1] <= 0.51 / 255.0
+    assert errors["rotations"][0] < 2.0
+
+    ref = attrs["f_rest"][order]
+    assert dec["f_rest"].shape == ref.shape
+    assert errors["f_rest_clipped"][:2] == (0.0, 0.0)
+    if sh_mode == "u8":
+        # 8-bit codes over [-scale, scale] per band.
+        scale = np.abs(ref).max(axis=(0, 1))
+        assert np.all(np.abs(dec["f_rest"] - ref) <= scale / 255.0 * 1.001 + 1e-7)
+    else:
+        assert errors["f_rest"][0] < 0.02
+    # The [-4, 4] outliers survive: within half a step of the palette's evenly spaced entries (u8 is tighter).
+    rows = np.nonzero(np.isin(order, np.arange(10)))[0]
+    np.testing.assert_allclose(dec["f_rest"][rows, :, 0], ref[rows, :, 0], atol=0.5 * 8.0 / 63.0 * 1.01)
+
+def test_nspz_truncates_sh(attrs):
+    payload, order = encode_nspz(attrs, sh_degree=1)
+    dec = decode_nspz(payload)
+    assert dec["f_rest"].shape == (len(order), 3, 3)
+    np.testing.assert_allclose(dec["f_rest"], attrs["f_rest"][order][:, :, :3], atol=4.0 / 255.0 * 1.001)
+    assert decode_nspz(encode_nspz(attrs, sh_degree=0)[0])["f_rest"].shape == (len(order), 3, 0)
+
+def test_clipping_is_reported(attrs):
+    payload, order = encode_nspz(attrs)
+    dec = decode_nspz(payload)
+    # Pretend the file could only represent [-1, 1], as the 8-bit mode once did.
+    dec["sh_range"] = np.clip(dec["sh_range"], -1.0, 1.0)
+    overall, worst, _ = attribute_errors(attrs, dec, order)["f_rest_clipped"]
+    assert worst > 0.0 and 0.0 < overall <= worst
+
+def test_nspz_rejects_other_payloads():
+    with pytest.raises(ValueError):
+        decode_nspz(b"\0" * 64)
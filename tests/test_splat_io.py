@@ -0,0 +1,64 @@
+import os
+
+import numpy as np
+import pytest
+
+from splat_io import SplatWriter, open_splat, random_splat, splat_dtype, write_splat
+
+def sample(count, sh_degree=3, seed=0):
+    return next(random_splat(count, sh_degree, seed=seed), np.zeros(0, dtype=splat_dtype(sh_degree)))
+
+@pytest.mark.parametrize("count", [0, 9, 10, 99, 100, 100000])
+def test_writer_patches_count_across_digit_boundaries(tmp_path, count):
+    # The header is written before the count is known; close() must rewrite it at the same length.
+    data = sample(count)
+    path = str(tmp_path / "s.ply")
+    with SplatWriter(path, data.dtype, comments=["source test"]) as writer:
+        for s in range(0, count, 7):
+            writer.write(data[s:s + 7])
+    assert writer.count == count
+    assert not os.path.exists(path + ".tmp")
+
+    splat = open_splat(path)
+    assert len(splat) == count
+    assert splat.comments == ["source test"]
+    assert splat.sh_degree == 3
+    np.testing.assert_array_equal(np.asarray(splat.data), data)
+    with open(path, "rb") as f:
+        assert f"element vertex {count}\n".encode() in f.read(4096)
+
+def test_failed_write_leaves_no_file(tmp_path):
+    path = str(tmp_path / "s.ply")
+    with pytest.raises(RuntimeError):
+        with SplatWriter(path, splat_dtype()) as writer:
+            writer.write(sample(5))
+            raise RuntimeError("abort")
+    assert os.listdir(tmp_path) == []
+
+def test_write_splat_mask_and_narrowed_dtype(tmp_path):
+    data = sample(1000, seed=1)
+    src = str(tmp_path / "src.ply")
+    write_splat(src, data)
+    splat = open_splat(src)
+    mask = np.asarray(splat.opacity) > 0.0
+    narrow = splat_dtype(sh_degree=1, normals=False)
+    dst = str(tmp_path / "dst.ply")
+    # A chunk smaller than the file makes the mask slices line up with each block.
+    kept = write_splat(dst, splat.data, mask, chunk=97, dtype=narrow)
+    assert kept == mask.sum()
+
+    out = open_splat(dst)
+    assert out.names == narrow.names
+    assert out.sh_degree == 1
+    for name in narrow.names:
+        np.testing.assert_array_equal(out.data[name], data[name][mask])
+
+def test_groups_are_views_in_field_order(tmp_path):
+    data = sample(50, sh_degree=2, seed=2)
+    path = str(tmp_path / "s.ply")
+    write_splat(path, data)
+    splat = open_splat(path)
+    assert splat.sh_degree == 2
+    assert splat.positions.base is not None
+    np.testing.assert_array_equal(splat.positions, np.stack([data["x"], data["y"], data["z"]], axis=1))
+    np.testing.assert_array_equal(splat.f_rest, np.stack([data[f"f_rest_{i}"] for i in range(24)], axis=1))
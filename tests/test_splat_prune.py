@@ -0,0 +1,38 @@
+import numpy as np
+
+from splat_io import open_splat, random_splat, splat_dtype, write_splat
+from splat_prune import PRUNED_COMMENT, is_derived, prune_splat, sh_field_map
+
+def test_sh_field_map_keeps_first_bands_per_channel():
+    names = splat_dtype(sh_degree=3).names
+    mapping = dict(sh_field_map(names, 1))
+    rest = {new: old for new, old in mapping.items() if new.startswith("f_rest_")}
+    # f_rest is channel-major with 15 coefficients per channel; degree 1 keeps 3 of each.
+    assert rest == {
+        "f_rest_0": "f_rest_0", "f_rest_1": "f_rest_1", "f_rest_2": "f_rest_2",
+        "f_rest_3": "f_rest_15", "f_rest_4": "f_rest_16", "f_rest_5": "f_rest_17",
+        "f_rest_6": "f_rest_30", "f_rest_7": "f_rest_31", "f_rest_8": "f_rest_32",
+    }
+    assert all(new == old for new, old in mapping.items() if not new.startswith("f_rest_"))
+    assert [new for new, _ in sh_field_map(names, 3)] == list(names)
+    assert not any(new.startswith("f_rest_") for new, _ in sh_field_map(names, 0))
+
+def test_prune_reduces_sh_and_drops_rows(tmp_path):
+    data = next(random_splat(2000, sh_degree=3, seed=4))
+    src, dst = str(tmp_path / "src.ply"), str(tmp_path / "dst.ply")
+    write_splat(src, data)
+    report = prune_splat(src, dst, (0.0, 0.0, 0.0), 1.0, min_opacity=0.5, max_scale_ratio=0.0, max_distance_ratio=0.0,
+                         sh_degree=2, chunk=300)
+
+    keep = 1.0 / (1.0 + np.exp(-data["opacity"])) >= 0.5
+    out = open_splat(dst)
+    assert report["count_after"] == len(out) == keep.sum()
+    assert report["removed"]["opacity"] == (~keep).sum()
+    assert report["sh_fields"] == (45, 24)
+    assert out.sh_degree == 2 and is_derived(dst) and PRUNED_COMMENT in out.comments
+    # Each channel's first 8 coefficients, renumbered contiguously.
+    got = out.f_rest.reshape(len(out), 3, 8)
+    for c in range(3):
+        for k in range(8):
+            np.testing.assert_array_equal(got[:, c, k], data[f"f_rest_{c * 15 + k}"][keep])
+    np.testing.assert_array_equal(out.positions, np.stack([data[a][keep] for a in "xyz"], axis=1))
@@ -0,0 +1,85 @@
+import json
+import os
+
+import numpy as np
+
+from conftest import FIXTURES
+from rig import Rig, look_at_matrices, pixel_intrinsics
+from transforms_json import INTRINSIC_KEYS, build_transforms, read_transforms, write_transforms
+
+REFERENCE = os.path.join(FIXTURES, "transforms_reference.json")
+
+def reference_rig():
+    # Three cameras looking at the origin: one on +Z with +Y up, then +X and +Y with +Z up.
+    positions = np.array([(0.0, 0.0, 4.0), (4.0, 0.0, 0.0), (0.0, 8.0, 0.0)])
+    matrices = np.concatenate(
+        (
+            look_at_matrices(positions[:1], (0.0, 0.0, 0.0), (0.0, 1.0, 0.0)),
+            look_at_matrices(positions[1:], (0.0, 0.0, 0.0), (0.0, 0.0, 1.0)),
+        )
+    )
+    names = ["CAM_L0_000", "CAM_L0_001", "CAM_L1_000"]
+    return Rig(names, np.array([0, 0, 1]), positions, matrices)
+
+def test_transform_matrix_is_opengl_camera_to_world():
+    data = build_transforms(reference_rig(), 800, 600, 36.0, 36.0)
+    got = np.array([fr["transform_matrix"] for fr in data["frames"]])
+    # OpenGL/Blender camera: +X right, +Y up, looking down -Z; columns are those axes in world space.
+    expected = np.array(
+        [
+            [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 4], [0, 0, 0, 1]],
+            [[0, 0, 1, 4], [1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1]],
+            [[-1, 0, 0, 0], [0, 0, 1, 8], [0, 1, 0, 0], [0, 0, 0, 1]],
+        ],
+        dtype=np.float64,
+    )
+    np.testing.assert_allclose(got, expected, atol=1e-12)
+    # -Z of every camera points from its position at the origin.
+    view = -got[:, :3, 2]
+    np.testing.assert_allclose(view, -got[:, :3, 3] / np.linalg.norm(got[:, :3, 3], axis=1, keepdims=True), atol=1e-12)
+
+def test_intrinsics_match_pixel_intrinsics():
+    data = build_transforms(reference_rig(), 800, 600, 50.0, 36.0, resolutions=[(800, 600), (800, 600), (400, 300)])
+    fx, fy, cx, cy = pixel_intrinsics(50.0, 36.0, 800, 600)
+    assert (data["fl_x"], data["fl_y"], data["cx"], data["cy"]) == (fx, fy, cx, cy)
+    # 50 mm on a 36 mm sensor across the 800 px width.
+    assert fx == 50.0 / 36.0 * 800 and (cx, cy) == (400.0, 300.0)
+    fx2, _, cx2, cy2 = pixel_intrinsics(50.0, 36.0, 400, 300)
+    assert (data["frames"][2]["fl_x"], data["frames"][2]["cx"], data["frames"][2]["cy"]) == (fx2, cx2, cy2)
+    assert fx2 == fx / 2.0
+
+def test_round_trip_matches_reference(tmp_path):
+    rig = reference_rig()
+    data = build_transforms(rig, 800, 600, 36.0, 36.0, ply_file_path="sparse_pc.ply", resolutions=[(800, 600), (800, 600), (400, 300)],
+                            image_format="JPEG", downscale_factors=(2, 4))
+    path = str(tmp_path / "transforms.json")
+    write_transforms(path, data)
+
+    got_rig, got_intrinsics, got_overrides = read_transforms(path)
+    ref_rig, ref_intrinsics, ref_overrides = read_transforms(REFERENCE)
+
+    assert got_intrinsics == ref_intrinsics
+    assert got_intrinsics["camera_model"] == "OPENCV"
+    assert (got_intrinsics["fl_x"], got_intrinsics["cx"], got_intrinsics["cy"]) == (800.0, 400.0, 300.0)
+    assert got_overrides == ref_overrides
+    assert got_overrides[2] == {"w": 400, "h": 300, "fl_x": 400.0, "fl_y": 400.0, "cx": 200.0, "cy": 150.0, "mask_path": "masks/CAM_L1_000.png"}
+    assert got_rig.names == ref_rig.names == rig.names
+    np.testing.assert_allclose(got_rig.matrices, ref_rig.matrices)
+    np.testing.assert_allclose(got_rig.positions, rig.positions)
+
+def test_written_file_equals_reference(tmp_path):
+    data = build_transforms(reference_rig(), 800, 600, 36.0, 36.0, ply_file_path="sparse_pc.ply",
+                            resolutions=[(800, 600), (800, 600), (400, 300)], image_format="JPEG", downscale_factors=(2, 4))
+    path = str(tmp_path / "transforms.json")
+    write_transforms(path, data)
+    with open(path, "r", encoding="utf-8") as f, open(REFERENCE, "r", encoding="utf-8") as g:
+        assert json.load(f) == json.load(g)
+
+def test_png_frames_have_no_masks_or_overrides(tmp_path):
+    data = build_transforms(reference_rig(), 800, 600, 36.0, 36.0)
+    path = str(tmp_path / "transforms.json")
+    write_transforms(path, data)
+    _, intrinsics, overrides = read_transforms(path)
+    assert set(intrinsics) == set(INTRINSIC_KEYS)
+    assert overrides == [{}, {}, {}]
+    assert "ply_file_path" not in data and "downscale_factors" not in data